@@ -0,0 +1,73 @@
+"""
+Benchmark du moteur de tests gaussiens :
+  - échantillonnage : boucle scalaire d'origine contre moteur vectorisé. L'implémentation scalaire
+    (quatre np.random.normal et un tirage par codon pour chaque test) est reproduite ici comme référence ;
+  - score : méthodes de dna_graph.core.scoring sur les mêmes variantes.
+
+Utilisation :
+    python benchmarks/bench_gauss.py [--tests 100] [--lengths 5 50 500] [--repeat 5]
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+import dna_graph.bio.codon_index as codon_index
+from dna_graph.codec.encode_decode import convert_message_to_bases
+from dna_graph.core.gauss import sample_variants
+from dna_graph.core.scoring import SCORERS, score_variants
+from config.config import ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE
+
+DEFAULTS = (ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE)
+SIGMAS = (0.1, 0.1, 0.1, 0.005)
+
+
+def sample_variants_scalar(original_sequence, num_tests, defaults, sigmas):
+    """Boucle d'origine : un appel NumPy scalaire par paramètre et par codon."""
+    codons = [original_sequence[i:i + 3] for i in range(0, len(original_sequence), 3)]
+    options = [codon_index.synonymous_codons(codon) if len(codon) == 3 else None for codon in codons]
+    params, sequences = [], []
+    for _ in range(num_tests):
+        row = [np.random.normal(mu, sigma) for mu, sigma in zip(defaults, sigmas)]
+        row[3] = np.clip(row[3], 0, 1)
+        chosen = [codon if alternatives is None else alternatives[np.random.randint(0, len(alternatives))]
+                  for codon, alternatives in zip(codons, options)]
+        params.append(row)
+        sequences.append("".join(chosen))
+    return params, sequences
+
+
+def best_time(fn, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare l'échantillonnage gaussien scalaire et vectorisé.")
+    parser.add_argument("--tests", type=int, default=100, help="Nombre de variantes par mot.")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[5, 50, 500], help="Longueurs de mot (caractères).")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'caractères':>10} {'codons':>7} {'scalaire (ms)':>14} {'vectorisé (ms)':>15} {'gain':>7}")
+    for length in args.lengths:
+        sequence = "".join(convert_message_to_bases(("genimg" * length)[:length]))
+        scalar = best_time(lambda: sample_variants_scalar(sequence, args.tests, DEFAULTS, SIGMAS), args.repeat)
+        vector = best_time(lambda: sample_variants(sequence, args.tests, DEFAULTS, SIGMAS), args.repeat)
+        print(f"{length:>10} {len(sequence) // 3:>7} {scalar * 1000:>14.3f} {vector * 1000:>15.3f} {scalar / vector:>6.1f}x")
+
+    print(f"\n{'caractères':>10} " + " ".join(f"{name + ' (ms)':>14}" for name in SCORERS))
+    for length in args.lengths:
+        sequence = "".join(convert_message_to_bases(("genimg" * length)[:length]))
+        _, variants = sample_variants(sequence, args.tests, DEFAULTS, SIGMAS)
+        timings = [best_time(lambda: score_variants(sequence, variants, name), args.repeat) for name in SCORERS]
+        print(f"{length:>10} " + " ".join(f"{t * 1000:>14.3f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
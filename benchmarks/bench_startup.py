@@ -0,0 +1,50 @@
+"""
+Benchmark du temps de démarrage à froid de la CLI dna_graph.
+
+Chaque mesure lance un nouvel interpréteur Python (aucun module en cache) :
+  - import_main : import de dna_graph.__main__ seul.
+  - heavy_imports : import de matplotlib, sklearn et pandas (coût évité par les imports différés).
+  - headless_run : exécution complète de `python -m dna_graph --headless`.
+
+Utilisation :
+    python benchmarks/bench_startup.py [--repeat 5] [--message "hello"]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+SCENARIOS = {
+    "import_main": ["-c", "import dna_graph.__main__"],
+    "heavy_imports": ["-c", "import matplotlib.pyplot, sklearn.cluster, sklearn.decomposition, pandas"],
+}
+
+
+def time_command(args, repeat):
+    """Lance la commande `repeat` fois et retourne la liste des durées (secondes)."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure le temps de démarrage de dna_graph.")
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre de mesures par scénario.")
+    parser.add_argument("--message", type=str, default="hello", help="Message pour le scénario headless_run.")
+    args = parser.parse_args()
+
+    scenarios = dict(SCENARIOS)
+    scenarios["headless_run"] = ["-m", "dna_graph", "--headless", "-m", args.message]
+
+    for name, command in scenarios.items():
+        durations = time_command(command, args.repeat)
+        print(f"{name:<15} median={statistics.median(durations):.3f}s  min={min(durations):.3f}s  max={max(durations):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
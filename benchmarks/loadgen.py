@@ -0,0 +1,72 @@
+"""
+Générateur de charge local pour le service `dna_graph serve`.
+
+Envoie des requêtes POST /encode depuis plusieurs clients concurrents (connexions keep-alive),
+puis affiche le débit, les percentiles de latence côté client et les statistiques du service (/stats).
+
+Utilisation :
+    dna_graph serve --workers 4 --max-batch-size 16 --max-wait-ms 5 &
+    python benchmarks/loadgen.py --requests 2000 --concurrency 32
+"""
+import argparse
+import http.client
+import json
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+WORDS = ["hello", "world", "genimg", "adn", "graphe", "codon", "message", "proteine", "gene", "base"]
+
+
+def random_message(rng, max_words):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, max_words)))
+
+
+def client(host, port, n_requests, max_words, seed):
+    """Envoie n_requests requêtes sur une connexion ; retourne la liste des latences (s) et le nombre d'erreurs."""
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port)
+    latencies, errors = [], 0
+    for _ in range(n_requests):
+        body = json.dumps({"message": random_message(rng, max_words)})
+        start = time.perf_counter()
+        conn.request("POST", "/encode", body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        errors += response.status != 200
+    conn.close()
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère une charge sur le service dna_graph serve.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=1000, help="Nombre total de requêtes.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Nombre de clients concurrents.")
+    parser.add_argument("--max-words", type=int, default=6, help="Nombre maximal de mots par message.")
+    args = parser.parse_args()
+
+    per_client = [args.requests // args.concurrency + (i < args.requests % args.concurrency)
+                  for i in range(args.concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda i: client(args.host, args.port, per_client[i], args.max_words, i),
+                                range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(lat * 1000 for lats, _ in results for lat in lats)
+    errors = sum(err for _, err in results)
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{len(latencies)} requêtes ({errors} erreurs) en {elapsed:.2f} s : {len(latencies) / elapsed:.1f} req/s")
+    print(f"latence client (ms) : p50={quantiles[49]:.1f}  p90={quantiles[89]:.1f}  p99={quantiles[98]:.1f}  max={latencies[-1]:.1f}")
+
+    conn = http.client.HTTPConnection(args.host, args.port)
+    conn.request("GET", "/stats")
+    print("stats service :", conn.getresponse().read().decode("utf-8"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Suite de benchmarks des étapes du pipeline Genimg, pour des messages de 10 o à 1 Mo.
+
+Pour chaque étape et chaque taille de message :
+  - temps médian et minimal sur --repeat exécutions (time.perf_counter),
+  - pic mémoire mesuré par tracemalloc sur une exécution supplémentaire.
+
+Les résultats sont écrits en JSON (--output). Avec --baseline, chaque mesure est comparée
+à la référence stockée : une médiane plus lente de plus de --threshold (20 % par défaut)
+est signalée comme régression et le script se termine avec le code 1.
+
+Certaines étapes sont super-linéaires (graphe codon, solveurs, Floyd-Warshall...) : chacune
+a une taille maximale au-delà de laquelle elle est ignorée (modifiable avec --max-size).
+
+Utilisation :
+    python benchmarks/run_benchmarks.py --output benchmarks/results.json
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --stages gaussian_kernel_test
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from dna_graph.codec.encode_decode import convert_message_to_bases
+from dna_graph.codec.codon_graph import add_codon_subgraph_bio
+from dna_graph.codec.reed_solomon import rs_encode, rs_decode
+from dna_graph.core.init_graph import init_graph
+from dna_graph.core.gauss import gaussian_kernel_test, cluster_results, get_word_test_results
+from dna_graph.core.optimisation import (
+    bellman_ford, dijkstra, astar, floyd_warshall, johnson, compute_on_layered_graph
+)
+from dna_graph.core.visualization import draw_layered_sequence_graph
+from dna_graph.core.layered import build_layered_candidates
+from dna_graph.contraintes.gene_contraintes import validate_gene_expression_constraints
+from dna_graph.bio.gene_expression import simulate_gene_expression
+from config.config import (
+    ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE, MANDATORY_NODES, NUMB_TEST, NUMBER_TEST, NBR_BEST, SEED,
+    PROMOTER, ADRN, TERMINATION_SIGNAL, RS_NSYM
+)
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+WORDS = ["hello", "world", "genimg", "adn", "graphe", "codon", "message", "proteine", "gene", "base"]
+
+
+def make_message(size, seed=0):
+    """Génère un message ASCII déterministe de `size` octets (mots séparés par des espaces)."""
+    rng = random.Random(seed)
+    parts, length = [], 0
+    while length < size:
+        word = rng.choice(WORDS)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)[:size]
+
+
+def dna_sequence_for(message):
+    """Séquence ADN complète (promoteur + ATG + bases complétées + terminaison) pour un message."""
+    bases = convert_message_to_bases(message)
+    bases += ["A"] * (-len(bases) % 3)
+    return PROMOTER + ADRN + "".join(bases) + TERMINATION_SIGNAL
+
+
+def codon_graph_for(message):
+    G = init_graph()
+    start, end = add_codon_subgraph_bio(G, convert_message_to_bases(message))
+    return G, start, end
+
+
+def word_results_for(message):
+    return get_word_test_results(message, NUMB_TEST, NBR_BEST, ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE, SEED,
+                                 use_cache=False)
+
+
+def layered_graph_for(message):
+    return draw_layered_sequence_graph(message, word_results_for(message), NBR_BEST, show=False)
+
+
+# Chaque préparation reçoit le message et retourne la fonction sans argument à chronométrer.
+
+def setup_convert(message):
+    return lambda: convert_message_to_bases(message)
+
+
+def setup_init_graph(message):
+    return init_graph
+
+
+def setup_codon_subgraph(message):
+    bases = convert_message_to_bases(message)
+    return lambda: add_codon_subgraph_bio(init_graph(), bases)
+
+
+def setup_path_solver(solver):
+    def setup(message):
+        G, start, end = codon_graph_for(message)
+        return lambda: solver(G, start, end, MANDATORY_NODES, ALPHA, BETA, GAMMA)
+    return setup
+
+
+def setup_all_pairs_solver(solver):
+    def setup(message):
+        G, start, end = codon_graph_for(message)
+        return lambda: solver(G, start, end, ALPHA, BETA, GAMMA)
+    return setup
+
+
+def setup_layered_solver(algorithm):
+    def setup(message):
+        G = layered_graph_for(message)
+        return lambda: compute_on_layered_graph(G, ALPHA, BETA, GAMMA, algorithm, add_noise=False)
+    return setup
+
+
+def setup_layered_build(message):
+    word_results = word_results_for(message)
+    return lambda: build_layered_candidates(message, word_results, NBR_BEST)
+
+
+def setup_layered_candidates(algorithm):
+    def setup(message):
+        layered = build_layered_candidates(message, word_results_for(message), NBR_BEST)
+        return lambda: compute_on_layered_graph(layered, ALPHA, BETA, GAMMA, algorithm, add_noise=False)
+    return setup
+
+
+def setup_gaussian(message):
+    # Sans cache : on mesure le tirage, pas la relecture d'un résultat mémorisé
+    return lambda: gaussian_kernel_test(message, ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE, NUMBER_TEST,
+                                        random_seed=SEED, use_cache=False)
+
+
+def setup_cluster(message):
+    results = gaussian_kernel_test(message, ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE, NUMBER_TEST, random_seed=SEED)
+    return lambda: cluster_results(results, n_clusters=5)
+
+
+def setup_constraints(message):
+    sequence, G = dna_sequence_for(message), init_graph()
+    return lambda: validate_gene_expression_constraints(sequence, G)
+
+
+def setup_rs_encode(message):
+    data = message.encode("latin-1")
+    return lambda: rs_encode(data, RS_NSYM)
+
+
+def setup_rs_decode(message):
+    # Un octet sur 100 altéré : dans la capacité de correction (RS_NSYM // 2 par bloc de 255)
+    data = message.encode("latin-1")
+    noisy = bytearray(rs_encode(data, RS_NSYM))
+    for position in range(0, len(noisy), 100):
+        noisy[position] ^= 0x5A
+    return lambda: rs_decode(noisy, len(data), RS_NSYM)
+
+
+def setup_expression(message):
+    sequence = dna_sequence_for(message)
+    return lambda: simulate_gene_expression(sequence)
+
+
+# Étapes : nom -> (préparation, taille maximale de message en octets)
+STAGES = {
+    "convert_message_to_bases": (setup_convert, 1_000_000),
+    "init_graph": (setup_init_graph, 10),  # indépendant du message : une seule mesure
+    "add_codon_subgraph_bio": (setup_codon_subgraph, 10_000),
+    "bellman_ford": (setup_path_solver(bellman_ford), 1_000),
+    "dijkstra": (setup_path_solver(dijkstra), 1_000),
+    "astar": (setup_path_solver(astar), 1_000),
+    "floyd_warshall": (setup_all_pairs_solver(floyd_warshall), 10),
+    "johnson": (setup_all_pairs_solver(johnson), 1_000),
+    "layered_dijkstra": (setup_layered_solver("dijkstra"), 1_000),
+    "layered_floyd_warshall": (setup_layered_solver("floyd_warshall"), 100),
+    "build_layered_candidates": (setup_layered_build, 1_000),
+    "layered_candidates_dijkstra": (setup_layered_candidates("dijkstra"), 1_000),
+    "gaussian_kernel_test": (setup_gaussian, 1_000),
+    "cluster_results": (setup_cluster, 1_000),
+    "validate_gene_expression_constraints": (setup_constraints, 1_000_000),
+    "simulate_gene_expression": (setup_expression, 100_000),
+    "rs_encode": (setup_rs_encode, 1_000_000),
+    "rs_decode": (setup_rs_decode, 1_000_000),
+}
+
+
+def measure(fn, repeat):
+    """
+    Chronomètre fn `repeat` fois après une exécution d'échauffement (imports différés, caches),
+    puis mesure son pic mémoire (tracemalloc) sur une exécution de plus.
+    """
+    fn()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"median_s": statistics.median(durations), "min_s": min(durations), "peak_kb": peak / 1024}
+
+
+def run(stages, sizes, repeat, max_size=None):
+    results = []
+    for stage in stages:
+        setup, stage_max = STAGES[stage]
+        limit = stage_max if max_size is None else max_size
+        for size in sizes:
+            if size > limit:
+                continue
+            fn = setup(make_message(size))
+            entry = {"stage": stage, "size": size, **measure(fn, repeat)}
+            results.append(entry)
+            print(f"{stage:<38} {size:>9} o  median={entry['median_s'] * 1000:10.3f} ms  "
+                  f"peak={entry['peak_kb']:10.1f} Ko", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Retourne les mesures dont la médiane dépasse celle de la référence de plus de `threshold`."""
+    reference = {(r["stage"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for entry in results:
+        ref = reference.get((entry["stage"], entry["size"]))
+        if ref is None or ref["median_s"] <= 0:
+            continue
+        ratio = entry["median_s"] / ref["median_s"]
+        entry["baseline_ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(entry)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks des étapes du pipeline Genimg.")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES, help="Tailles de message (octets).")
+    parser.add_argument("--max-size", type=int, default=None, help="Remplace la taille maximale de chaque étape.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats.")
+    parser.add_argument("--baseline", default=None, help="Référence JSON pour détecter les régressions.")
+    parser.add_argument("--save-baseline", default=None, help="Enregistre les résultats comme nouvelle référence.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Ralentissement toléré (0.2 = 20 %%).")
+    args = parser.parse_args()
+
+    results = run(args.stages, sorted(args.sizes), args.repeat, args.max_size)
+    report = {
+        "meta": {"python": sys.version.split()[0], "platform": platform.platform(),
+                 "date": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": args.repeat},
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        report["regressions"] = [(r["stage"], r["size"]) for r in regressions]
+        for r in regressions:
+            print(f"REGRESSION {r['stage']} ({r['size']} o) : x{r['baseline_ratio']:.2f} par rapport à la référence")
+        if not regressions:
+            print("Aucune régression par rapport à la référence.")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ setup(
     version='0.1',
     packages=find_packages('src'),
     package_dir={'': 'src'},
+    package_data={'dna_graph.contraintes': ['data/*.tsv']},
     entry_points={
         'console_scripts': [
             'dna_graph = dna_graph.__main__:main',
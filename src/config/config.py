@@ -1,5 +1,4 @@
 import os
-import logging
 
 # ----- Parametres Draw -----#
 # Taille fenetre
@@ -50,6 +49,8 @@ FONT_SIZE_INTERACTION = 5
 FONT_COLOR = "red"
 OPTI_PATH = "blue"
 OPTI_PSIZE = 1.5
+# Format des figures écrites sur disque (--output-dir) : "png" ou "svg"
+FIGURE_FORMAT = "png"
 
 # ----- Chemins et répertoires -----
 # Définir le dossier racine pour les logs (ici, un dossier 'logs' au même niveau que le projet)
@@ -60,13 +61,16 @@ LOG_DIR = os.path.join(BASE_DIR, '..', 'logs')
 if not os.path.exists(LOG_DIR):
     os.makedirs(LOG_DIR)
 
-# Chemin complet du fichier de log
-LOG_FILE = os.path.join(LOG_DIR, 'genimg.log')
+# Chemin complet du fichier de log (surchargeable par GENIMG_LOG_FILE ou --log-file, "-" pour stderr)
+LOG_FILE = os.environ.get("GENIMG_LOG_FILE", os.path.join(LOG_DIR, 'genimg.log'))
 
 # ----- Configuration du Logging -----
-LOG_LEVEL = logging.DEBUG
+# Niveau surchargeable par GENIMG_LOG_LEVEL ou --log-level (DEBUG, INFO, WARNING, ERROR)
+LOG_LEVEL = os.environ.get("GENIMG_LOG_LEVEL", "INFO").upper()
 LOG_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(filename)s -%(funcName)s - %(lineno)d - %(message)s'
 LOG_FILE_MODE = 'w'  # 'w' pour écraser à chaque démarrage, 'a' pour ajouter
+# Nombre maximal d'éléments affichés pour les listes volumineuses (bases, chemins) dans les logs
+LOG_PAYLOAD_LIMIT = int(os.environ.get("GENIMG_LOG_PAYLOAD_LIMIT", 32))
 
 # ----- Paramètres d'Optimisation -----
 # Coefficients pour la fonction de coût dans l'optimisation du graphe (moyenne), build, stabilité relation, taux erreur
@@ -87,6 +91,12 @@ NUMB_TEST = 50
 SEED = 42
 NUMBER_TEST = 100
 
+# Cache des tests gaussiens : entrées en mémoire, dossier du niveau disque (désactivé si vide)
+# et taille maximale de ce dossier en octets
+CACHE_SIZE = int(os.environ.get("GENIMG_CACHE_SIZE", 256))
+CACHE_DIR = os.environ.get("GENIMG_CACHE_DIR") or None
+CACHE_DISK_LIMIT = int(os.environ.get("GENIMG_CACHE_DISK_LIMIT", 64 * 1024 * 1024))
+
 # ----- Paramètres Graph 2-----
 NBR_BEST = 7 # "7" graph sur diapo 
 
@@ -102,4 +112,25 @@ PROMOTER = "TATAATG"
 ADRN = "ATG"
 TERMINATION_SIGNAL = "ATT"
 
+# Contraintes locales : taille de la fenêtre glissante du ratio GC
+# et longueur maximale d'une répétition d'une même base (homopolymère)
+GC_WINDOW = 50
+MAX_HOMOPOLYMER = 6
+
+# Enzymes de la bibliothèque (contraintes/data/restriction_enzymes.tsv) dont les sites sont interdits
+# par le pipeline, sur les deux brins, en plus du site EcoRI : liste de noms, "all" pour toute
+# la bibliothèque, None pour aucune (surchargeable par --enzymes)
+RESTRICTION_ENZYMES = None
+
+# Code correcteur Reed-Solomon : octets de parité par bloc de 255 octets
+# (corrige RS_NSYM // 2 octets, soit autant de groupes de 4 bases, par bloc)
+RS_NSYM = 16
+
+# Marqueurs de synchronisation : motif inséré avant chaque tranche de SYNC_INTERVAL bases,
+# et décalage maximal (en bases) recherché autour de la position attendue d'un marqueur
+SYNC_MARKER = "TTGACGTA"
+SYNC_INTERVAL = 32
+SYNC_BAND = 8
 
+# Service HTTP : taille maximale (octets) du corps d'une requête, au-delà réponse 413
+MAX_BODY_SIZE = 16 * 1024 * 1024
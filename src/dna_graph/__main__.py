@@ -1,55 +1,35 @@
 import argparse
 import logging
 import time
-import dna_graph.bio.genetic_code as gen_code
 
 from dna_graph.core.gauss import (
     gaussian_kernel_test,
     gaussian_kernel_test_sentence,
     cluster_results,
-    get_word_test_results
+    get_word_test_results,
+    ADAPTIVE_BATCH_SIZE
 )
 from dna_graph.core.visualization import (
     draw_graph,
     set_positions_by_layer,
-    draw_layered_sequence_graph,
+    draw_layered_candidates,
     plot_clusters,
-    plot_gaussian_with_histogram
+    plot_gaussian_with_histogram,
+    render_figures
 )
-from dna_graph.codec.codon_graph import add_codon_subgraph_bio, build_aa_to_codons
-from dna_graph.codec.encode_decode import convert_message_to_bases, decode_message_from_path, extract_base_path
-from dna_graph.core.optimisation import compute_on_layered_graph, compute_path_weight, dijkstra, bellman_ford, astar, display_floyd_warshall_matrix, display_johnson_matrix
-from dna_graph.bio.gene_expression import simulate_gene_expression
-from dna_graph.contraintes.gene_contraintes import validate_gene_expression_constraints
-from dna_graph.core.init_graph import init_graph
+from dna_graph.core.layered import LayeredCandidates, build_layered_candidates
+from dna_graph.codec.encode_decode import extract_base_path
+from dna_graph.core.optimisation import compute_on_layered_graph, display_floyd_warshall_matrix, display_johnson_matrix
+from dna_graph.pipeline import GenimgPipeline
+from dna_graph.core.logs import setup_logging, Truncated
 from config.config import (
-    LOG_FILE, LOG_LEVEL, LOG_FORMAT, LOG_FILE_MODE,
-    ALPHA, BETA, GAMMA, DEFAULT_MESSAGE, MANDATORY_NODES, LAYER_CONFIG,
-    PROMOTER, TERMINATION_SIGNAL, ADRN, DEFAULT_MUTATION_RATE, NUMB_TEST, SEED,
-    NBR_BEST, NUMBER_TEST, ALG1, ALG2, ALG3, ALG4, ALG5, ALG6, ALG7 
+    LOG_FILE, LOG_LEVEL,
+    ALPHA, BETA, GAMMA, DEFAULT_MESSAGE, LAYER_CONFIG,
+    DEFAULT_MUTATION_RATE, NUMB_TEST, SEED, RESTRICTION_ENZYMES,
+    NBR_BEST, NUMBER_TEST, ALG1, ALG2, ALG3, ALG4, ALG5, ALG6, ALG7, MAX_BODY_SIZE
 )
 
 
-def setup_logging():
-    """
-    Configure le logging pour enregistrer tous les messages dans un fichier unique.
-    """
-    # Supprimez les handlers existants pour éviter des doublons
-    for handler in logging.root.handlers[:]:
-        logging.root.removeHandler(handler)
-        
-    logging.basicConfig(
-        level=LOG_LEVEL,                   # Capture tous les niveaux de log
-        format=LOG_FORMAT,                 # Format du log 
-        filename=LOG_FILE,                 # Tous les logs vont dans ce fichier
-        filemode=LOG_FILE_MODE             # Réécrit le fichier à chaque démarrage
-    )
-    
-    # Réduit le niveau de log pour certains modules
-    logging.getLogger("PIL.PngImagePlugin").setLevel(logging.WARNING)
-    logging.getLogger("matplotlib.font_manager").setLevel(logging.WARNING)
-
-
 def parse_arguments():
     """
     Parse les arguments de la ligne de commande pour GenImg.
@@ -81,152 +61,184 @@ def parse_arguments():
         default=GAMMA,
         help="Pondération gamma pour l'optimisation (erreur). Par défaut : %(default)s."
     )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Mode pipeline sans affichage : aucun graphique, analyses gaussiennes désactivées sauf --gauss."
+    )
+    parser.add_argument(
+        "--gauss",
+        action="store_true",
+        help="Exécute les tests gaussiens et le clustering même en mode --headless."
+    )
+    parser.add_argument(
+        "--gauss-workers",
+        type=int,
+        default=None,
+        help="Tests gaussiens par mot en parallèle sur N processus (graine dérivée par mot, "
+             "résultats indépendants de N). Par défaut : mode séquentiel historique."
+    )
+    parser.add_argument(
+        "--enzymes",
+        type=str,
+        default=None,
+        help="Enzymes de la bibliothèque dont les sites (deux brins) sont interdits, séparées par des virgules "
+             "(ex. 'BsaI,BamHI'), ou 'all' pour toute la bibliothèque. Par défaut : RESTRICTION_ENZYMES (config)."
+    )
+    parser.add_argument(
+        "--adaptive-tolerance",
+        type=float,
+        default=None,
+        help="Candidats du second graphe tirés en mode adaptatif : arrêt par mot dès que les intervalles "
+             "de confiance à 95 %% du score moyen et du meilleur score ont cette demi-largeur "
+             "(budget : NUMB_TEST variantes). Par défaut : tirage fixe de NUMB_TEST variantes."
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=None,
+        help="Écrit les figures (PNG/SVG, rendu Agg sans affichage) dans ce dossier au lieu de les afficher. "
+             "Fonctionne aussi avec --headless."
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=1,
+        help="Nombre de processus pour le rendu des figures de --output-dir. Par défaut : %(default)s."
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        default=LOG_LEVEL,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        help="Niveau de log (ou variable GENIMG_LOG_LEVEL). Par défaut : %(default)s."
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        default=LOG_FILE,
+        help="Fichier de log, '-' pour stderr (ou variable GENIMG_LOG_FILE). Par défaut : %(default)s."
+    )
     parser.add_argument(
         "--version",
         action="version",
         version="GenImg 1.0",
         help="Affiche la version du programme."
     )
-    return parser.parse_args()
-
 
-def initialize_graph():
-    """
-    Initialise le graphe de connaissance via le module.
-    """
-    logging.info("Initialisation du graphe...")
-    G = init_graph()
-    return G
+    subparsers = parser.add_subparsers(dest="command")
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Encode un fichier JSONL de messages avec un pool de processus."
+    )
+    batch_parser.add_argument(
+        "--input", required=True,
+        help="Fichier JSONL d'entrée (un objet {\"message\": ...} ou une chaîne par ligne)."
+    )
+    batch_parser.add_argument(
+        "--output", required=True,
+        help="Fichier JSONL de sortie (un résultat par ligne, dans l'ordre d'entrée)."
+    )
+    batch_parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Nombre de processus de travail. Par défaut : %(default)s."
+    )
+    batch_parser.add_argument(
+        "--chunk-size", type=int, default=16,
+        help="Nombre de messages envoyés à un worker à la fois. Par défaut : %(default)s."
+    )
 
-def encode_message(message):
-    """
-    Convertit le message en une séquence de bases.
-    """
-    logging.info("Conversion du message en bases...")
-    return convert_message_to_bases(message)
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Lance un service HTTP d'encodage/décodage avec micro-batching."
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute. Par défaut : %(default)s.")
+    serve_parser.add_argument("--port", type=int, default=8080, help="Port d'écoute. Par défaut : %(default)s.")
+    serve_parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Nombre de processus de travail. Par défaut : %(default)s."
+    )
+    serve_parser.add_argument(
+        "--max-batch-size", type=int, default=16,
+        help="Nombre maximal de requêtes par micro-batch. Par défaut : %(default)s."
+    )
+    serve_parser.add_argument(
+        "--max-wait-ms", type=float, default=5.0,
+        help="Attente maximale (ms) avant l'envoi d'un micro-batch incomplet. Par défaut : %(default)s."
+    )
+    serve_parser.add_argument(
+        "--max-body-size", type=int, default=MAX_BODY_SIZE,
+        help="Taille maximale (octets) du corps d'une requête, au-delà réponse 413. Par défaut : %(default)s."
+    )
+    return parser.parse_args()
 
-def add_codon_graph(G, base_list):
-    """
-    Ajoute le sous-graphe des codons au graphe.
-    """
-    logging.info("Ajout du sous-graphe codon...")
-    aa_to_codons = build_aa_to_codons(gen_code.GENETIC_CODE, include_stop=True) # On inclus les stop plus fidele realité
-    start, end = add_codon_subgraph_bio(G, base_list, gen_code.GENETIC_CODE, aa_to_codons)
-    return start, end
 
-def simulate_expression(G, base_list):
+def report_encoding(result):
     """
-    Simule l'expression génique à partir de la séquence de bases.
+    Affiche le résultat de GenimgPipeline.encode : bases, contraintes, protéine et chemin optimal.
+    Retourne False si les contraintes d'expression génique ne sont pas respectées.
     """
-    logging.info("Simulation de l'expression genique...")
-    if len(base_list) % 3 != 0:
-        padding_needed = 3 - (len(base_list) % 3)
-        logging.info(f"Padding : Ajout de {padding_needed} base(s) pour atteindre un multiple de 3.")
-        base_list += ["A"] * padding_needed
-    # Construction d'une séquence ADN avec promoteur et signal de terminaison ATG pour ADRn
-    dna_sequence = PROMOTER + ADRN + ''.join(base_list) + TERMINATION_SIGNAL
-
-    constraints_status = validate_gene_expression_constraints(dna_sequence, G)
-    if not constraints_status["is_valid"]:
-        for key, error in constraints_status["errors"].items():
+    logging.info("Bases generees pour le message '%s': %s", Truncated(result["message"]), Truncated(result["bases"]))
+    if not result["is_valid"]:
+        for error in result["errors"].values():
             logging.error(error)
-        raise ValueError("Les contraintes d'expression genique ne sont pas respectées.")
-    
-    try:
-        protein = simulate_gene_expression(dna_sequence)
-        logging.info(f"Proteine synthetisee : {protein}")
-    except ValueError as e:
-        logging.error(f"Erreur lors de la simulation de l'expression génique: {e}")
+        logging.error("Les contraintes d'expression genique ne sont pas respectées.")
+        return False
+    print(f"Temps d'exécution : {result['timings']['path']:.4f} secondes")
+    base_path = extract_base_path(result["path"])
+    logging.info("Chemin simple (ATCG) : %s", Truncated(base_path))
+    print(f"Chemin base (ATCG) : {base_path}")
+    return True
+
 
-def compute(G, start, end, ALPHA, BETA, GAMMA, base_list, message):
+def plot(figures, show, func, *args, **kwargs):
     """
-    Calcule trois chemins optimisés à l'aide de Bellman-Ford, A* et Dijkstra,
-    loggue chacun d'eux avec leur poids, et retourne le chemin ayant le poids minimal.
+    Affiche une figure, ou l'ajoute aux figures à écrire sur disque (figures n'est pas None : --output-dir).
     """
-    logging.info("Recherche du chemin contraint...")
-    start_time = time.perf_counter()
+    if figures is not None:
+        figures.append((func, args, kwargs))
+    elif show:
+        func(*args, **kwargs)
 
-    # Calculer les trois chemins et gérer d'éventuelles erreurs
-    try:
-        bf_path = bellman_ford(G, start, end, MANDATORY_NODES, ALPHA, BETA, GAMMA)
-    except Exception as e:
-        logging.error("Bellman-Ford a échoué: %s", e)
-        bf_path = None
 
-    try:
-        astar_path = astar(G, start, end, MANDATORY_NODES, ALPHA, BETA, GAMMA, heuristic=lambda u, v: 0)
-    except Exception as e:
-        logging.error("A* a échoué: %s", e)
-        astar_path = None
-
-    try:
-        dj_path = dijkstra(G, start, end, MANDATORY_NODES, ALPHA, BETA, GAMMA)
-    except Exception as e:
-        logging.error("Dijkstra a échoué: %s", e)
-        dj_path = None
-
-    end_time = time.perf_counter()
-    execution_time = end_time - start_time
-    print(f"Temps d'exécution : {execution_time:.4f} secondes")
-
-    # Construire la séquence ADN complète utilisée pour calculer les poids
-    dna_sequence = PROMOTER + ADRN + ''.join(base_list) + TERMINATION_SIGNAL
-
-    # Stocker les candidats avec leur nom, chemin et poids
-    candidate_paths = []
-    if bf_path is not None:
-        weight_bf = compute_path_weight(G, bf_path, ALPHA, BETA, GAMMA, dna_sequence)
-        candidate_paths.append(('Bellman-Ford', bf_path, weight_bf))
-    if astar_path is not None:
-        weight_astar = compute_path_weight(G, astar_path, ALPHA, BETA, GAMMA, dna_sequence)
-        candidate_paths.append(('A*', astar_path, weight_astar))
-    if dj_path is not None:
-        weight_dj = compute_path_weight(G, dj_path, ALPHA, BETA, GAMMA, dna_sequence)
-        candidate_paths.append(('Dijkstra', dj_path, weight_dj))
-
-    # Loguer tous les chemins candidats
-    for algo_name, path, weight in candidate_paths:
-        logging.info(f"{algo_name} path: {path} avec poids {weight}")
-
-    # Sélectionner le chemin optimal (celui avec le poids minimal)
-    if candidate_paths:
-        best_candidate = min(candidate_paths, key=lambda x: x[2])
-        best_path = best_candidate[1]
-        logging.info(f"Chemin optimal choisi par {best_candidate[0]}: {best_path} avec poids {best_candidate[2]}")
-    else:
-        raise ValueError("Aucun chemin n'a pu être calculé.")
-
-    base_path = extract_base_path(best_path)
-    logging.info(f"Chemin simple (ATCG) : {base_path}")
-    print(f"Chemin base (ATCG) : {base_path}")
-    return best_path
+def render(figures, output_dir, workers):
+    """Écrit les figures en attente dans output_dir (pool de processus) puis vide la liste."""
+    if not figures:
+        return
+    t0 = time.perf_counter()
+    paths = render_figures(figures, output_dir, workers)
+    figures.clear()
+    logging.info("%d figure(s) ecrite(s) en %.2f s : %s", len(paths), time.perf_counter() - t0, paths)
+    print(f"Figures : {', '.join(paths)}")
 
 
-def draw(G, best_path, base_list, message, alpha, beta, gamma):    
+def draw(result, show=True, figures=None):
     """
-    Dessine le graph avec le best_path pour le message
+    Dessine le graphe du message (résultat de GenimgPipeline.encode avec keep_graph=True) et son meilleur chemin.
+    Avec show=False (mode headless), seuls le poids du chemin et le message décodé sont affichés.
+    Avec figures (liste), la figure est ajoutée aux figures à écrire sur disque au lieu d'être affichée.
     """
-    pos = set_positions_by_layer(G, LAYER_CONFIG, default_pos=(10, 0))
-    logging.info("Dessin du graphe...")
-    for node in best_path:
-        if node not in pos:
-            pos[node] = (10, 0)
-    # Appel à draw_graph avec show_codon_nodes=False pour masquer les codons
-    draw_graph(G, pos, best_path, show_codon_nodes=False)
-    
-    dna_sequence = PROMOTER + ADRN + ''.join(base_list) + TERMINATION_SIGNAL
-    total_weight = compute_path_weight(G, best_path, alpha, beta, gamma, dna_sequence)
-    logging.info(f"Poids total du chemin: {total_weight}")
-    print(f"Poids total du chemin: {total_weight}")
-    decoded_message = decode_message_from_path(best_path, original_bases=base_list, original_length=len(message))
-    logging.info(f"Message decode: {decoded_message}")
-    print(f"Message decode: {decoded_message}")
-
-def gauss_kernel(message):
+    G, best_path = result["graph"], result["path"]
+    if show or figures is not None:
+        pos = set_positions_by_layer(G, LAYER_CONFIG, default_pos=(10, 0))
+        logging.info("Dessin du graphe...")
+        for node in best_path:
+            if node not in pos:
+                pos[node] = (10, 0)
+        # Appel à draw_graph avec show_codon_nodes=False pour masquer les codons
+        plot(figures, show, draw_graph, G, pos, best_path, show_codon_nodes=False)
+
+    logging.info("Poids total du chemin: %s", result["weight"])
+    print(f"Poids total du chemin: {result['weight']}")
+    logging.info("Message decode: %s", Truncated(result["decoded"]))
+    print(f"Message decode: {result['decoded']}")
+
+def gauss_kernel(message, workers=None):
     """
     Test pour chaque mot de la phrase gauss kernel
     """
-    all_results = gaussian_kernel_test_sentence(message, ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE, NUMB_TEST, random_seed=SEED)
+    all_results = gaussian_kernel_test_sentence(message, ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE, NUMB_TEST, random_seed=SEED,
+                                                workers=workers)
     """for word, results in all_results.items():
         print(f"Résultats pour le mot '{word}':")
         for res in results:
@@ -239,8 +251,8 @@ def aggregate_sequence(G, path):
     
     Paramètres
     ----------
-    G : nx.DiGraph
-        Le graphe contenant les noeuds.
+    G : nx.DiGraph | LayeredCandidates
+        Le graphe contenant les noeuds, ou les couches compactes de build_layered_candidates.
     path : list
         La liste des noeuds formant le chemin.
     
@@ -249,6 +261,8 @@ def aggregate_sequence(G, path):
     str
         La séquence totale obtenue par concaténation des séquences de chaque nœud.
     """
+    if isinstance(G, LayeredCandidates):
+        return G.aggregate(path)
     full_sequence = ""
     for node in path:
         seq = G.nodes[node].get("sequence", "")
@@ -326,59 +340,73 @@ def run_all_algorithms_on_layered_graph(G, ALPHA, BETA, GAMMA, algorithms, chose
         return None
 
 def main():
-    setup_logging()
     args = parse_arguments()
+    setup_logging(args.log_level, args.log_file)
+
+    if args.command == "batch":
+        # Import différé : le mode batch n'est chargé que s'il est demandé
+        from dna_graph.batch import run_batch
+        summary = run_batch(args.input, args.output, args.workers, args.chunk_size,
+                            args.alpha, args.beta, args.gamma, args.log_level, args.log_file)
+        print(f"{summary['messages']} messages ({summary['errors']} erreurs) en {summary['elapsed']:.2f} s : "
+              f"{summary['messages_per_s']:.1f} messages/s, {summary['bases_per_s']:.0f} bases/s")
+        return
+
+    if args.command == "serve":
+        import asyncio
+        from dna_graph.service import serve
+        try:
+            asyncio.run(serve(args.host, args.port, args.workers, args.max_batch_size, args.max_wait_ms,
+                              args.alpha, args.beta, args.gamma, args.log_level, args.log_file,
+                              args.max_body_size))
+        except KeyboardInterrupt:
+            logging.info("Arret du service.")
+        return
     logging.info("Demarrage de Genimg ...")
     
     try:
-        # Initialisation du graphe
-        G = initialize_graph()
+        # Initialisation du graphe de connaissance
+        enzymes = RESTRICTION_ENZYMES
+        if args.enzymes is not None:
+            enzymes = args.enzymes if args.enzymes == "all" else [name.strip() for name in args.enzymes.split(",")]
+        pipeline = GenimgPipeline(args.alpha, args.beta, args.gamma, enzymes=enzymes)
     except Exception as e:
-        logging.error(f"Erreur lors de l'initialisation du graphe : {e}")
+        logging.error("Erreur lors de l'initialisation du graphe : %s", e)
         return
 
     try:
-        # Conversion du message en bases
-        base_list = encode_message(args.message)
-        logging.info(f"Bases generees pour le message '{args.message}': {base_list}")
+        # Conversion du message, sous-graphe codon, contraintes (et correction), expression génique,
+        # recherche du chemin optimal et décodage
+        result = pipeline.encode(args.message, keep_graph=True)
     except Exception as e:
-        logging.error(f"Erreur lors de la conversion du message : {e}")
+        logging.error("Erreur lors de l'encodage du message : %s", e)
         return
-
-    try:
-        # Ajout du sous-graphe codon
-        start, end = add_codon_graph(G, base_list)
-    except Exception as e:
-        logging.error(f"Erreur lors de l'ajout du sous-graphe codon : {e}")
+    if not report_encoding(result):
         return
 
+    # Avec --output-dir, les figures sont rassemblées puis rendues sur disque (sans affichage)
+    figures = [] if args.output_dir else None
     try:
-        # Simulation de l'expression génétique (transcription, correction et traduction)
-        simulate_expression(G, base_list)
+        # Dessine le graph
+        draw(result, show=not args.headless, figures=figures)
     except Exception as e:
-        logging.error(f"Erreur lors de la simulation de l'expression genetique : {e}")
+        logging.error("Erreur lors du dessin du graphe : %s", e)
         return
 
-    try:
-        # Recherche du chemin optimal
-        best_path = compute(G, start, end, args.alpha, args.beta, args.gamma, base_list, args.message)
-    except Exception as e:
-        logging.error(f"Erreur lors du calcul du chemin : {e}")
-        return
-    
-    try:
-        # Dessine le graph
-        draw(G, best_path, base_list, args.message, args.alpha, args.beta, args.gamma)
-    except Exception as e:
-        logging.error(f"Erreur lors du dessin du graphe : {e}")
+    # En mode headless, les analyses gaussiennes ne tournent que sur demande (--gauss)
+    if args.headless and not args.gauss:
+        logging.info("Mode headless : tests gaussiens et second graphe ignores.")
+        render(figures, args.output_dir, args.render_workers)
         return
 
+    show = not args.headless
+    G2 = None
     try:
         # Test avec plusieurs parametre
-        gauss_kernel(args.message)
+        gauss_kernel(args.message, args.gauss_workers)
         # Affichage optionnel de la distribution gaussienne avec histogramme pour l'ensemble du message
         some_results = gaussian_kernel_test(args.message, ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE, NUMBER_TEST, random_seed=SEED)
-        plot_gaussian_with_histogram(some_results,  DEFAULT_MUTATION_RATE, sigma=0.005)
+        plot(figures, show, plot_gaussian_with_histogram, some_results, DEFAULT_MUTATION_RATE, sigma=0.005)
 
         # Générer des tests pour un mot unique et clusteriser les résultats
         test_results = gaussian_kernel_test(args.message, ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE, NUMBER_TEST, random_seed=SEED)
@@ -389,36 +417,51 @@ def main():
             print(f"  Score de similarité: {res['score']:.3f}")
         
         # Visualisation des clusters en 3D
-        plot_clusters(test_results, dimensions=3)
+        plot(figures, show, plot_clusters, test_results, dimensions=3)
         
         # On exécute à nouveau un test gaussien sur le message pour une utilisation ultérieure 
         test_results = gaussian_kernel_test(args.message, ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE, NUMBER_TEST, random_seed=SEED)
             
         # Traitement pour le second graphe
-        word_results = get_word_test_results(args.message, NUMB_TEST, NBR_BEST, ALPHA, BETA, GAMMA, DEFAULT_MUTATION_RATE, SEED)
-        G2 = draw_layered_sequence_graph(args.message, word_results, NBR_BEST) 
+        if args.adaptive_tolerance is not None:
+            word_results = get_word_test_results(args.message, NUMB_TEST, NBR_BEST, ALPHA, BETA, GAMMA,
+                                                 DEFAULT_MUTATION_RATE, SEED, batch_size=ADAPTIVE_BATCH_SIZE,
+                                                 sampler="adaptive", tolerance=args.adaptive_tolerance)
+        else:
+            word_results = get_word_test_results(args.message, NUMB_TEST, NBR_BEST, ALPHA, BETA, GAMMA,
+                                                 DEFAULT_MUTATION_RATE, SEED, workers=args.gauss_workers)
+        # Couches compactes (arêtes implicites) ; le dessin n'est qu'une étape facultative
+        G2 = build_layered_candidates(args.message, word_results, NBR_BEST)
+        plot(figures, show, draw_layered_candidates, G2)
     except Exception as e:
         logging.exception("Erreur lors des tests gaussiens : %s", e)
 
+    try:
+        render(figures, args.output_dir, args.render_workers)
+    except Exception as e:
+        logging.exception("Erreur lors du rendu des figures : %s", e)
+
+    if G2 is None:
+        return
+
     try:
         # Exemple d'appel dans main()
         algorithms = ["dijkstra", "bellman_ford", "astar", "bfs", "dfs", "floyd_warshall", "johnson"]
         chosen_alg = "floyd_warshall"  # Remplacez par l'algorithme que je souhaite afficher
-        best_path_G2 = run_all_algorithms_on_layered_graph(G2, ALPHA, BETA, GAMMA, algorithms, chosen_alg)
+        result_G2 = run_all_algorithms_on_layered_graph(G2, ALPHA, BETA, GAMMA, algorithms, chosen_alg)
 
-        if best_path_G2 is not None:
-            logging.info(f"Chemin optimal sur le second graphe : {best_path_G2}")
+        if result_G2 is not None:
+            best_path_G2 = result_G2["path"]
+            logging.info("Chemin optimal sur le second graphe : %s", Truncated(best_path_G2))
             print(f"Chemin optimal sur le second graphe : {best_path_G2}")
             
-            total_sequence = aggregate_sequence(G2, best_path_G2)
+            total_sequence = result_G2["total_sequence"]
             print("Séquence totale :", total_sequence)
-            dna_sequence_G2 = PROMOTER + ADRN + total_sequence + TERMINATION_SIGNAL
-            protein_G2 = simulate_gene_expression(dna_sequence_G2)
-            print("Protéine synthétisée pour le graphe 2 :", protein_G2)
+            print("Protéine synthétisée pour le graphe 2 :", result_G2["protein"])
         else:
             logging.error("Aucun chemin n'a pu être trouvé sur le second graphe.")
     except Exception as e:
-        logging.error(f"Erreur lors du calcul du chemin sur le second graphe : {e}")
+        logging.error("Erreur lors du calcul du chemin sur le second graphe : %s", e)
 
     
 if __name__ == '__main__':
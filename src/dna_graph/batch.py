@@ -0,0 +1,144 @@
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from dna_graph.pipeline import GenimgPipeline
+from dna_graph.core.logs import setup_logging
+from config.config import ALPHA, BETA, GAMMA, LOG_LEVEL, LOG_FILE
+
+# Champs du résultat recopiés dans chaque ligne de sortie
+OUTPUT_FIELDS = ("path", "weight", "sequence", "protein", "is_valid", "errors", "timings")
+
+# Pipeline propre à chaque processus de travail (initialisé une seule fois par worker)
+_pipeline = None
+
+
+def init_worker(alpha=ALPHA, beta=BETA, gamma=GAMMA, log_level=None, log_file=None):
+    """
+    Initialise le pipeline (graphe de connaissance) du processus courant.
+    Si log_level est fourni, le logging du worker est reconfiguré en mode ajout
+    pour ne pas écraser le fichier du processus principal.
+    """
+    global _pipeline
+    if log_level is not None:
+        setup_logging(log_level, log_file, file_mode="a")
+    _pipeline = GenimgPipeline(alpha, beta, gamma)
+
+
+def encode_chunk(records):
+    """
+    Encode un bloc d'enregistrements {'message': ..., ['id': ...]} avec le pipeline du worker.
+    Retourne la liste des lignes de sortie, dans le même ordre.
+    """
+    out = []
+    for record in records:
+        line = {key: record[key] for key in ("id", "message") if key in record}
+        try:
+            result = _pipeline.encode(record["message"])
+        except Exception as e:
+            logging.error("Erreur lors de l'encodage : %s", e)
+            line["error"] = str(e)
+        else:
+            line.update((field, result[field]) for field in OUTPUT_FIELDS)
+            line["n_bases"] = len(result["bases"])
+        out.append(line)
+    return out
+
+
+def decode_chunk(records):
+    """
+    Décode un bloc d'enregistrements {'sequence': ..., ['length': ...]} avec le pipeline du worker.
+    Retourne la liste des résultats de GenimgPipeline.decode, dans le même ordre.
+    """
+    out = []
+    for record in records:
+        try:
+            out.append(_pipeline.decode(record["sequence"], record.get("length")))
+        except Exception as e:
+            logging.error("Erreur lors du decodage : %s", e)
+            out.append({"error": str(e)})
+    return out
+
+
+def read_records(lines):
+    """
+    Lit un flux JSONL : chaque ligne est un objet {"message": ..., "id": ...} ou une chaîne JSON.
+    Les lignes vides sont ignorées.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if isinstance(record, str):
+            record = {"message": record}
+        elif "message" not in record:
+            raise ValueError(f"Champ 'message' manquant : {line[:80]}")
+        yield record
+
+
+def iter_chunks(records, chunk_size):
+    """Découpe un itérable en listes de chunk_size éléments, sans tout charger en mémoire."""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(input_path, output_path, workers=1, chunk_size=16,
+              alpha=ALPHA, beta=BETA, gamma=GAMMA, log_level=LOG_LEVEL, log_file=LOG_FILE):
+    """
+    Encode tous les messages d'un fichier JSONL et écrit un résultat par ligne, dans l'ordre d'entrée.
+
+    Le graphe de connaissance est initialisé une fois par worker ; les messages circulent par blocs
+    de chunk_size dans un pool de processus, avec au plus 2 * workers blocs en vol.
+
+    Retourne :
+      - summary (dict) : 'messages', 'bases', 'errors', 'elapsed', 'messages_per_s', 'bases_per_s'.
+    """
+    n_messages = n_bases = n_errors = 0
+    start_time = time.perf_counter()
+
+    with open(input_path, encoding="utf-8") as fin, open(output_path, "w", encoding="utf-8") as fout:
+        def write(lines):
+            nonlocal n_messages, n_bases, n_errors
+            for line in lines:
+                n_messages += 1
+                n_bases += line.get("n_bases", 0)
+                n_errors += "error" in line
+                fout.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+        chunks = iter_chunks(read_records(fin), chunk_size)
+        if workers <= 1:
+            init_worker(alpha, beta, gamma)
+            for chunk in chunks:
+                write(encode_chunk(chunk))
+        else:
+            # Le processus principal repasse en mode ajout : tous les processus écrivent en fin de fichier
+            setup_logging(log_level, log_file, file_mode="a")
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                     initargs=(alpha, beta, gamma, log_level, log_file)) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(encode_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+
+    elapsed = time.perf_counter() - start_time
+    summary = {
+        "messages": n_messages,
+        "bases": n_bases,
+        "errors": n_errors,
+        "elapsed": elapsed,
+        "messages_per_s": n_messages / elapsed if elapsed > 0 else 0.0,
+        "bases_per_s": n_bases / elapsed if elapsed > 0 else 0.0,
+    }
+    logging.info("Batch termine : %s", summary)
+    return summary
@@ -0,0 +1,97 @@
+"""
+Index précompilé du code génétique.
+
+Construit une seule fois à l'import à partir de GENETIC_CODE :
+  - CODONS : les 64 codons, indexés de 0 à 63 (A=0, C=1, G=2, T=3, comme l'encodage en base 4).
+  - CODON_TO_AA_ID : tableau (64,) codon -> identifiant d'acide aminé.
+  - STOP_MASK : masque booléen (64,) des codons stop.
+  - SYNONYM_OFFSETS / SYNONYM_CODONS : table des codons synonymes (format CSR), les codons
+    de l'acide aminé k sont SYNONYM_CODONS[SYNONYM_OFFSETS[k]:SYNONYM_OFFSETS[k + 1]].
+  - SYNONYM_START / SYNONYM_COUNT : pour chaque codon, début et taille de son groupe de synonymes.
+  - CODON_INDEX, AA_ID, AA_TO_CODONS : tables inverses (chaîne -> index, acide aminé -> codons).
+
+L'ordre des synonymes suit celui de GENETIC_CODE, identique à build_aa_to_codons.
+"""
+import numpy as np
+from dna_graph.bio.genetic_code import GENETIC_CODE
+
+NUCLEOTIDES = "ACGT"
+STOP = "Stop"
+
+# Codons indexés en base 4 : index = 16 * b1 + 4 * b2 + b3
+CODONS = tuple(b1 + b2 + b3 for b1 in NUCLEOTIDES for b2 in NUCLEOTIDES for b3 in NUCLEOTIDES)
+CODON_INDEX = {codon: i for i, codon in enumerate(CODONS)}
+
+# Acides aminés dans l'ordre de première apparition dans GENETIC_CODE
+AMINO_ACIDS = tuple(dict.fromkeys(GENETIC_CODE.values()))
+AA_ID = {aa: i for i, aa in enumerate(AMINO_ACIDS)}
+
+CODON_TO_AA_ID = np.array([AA_ID[GENETIC_CODE[codon]] for codon in CODONS], dtype=np.uint8)
+STOP_MASK = CODON_TO_AA_ID == AA_ID[STOP]
+
+# Bases de chaque codon sous forme d'octets ASCII (64, 3)
+CODON_BYTES = np.frombuffer("".join(CODONS).encode("ascii"), dtype=np.uint8).reshape(64, 3).copy()
+
+# Table des synonymes : codons regroupés par acide aminé, ordre de GENETIC_CODE conservé
+_groups = [[CODON_INDEX[c] for c, aa in GENETIC_CODE.items() if aa == amino] for amino in AMINO_ACIDS]
+SYNONYM_OFFSETS = np.cumsum([0] + [len(g) for g in _groups]).astype(np.intp)
+SYNONYM_CODONS = np.array([i for g in _groups for i in g], dtype=np.intp)
+SYNONYM_START = SYNONYM_OFFSETS[CODON_TO_AA_ID]
+SYNONYM_COUNT = SYNONYM_OFFSETS[CODON_TO_AA_ID + 1] - SYNONYM_START
+
+AA_TO_CODONS = {aa: tuple(CODONS[i] for i in g) for aa, g in zip(AMINO_ACIDS, _groups)}
+_SYNONYMS_BY_CODON = tuple(AA_TO_CODONS[GENETIC_CODE[codon]] for codon in CODONS)
+del _groups
+
+# Table de conversion octet ASCII -> index de nucléotide (255 = invalide)
+_BASE_LOOKUP = np.full(256, 255, dtype=np.uint8)
+for _i, _b in enumerate(NUCLEOTIDES):
+    _BASE_LOOKUP[ord(_b)] = _i
+_BASE_LOOKUP[ord("U")] = NUCLEOTIDES.index("T")
+
+
+def codon_id(codon: str) -> int:
+    """Retourne l'index (0-63) d'un codon ADN ou ARN, ou -1 s'il n'est pas reconnu."""
+    i = CODON_INDEX.get(codon)
+    if i is None:
+        # Notation ARN : U -> T
+        i = CODON_INDEX.get(codon.replace("U", "T"), -1)
+    return i
+
+
+def amino_acid(codon: str):
+    """Retourne l'acide aminé d'un codon ADN ou ARN, ou None s'il n'est pas reconnu."""
+    i = codon_id(codon)
+    return AMINO_ACIDS[CODON_TO_AA_ID[i]] if i >= 0 else None
+
+
+def synonymous_codons(codon: str, include_stop: bool = True) -> tuple:
+    """
+    Retourne les codons synonymes d'un codon (lui compris), dans l'ordre de GENETIC_CODE.
+    Un codon inconnu (ou un stop si include_stop=False) n'a que lui-même comme option.
+    """
+    i = CODON_INDEX.get(codon, -1)
+    if i < 0 or (not include_stop and STOP_MASK[i]):
+        return (codon,)
+    return _SYNONYMS_BY_CODON[i]
+
+
+def sequence_to_codon_ids(sequence) -> np.ndarray:
+    """
+    Convertit une séquence (str, liste de bases ou tampon d'octets ASCII : bytes, memoryview...)
+    en tableau d'index de codons. Un tampon est lu sans copie.
+    Seuls les codons complets sont convertis ; un codon contenant une base inconnue vaut -1.
+    """
+    if isinstance(sequence, (bytes, bytearray, memoryview)):
+        raw = np.frombuffer(sequence, dtype=np.uint8)
+        n_codons = len(raw) // 3
+        raw = raw[:n_codons * 3]
+    else:
+        if not isinstance(sequence, str):
+            sequence = "".join(sequence)
+        n_codons = len(sequence) // 3
+        raw = np.frombuffer(sequence[:n_codons * 3].encode("ascii", "replace"), dtype=np.uint8)
+    digits = _BASE_LOOKUP[raw].reshape(n_codons, 3).astype(np.intp)
+    ids = digits[:, 0] * 16 + digits[:, 1] * 4 + digits[:, 2]
+    ids[(digits == 255).any(axis=1)] = -1
+    return ids
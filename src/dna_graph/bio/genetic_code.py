@@ -85,15 +85,17 @@ def add_degeneracy_edges(G):
     Ajoute des aretes entre les segments 3-mers codant pour le même acide aminé (hors codons STOP),
     avec un coût minimal pour modeliser la degeneracy
     """
-    genetic_code = GENETIC_CODE
+    # Import local : codon_index est construit à partir de GENETIC_CODE
+    from dna_graph.bio.codon_index import CODON_INDEX, CODON_TO_AA_ID, STOP_MASK
 
-    segments = [n for n, d in G.nodes(data=True) if d.get("type") == "segment_3mer"]
     groups = {}
-    for seg_node in segments:
-        codon = seg_node.split("(")[1].split(")")[0]
-        aa = genetic_code.get(codon)
-        if aa and aa != "Stop":
-            groups.setdefault(aa, []).append(seg_node)
+    for seg_node, d in G.nodes(data=True):
+        if d.get("type") != "segment_3mer":
+            continue
+        # Le label du noeud porte le codon, pas besoin de découper son nom
+        idx = CODON_INDEX.get(d.get("label"), -1)
+        if idx >= 0 and not STOP_MASK[idx]:
+            groups.setdefault(CODON_TO_AA_ID[idx], []).append(seg_node)
     for aa, seg_list in groups.items():
         if len(seg_list) > 1:
             for i in range(len(seg_list)):
@@ -1,16 +1,23 @@
 import logging
 from config.config import PROMOTER, TERMINATION_SIGNAL
-import dna_graph.bio.genetic_code as gen_code
+import dna_graph.bio.codon_index as codon_index
 import random
 
+import numpy as np
+
+_PROMOTER_BYTES = PROMOTER.encode("ascii")
+_TERMINATION_BYTES = TERMINATION_SIGNAL.encode("ascii")
+# Nombre de codons traduits par bloc : la traduction s'arrête au premier bloc contenant un stop
+TRANSLATION_CHUNK = 1 << 16
+
 def codon_to_amino_acid(codon: str) -> str:
     """
     Convertit un codon (ARN, 3 nucléotides) en son acide aminé correspondant (lettre).
     Si le codon n'est pas reconnu, retourne "?".
-    La conversion U->T permet d'utiliser le dictionnaire en notation ADN.
+    La table inverse de codon_index accepte directement la notation ARN.
     """
-    codon_dna = codon.replace("U", "T")
-    return gen_code.GENETIC_CODE.get(codon_dna, "?")
+    aa = codon_index.amino_acid(codon)
+    return aa if aa is not None else "?"
 
 def transcribe(dna_sequence: str) -> str:
     """
@@ -29,10 +36,11 @@ def transcribe(dna_sequence: str) -> str:
         raise ValueError("La sequence d'ADN doit commencer par le promoteur 'TATAATG'.")
     
     promoter_index = dna_sequence.index(PROMOTER)
+    # Appelé à chaque simulation : niveau DEBUG, message formaté seulement si ce niveau est actif
     if promoter_index != 0:
-        logging.info("Passage par le Promoteur detecte a l'index %d. Transcription initiee apres le promoteur.", promoter_index)
+        logging.debug("Passage par le Promoteur detecte a l'index %d. Transcription initiee apres le promoteur.", promoter_index)
     else:
-        logging.info("La sequence commence par le Promoteur.")
+        logging.debug("La sequence commence par le Promoteur.")
     
     # Début de la transcription juste après le promoteur
     start_transcription = promoter_index + len(PROMOTER)
@@ -77,6 +85,101 @@ def translate(mRNA: str) -> str:
     
     return ''.join(protein)
 
+class TranscriptionUnit:
+    """
+    Unité de transcription promoteur -> terminaison, repérée par ses positions dans le tampon
+    d'origine (aucune copie) ; l'ARNm et la protéine ne sont calculés qu'à la demande.
+
+    Attributs :
+      - promoter (int) : position du promoteur.
+      - start, end (int) : bornes [start, end) de la portion transcrite (après le promoteur,
+        avant le signal de terminaison).
+      - terminated (bool) : False si la séquence se termine sans signal de terminaison.
+    """
+
+    __slots__ = ("_buffer", "promoter", "start", "end", "terminated")
+
+    def __init__(self, buffer, promoter, start, end, terminated):
+        self._buffer = buffer
+        self.promoter = promoter
+        self.start = start
+        self.end = end
+        self.terminated = terminated
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __repr__(self):
+        return f"TranscriptionUnit(promoter={self.promoter}, start={self.start}, end={self.end})"
+
+    @property
+    def view(self) -> memoryview:
+        """Vue (sans copie) sur l'ADN transcrit."""
+        return memoryview(self._buffer)[self.start:self.end]
+
+    def mrna(self) -> str:
+        """ARNm de l'unité (même résultat que transcribe sur une séquence isolée)."""
+        return bytes(self.view).decode("ascii").replace("T", "U")
+
+    def protein(self) -> str:
+        """Protéine de l'unité (même résultat que translate(self.mrna()))."""
+        return translate_dna(self.view)
+
+
+def iter_transcription_units(dna_sequence):
+    """
+    Parcourt toutes les unités de transcription d'une séquence (plusieurs gènes concaténés).
+
+    Chaque unité commence après un promoteur et s'arrête au premier signal de terminaison qui suit
+    (ou à la fin de la séquence) ; le promoteur suivant est cherché après ce signal.
+
+    Paramètres :
+      - dna_sequence (str | bytes | bytearray | mmap) : La séquence d'ADN. Un tampon d'octets
+        (par exemple un fichier ouvert avec mmap) est parcouru sans copie : la mémoire utilisée
+        ne dépend pas de la taille de la séquence. Une chaîne est convertie une fois en octets.
+
+    Retourne :
+      - units (generator) : TranscriptionUnit dans l'ordre de la séquence.
+    """
+    buffer = dna_sequence.encode("ascii") if isinstance(dna_sequence, str) else dna_sequence
+    position = 0
+    while True:
+        promoter_index = buffer.find(_PROMOTER_BYTES, position)
+        if promoter_index == -1:
+            return
+        start = promoter_index + len(_PROMOTER_BYTES)
+        termination_index = buffer.find(_TERMINATION_BYTES, start)
+        if termination_index == -1:
+            yield TranscriptionUnit(buffer, promoter_index, start, len(buffer), False)
+            return
+        yield TranscriptionUnit(buffer, promoter_index, start, termination_index, True)
+        position = termination_index + len(_TERMINATION_BYTES)
+
+
+def translate_dna(dna) -> str:
+    """
+    Traduit directement de l'ADN (str ou tampon d'octets) en protéine, comme translate(transcribe(...))
+    sans construire l'ARNm : les codons sont indexés par blocs et la lecture s'arrête au premier stop.
+    """
+    if isinstance(dna, str):
+        dna = dna.encode("ascii")
+    dna = memoryview(dna)
+    if bytes(dna[:3]) != b"ATG":
+        raise ValueError("L'ARNm ne commence pas par le codon START (AUG).")
+    protein = []
+    n_codons = len(dna) // 3
+    for first in range(0, n_codons, TRANSLATION_CHUNK):
+        last = min(first + TRANSLATION_CHUNK, n_codons)
+        ids = codon_index.sequence_to_codon_ids(dna[3 * first:3 * last])
+        stops = np.flatnonzero((ids >= 0) & codon_index.STOP_MASK[ids])
+        if len(stops):
+            ids = ids[:stops[0]]
+        protein.extend(codon_index.AMINO_ACIDS[aa] if i >= 0 else "?"
+                       for i, aa in zip(ids.tolist(), codon_index.CODON_TO_AA_ID[ids].tolist()))
+        if len(stops):
+            break
+    return "".join(protein)
+
 def introduce_mutations(dna_sequence: str, mutation_rate) -> str:
     """
     Introduit des mutations dans la séquence d'ADN en substituant aléatoirement des nucléotides,
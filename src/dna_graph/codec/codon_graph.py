@@ -1,3 +1,6 @@
+import dna_graph.bio.codon_index as codon_index
+from dna_graph.bio.genetic_code import GENETIC_CODE
+
 def build_aa_to_codons(genetic_code, include_stop=False):
     """
     Construit un dictionnaire associant chaque acide aminé à une liste de codons.
@@ -20,12 +23,17 @@ def add_edge_if_not_exists(G, u, v, **attrs):
     if not G.has_edge(u, v):
         G.add_edge(u, v, **attrs)
 
-def add_codon_subgraph_bio(G, base_list, genetic_code, aa_to_codons):
+def add_codon_subgraph_bio(G, base_list, genetic_code=None, aa_to_codons=None):
     """
     Ajoute un sous-graphe codon au graphe G en utilisant la séquence de bases.
     Crée un graphe en couches permettant des chemins alternatifs (via la dégénérescence)
     tout en évitant les doublons.
     
+    Par défaut, les options codoniques proviennent de l'index précompilé (codon_index,
+    stops inclus). genetic_code et aa_to_codons permettent de fournir un code génétique différent ;
+    si un seul des deux est donné, l'autre est complété : genetic_code par GENETIC_CODE,
+    aa_to_codons par build_aa_to_codons(genetic_code, include_stop=True).
+    
     Retourne :
       - (start, end) : tuple contenant le nœud "start" et le nœud "end".
     """
@@ -34,17 +42,26 @@ def add_codon_subgraph_bio(G, base_list, genetic_code, aa_to_codons):
         if node not in G:
             G.add_node(node, type="virtual", label=label)
 
+    if genetic_code is not None and aa_to_codons is None:
+        aa_to_codons = build_aa_to_codons(genetic_code, include_stop=True)
+    elif aa_to_codons is not None and genetic_code is None:
+        genetic_code = GENETIC_CODE
+
     num_codons = len(base_list) // 3
+    sequence = "".join(base_list[:num_codons * 3])
     layers = []
     for pos in range(num_codons):
         # Extraire le codon du message pour cette position
-        msg_codon = "".join(base_list[pos*3: pos*3+3])
-        aa = genetic_code.get(msg_codon)
-        # Récupère les options pour l'acide aminé, ou garde le codon du message s'il n'est pas reconnu
-        codon_options = aa_to_codons.get(aa, [msg_codon]) if aa is not None else [msg_codon]
-        # Enlever les doublons tout en conservant l'ordre
-        seen = set()
-        codon_options = [c for c in codon_options if c not in seen and not seen.add(c)]
+        msg_codon = sequence[pos*3: pos*3+3]
+        if genetic_code is None and aa_to_codons is None:
+            codon_options = codon_index.synonymous_codons(msg_codon)
+        else:
+            aa = genetic_code.get(msg_codon)
+            # Récupère les options pour l'acide aminé, ou garde le codon du message s'il n'est pas reconnu
+            codon_options = aa_to_codons.get(aa, [msg_codon]) if aa is not None else [msg_codon]
+            # Enlever les doublons tout en conservant l'ordre
+            seen = set()
+            codon_options = [c for c in codon_options if c not in seen and not seen.add(c)]
         
         layer_nodes = []
         for codon in codon_options:
@@ -52,7 +69,7 @@ def add_codon_subgraph_bio(G, base_list, genetic_code, aa_to_codons):
             # Marquer comme "préféré" si c'est le codon issu du message
             preferred = (codon == msg_codon)
             if node_name not in G:
-                G.add_node(node_name, type="segment_3mer", label=codon, preferred=preferred)
+                G.add_node(node_name, type="segment_3mer", label=codon, preferred=preferred, position=pos)
             layer_nodes.append(node_name)
         layers.append(layer_nodes)
 
@@ -0,0 +1,337 @@
+"""
+Encodeur contraint : choix des codons synonymes de chaque couche de add_codon_subgraph_bio
+pour que la séquence complète respecte les contraintes d'expression, en une passe.
+
+Programmation dynamique couche par couche. L'état après une couche est :
+  - l'état d'un automate d'Aho-Corasick des sites de restriction, sur les deux brins (le suffixe utile
+    de la séquence) :
+    un site apparaît dès qu'un état acceptant est atteint, y compris à cheval entre deux codons ;
+  - la dernière base et la longueur de sa répétition, si max_homopolymer est fixé ;
+  - le nombre de G/C écrits, conservé sous forme de vecteur : pour chaque état de l'automate,
+    un tableau NumPy donne le coût minimal (nombre de codons différents du message) par compte GC.
+Le vecteur GC est restreint, à chaque couche, à la bande des comptes encore compatibles avec le
+ratio final (compte minimal / maximal atteignable sur les couches restantes). Une seule passe
+avant puis un retour arrière donnent la variante de coût minimal, ou prouvent qu'aucune
+variante ne respecte les contraintes.
+
+Coût : O(couches x états x options x largeur de bande) ; la bande est bornée par l'écart GC
+entre synonymes, soit quelques bases par codon.
+
+Le décodage lit les bases elles-mêmes (4 bases par caractère) : un codon synonyme dans le message
+changerait le message décodé. repair_sequence verrouille donc les codons du message (locked_bases)
+et ajoute après eux des codons de remplissage libres (SPACER_CODONS), que le décodeur ignore
+puisqu'il ne lit que les 4 * longueur premières bases (ou la longueur protégée par Reed-Solomon,
+ou le gabarit des marqueurs de synchronisation).
+"""
+import itertools
+import math
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+from config.config import PROMOTER, ADRN, TERMINATION_SIGNAL, MAX_HOMOPOLYMER
+from dna_graph.contraintes.gene_contraintes import DEFAULT_RESTRICTION_SITES
+from dna_graph.contraintes.restriction import expand_iupac, get_restriction_scanner, reverse_complement
+from dna_graph.contraintes.scanner import BASES
+import dna_graph.bio.codon_index as codon_index
+
+_INF = np.iinfo(np.int32).max // 2
+# Codons de remplissage possibles (tous sauf les stops, pour ne pas interrompre la traduction)
+SPACER_CODONS = [codon for codon, stop in zip(codon_index.CODONS, codon_index.STOP_MASK) if not stop]
+# Codons de remplissage essayés au-delà du minimum imposé par le ratio GC (sites et répétitions aux jonctions)
+SPACER_SLACK = 3
+
+
+class _SiteAutomaton:
+    """Automate d'Aho-Corasick (table de transitions complète sur ACGT) d'un ensemble de sites."""
+
+    def __init__(self, sites):
+        goto, accept = [{}], [False]
+        for site in sites:
+            state = 0
+            for base in site:
+                if base not in goto[state]:
+                    goto.append({})
+                    accept.append(False)
+                    goto[state][base] = len(goto) - 1
+                state = goto[state][base]
+            accept[state] = True
+
+        delta = [dict() for _ in goto]
+        fail = [0] * len(goto)
+        queue = deque()
+        for base in BASES:
+            child = goto[0].get(base)
+            delta[0][base] = 0 if child is None else child
+            if child is not None:
+                queue.append(child)
+        while queue:
+            state = queue.popleft()
+            # Un état est acceptant si l'un de ses suffixes (lien d'échec) l'est
+            accept[state] = accept[state] or accept[fail[state]]
+            for base in BASES:
+                child = goto[state].get(base)
+                if child is None:
+                    delta[state][base] = delta[fail[state]][base]
+                else:
+                    fail[child] = delta[fail[state]][base]
+                    delta[state][base] = child
+                    queue.append(child)
+        self.delta = delta
+        self.accept = accept
+
+
+@lru_cache(maxsize=16)
+def _site_automaton(sites):
+    """
+    Automate des sites interdits (codes IUPAC développés), sur les deux brins : chaque site est
+    accompagné de son complément inverse, comme dans find_restriction_enzymes.
+    """
+    return _SiteAutomaton([pattern for site in sites for oriented in dict.fromkeys((site, reverse_complement(site)))
+                           for pattern in expand_iupac(oriented)])
+
+
+def _count_bounds(total, lower_bound, upper_bound):
+    """Comptes GC entiers k tels que lower_bound <= k / total <= upper_bound (même test que validate_gc_ratio)."""
+    low = max(math.floor(lower_bound * total) - 1, 0)
+    while low <= total and low / total < lower_bound:
+        low += 1
+    high = min(math.ceil(upper_bound * total) + 1, total)
+    while high >= 0 and high / total > upper_bound:
+        high -= 1
+    return low, high
+
+
+def constrained_variant(layers, preferred=None, prefix="", suffix="", restriction_sites=None,
+                        gc_bounds=(0.40, 0.60), max_homopolymer=None, enzymes=None):
+    """
+    Cherche la variante de coût minimal respectant les contraintes.
+
+    Paramètres :
+      - layers (list) : Pour chaque position, la liste des codons possibles.
+      - preferred (list, optionnel) : Codon du message à chaque position (coût 0, les autres coûtent 1).
+        Par défaut, le premier codon de chaque couche.
+      - prefix, suffix (str) : Parties fixes avant et après les codons (promoteur, terminaison...).
+      - restriction_sites (list) : Motifs interdits (par défaut DEFAULT_RESTRICTION_SITES) ;
+        les codes IUPAC (N, R, Y...) sont développés en séquences ACGT. Chaque motif est interdit
+        sur les deux brins (complément inverse compris).
+      - enzymes (list | dict, optionnel) : Enzymes de la bibliothèque dont les sites sont aussi
+        interdits (mêmes valeurs que pour validate_gene_expression_constraints).
+      - gc_bounds (tuple) : Bornes du ratio GC de la séquence complète.
+      - max_homopolymer (int, optionnel) : Longueur maximale d'une répétition d'une même base.
+
+    Retourne :
+      - result (dict) : 'feasible' (bool), 'codons' (liste choisie, None si impossible),
+        'sequence' (séquence complète ou None), 'substitutions' (codons modifiés),
+        'gc_ratio' et 'reason' (explication si impossible).
+    """
+    if restriction_sites is None:
+        restriction_sites = DEFAULT_RESTRICTION_SITES
+    if preferred is None:
+        preferred = [options[0] for options in layers]
+    sites = list(restriction_sites)
+    if enzymes is not None:
+        sites += get_restriction_scanner(enzymes).enzymes.values()
+    automaton = _site_automaton(tuple(dict.fromkeys(sites)))
+    delta, accept = automaton.delta, automaton.accept
+
+    def step(state, bases):
+        """Applique des bases à un état (automate, dernière base, répétition) ; None si une contrainte est violée."""
+        node, last, run = state
+        for base in bases:
+            node = delta[node].get(base, 0)
+            if accept[node]:
+                return None
+            if max_homopolymer is not None:
+                run = run + 1 if base == last else 1
+                last = base
+                if run > max_homopolymer:
+                    return None
+        return node, last, run
+
+    def infeasible(reason):
+        return {"feasible": False, "codons": None, "sequence": None, "substitutions": None,
+                "gc_ratio": None, "reason": reason}
+
+    start = step((0, None, 0), prefix)
+    if start is None:
+        return infeasible("Le préfixe fixe viole une contrainte.")
+
+    total = len(prefix) + 3 * len(layers) + len(suffix)
+    fixed_gc = sum(base in "GC" for base in prefix + suffix)
+    low, high = _count_bounds(total, *gc_bounds) if total else (0, 0)
+    # Comptes GC accessibles sur les couches (hors parties fixes)
+    low, high = low - fixed_gc, high - fixed_gc
+
+    option_gc = [[sum(base in "GC" for base in codon) for codon in options] for options in layers]
+    min_rest = np.concatenate([np.cumsum([min(g) for g in option_gc][::-1])[::-1], [0]]).astype(int)
+    max_rest = np.concatenate([np.cumsum([max(g) for g in option_gc][::-1])[::-1], [0]]).astype(int)
+    if max_rest[0] < low or min_rest[0] > high:
+        return infeasible("Aucun choix de codons n'atteint le ratio GC requis.")
+
+    # Couche courante : état -> vecteur de coûts indexé par (compte GC - band_low)
+    band_low = 0
+    frontier = {start: np.zeros(1, dtype=np.int32)}
+    history = []  # par couche : (band_low, états, {état: (indice état précédent, option)})
+    transitions = {}
+    for i, options in enumerate(layers):
+        states = list(frontier)
+        # Bande des comptes encore compatibles avec le ratio final après la couche i
+        reach_low = band_low + min(option_gc[i])
+        reach_high = band_low + max(len(v) for v in frontier.values()) - 1 + max(option_gc[i])
+        new_low = max(reach_low, low - max_rest[i + 1])
+        new_high = min(reach_high, high - min_rest[i + 1])
+        if new_low > new_high:
+            return infeasible(f"Ratio GC inatteignable à partir de la position {i}.")
+        width = new_high - new_low + 1
+        new_frontier, back = {}, {}
+        for s_index, state in enumerate(states):
+            costs = frontier[state]
+            for o_index, codon in enumerate(options):
+                key = (state, codon)
+                if key not in transitions:
+                    transitions[key] = step(state, codon)
+                target = transitions[key]
+                if target is None:
+                    continue
+                # Compte GC d'arrivée = band_low + j + gc(codon) ; indice dans la nouvelle bande
+                offset = band_low + option_gc[i][o_index] - new_low
+                lo_j, hi_j = max(0, -offset), min(len(costs), width - offset)
+                if lo_j >= hi_j:
+                    continue
+                candidate = costs[lo_j:hi_j] + (codon != preferred[i])
+                if target not in new_frontier:
+                    new_frontier[target] = np.full(width, _INF, dtype=np.int32)
+                    back[target] = (np.full(width, -1, dtype=np.int32), np.full(width, -1, dtype=np.int16))
+                current = new_frontier[target][lo_j + offset:hi_j + offset]
+                better = candidate < current
+                if better.any():
+                    current[better] = candidate[better]
+                    prev_states, prev_options = back[target]
+                    prev_states[lo_j + offset:hi_j + offset][better] = s_index
+                    prev_options[lo_j + offset:hi_j + offset][better] = o_index
+        # Les vecteurs vides (tous à _INF) correspondent à des états inaccessibles
+        new_frontier = {state: costs for state, costs in new_frontier.items() if (costs < _INF).any()}
+        if not new_frontier:
+            return infeasible(f"Aucun codon possible à la position {i} sans site interdit ni répétition.")
+        history.append((new_low, states, back))
+        frontier, band_low = new_frontier, new_low
+
+    # Fin : partie fixe après les codons, puis choix du meilleur couple (état, compte GC)
+    best = None
+    for state, costs in frontier.items():
+        if step(state, suffix) is None:
+            continue
+        for j in np.flatnonzero(costs < _INF):
+            gc = band_low + j
+            if low <= gc <= high and (best is None or costs[j] < best[0]):
+                best = (int(costs[j]), state, int(j))
+    if best is None:
+        return infeasible("Aucune variante ne respecte les contraintes avec la partie fixe finale.")
+
+    cost, state, j = best
+    codons = [None] * len(layers)
+    for i in range(len(layers) - 1, -1, -1):
+        layer_low, states, back = history[i]
+        prev_states, prev_options = back[state]
+        s_index, o_index = int(prev_states[j]), int(prev_options[j])
+        codons[i] = layers[i][o_index]
+        previous_low = history[i - 1][0] if i else 0
+        gc = layer_low + j - option_gc[i][o_index]
+        state, j = states[s_index], gc - previous_low
+    sequence = prefix + "".join(codons) + suffix
+    return {"feasible": True, "codons": codons, "sequence": sequence, "substitutions": cost,
+            "gc_ratio": (sum(base in "GC" for base in sequence) / len(sequence)) if sequence else 0.0,
+            "reason": None}
+
+
+def layers_from_graph(G, base_list):
+    """
+    Couches de codons ajoutées par add_codon_subgraph_bio pour base_list (attribut 'position' des nœuds).
+
+    Retourne :
+      - layers (list) : codons possibles à chaque position.
+      - preferred (list) : codon du message à chaque position.
+    """
+    sequence = "".join(base_list)
+    num_codons = len(sequence) // 3
+    layers = [[] for _ in range(num_codons)]
+    for _, data in G.nodes(data=True):
+        position = data.get("position")
+        if data.get("type") == "segment_3mer" and position is not None and position < num_codons:
+            layers[position].append(data["label"])
+    preferred = [sequence[3 * i:3 * i + 3] for i in range(num_codons)]
+    # Position absente du graphe : seul le codon du message est possible
+    layers = [options or [codon] for options, codon in zip(layers, preferred)]
+    return layers, preferred
+
+
+def _min_spacers(layers, fixed, gc_bounds, limit):
+    """
+    Nombre minimal de codons de remplissage (0 à 3 G/C chacun) pour que le ratio GC soit atteignable,
+    les parties fixes `fixed` comprises ; None au-delà de limit.
+    """
+    option_gc = [[sum(base in "GC" for base in codon) for codon in options] for options in layers]
+    fixed_gc = sum(base in "GC" for base in fixed)
+    lowest = fixed_gc + sum(min(g) for g in option_gc)
+    highest = fixed_gc + sum(max(g) for g in option_gc)
+    total = len(fixed) + 3 * len(layers)
+    for spacers in range(limit + 1):
+        low, high = _count_bounds(total + 3 * spacers, *gc_bounds)
+        if lowest <= high and highest + 3 * spacers >= low and low <= high:
+            return spacers
+    return None
+
+
+def repair_sequence(G, base_list, restriction_sites=None, gc_bounds=(0.40, 0.60), max_homopolymer=MAX_HOMOPOLYMER,
+                    locked_bases=None, max_spacers=None, enzymes=None):
+    """
+    Variante de la séquence d'expression (promoteur + ATG + bases + terminaison) respectant les
+    contraintes : codons synonymes choisis sur les couches de codons de G, puis codons de
+    remplissage libres (SPACER_CODONS) ajoutés après les bases si nécessaire.
+    Les bases sont d'abord complétées par des 'A' jusqu'à un multiple de 3.
+
+    Paramètres :
+      - restriction_sites, enzymes : sites interdits, comme pour validate_gene_expression_constraints
+        (voir constrained_variant).
+      - locked_bases (int, optionnel) : les codons qui recouvrent les locked_bases premières bases
+        gardent le codon du message (bases lues au décodage, voir le docstring du module) ;
+        max_homopolymer est relevé à la plus longue répétition de ces codons.
+      - max_spacers (int, optionnel) : nombre maximal de codons de remplissage ; par défaut autant
+        que le ratio GC en demande (plus SPACER_SLACK). 0 : codons synonymes seulement.
+
+    Retourne le dictionnaire de constrained_variant ('substitutions' : codons du message modifiés),
+    avec en plus 'bases' (bases choisies, remplissage compris, None si impossible) et 'spacers'
+    (nombre de codons de remplissage ajoutés).
+    """
+    padded = list(base_list) + ["A"] * (-len(base_list) % 3)
+    layers, preferred = layers_from_graph(G, padded)
+    prefix, suffix = PROMOTER + ADRN, TERMINATION_SIGNAL
+    if locked_bases:
+        layers = [[codon] if 3 * i < locked_bases else options
+                  for i, (options, codon) in enumerate(zip(layers, preferred))]
+        if max_homopolymer is not None:
+            # Une répétition entièrement verrouillée ne peut pas être corrigée : la limite est relevée
+            # à sa longueur, pour ne contraindre que les bases libres
+            locked = prefix + "".join(preferred[:-(-locked_bases // 3)])
+            longest = max((len(list(run)) for _, run in itertools.groupby(locked)), default=0)
+            max_homopolymer = max(max_homopolymer, longest)
+    limit = len(prefix) + len(padded) + len(suffix) if max_spacers is None else max_spacers
+    fewest = _min_spacers(layers, prefix + suffix, gc_bounds, limit)
+    result, spacers = None, 0
+    if fewest is not None:
+        for spacers in range(fewest, min(fewest + SPACER_SLACK, limit) + 1):
+            # Un codon de remplissage n'a pas de codon préféré : chacun coûte 1, retiré du total ensuite
+            result = constrained_variant(layers + [SPACER_CODONS] * spacers, preferred + [None] * spacers,
+                                         prefix, suffix, restriction_sites, gc_bounds, max_homopolymer, enzymes)
+            if result["feasible"]:
+                result["substitutions"] -= spacers
+                break
+    if result is None:
+        # Ratio GC inatteignable même avec max_spacers codons de remplissage : raison donnée par la DP
+        result = constrained_variant(layers, preferred, prefix, suffix, restriction_sites, gc_bounds,
+                                     max_homopolymer, enzymes)
+    result["spacers"] = spacers if result["feasible"] else 0
+    result["bases"] = list("".join(result["codons"])) if result["feasible"] else None
+    return result
@@ -20,15 +20,21 @@ def convert_message_to_bases(message):
             bases.append(mapping[d])
     return bases
 
-def decode_message_from_path(path, original_bases, original_length):
+def decode_message_from_path(path, original_bases=None, original_length=None):
     """
     Reconstruit un message à partir des bases originales.
     
     Ici, on considère que 'original_bases' contient la séquence complète des bases générées initialement.
     On découpe cette séquence en groupes de 4 bases pour reconstituer chaque caractère.
+    Si original_bases est None, les bases sont lues sur le chemin (extract_base_path).
     
-    Le paramètre original_length permet de limiter le décodage au nombre de caractères originaux.
+    Le paramètre original_length permet de limiter le décodage au nombre de caractères originaux
+    (par défaut : toutes les bases disponibles).
     """
+    if original_bases is None:
+        original_bases = extract_base_path(path)
+    if original_length is None:
+        original_length = len(original_bases) // 4
     # On prend les n*4 premières bases
     relevant_bases = original_bases[:original_length * 4]
     mapping_inv = {"A": 0, "C": 1, "G": 2, "T": 3}
@@ -0,0 +1,311 @@
+"""
+Code correcteur de Reed-Solomon sur GF(256), appliqué aux bases du message.
+
+Chaque octet correspond à 4 bases (base 4, A=0, C=1, G=2, T=3, comme convert_message_to_bases).
+Le message est découpé en blocs de 255 - nsym octets au plus ; chaque bloc reçoit nsym octets de
+parité et peut corriger jusqu'à nsym // 2 octets erronés (substitutions de bases).
+La disposition est systématique : toutes les données, puis toutes les parités. Les 4 * longueur
+premières bases restent donc le message d'origine (décodable par decode_message_from_path).
+
+Arithmétique par tables log/antilog (polynôme primitif 0x11d, générateur 2). L'encodage
+(registre à décalage) et le calcul des syndromes sont vectorisés sur tous les blocs à la fois ;
+seuls les blocs dont un syndrome est non nul passent par Berlekamp-Massey, Chien et Forney.
+"""
+import numpy as np
+
+from config.config import RS_NSYM
+
+FIELD_SIZE = 256
+PRIMITIVE_POLY = 0x11d
+
+GF_EXP = np.zeros(2 * FIELD_SIZE, dtype=np.intp)
+GF_LOG = np.zeros(FIELD_SIZE, dtype=np.intp)
+_x = 1
+for _i in range(FIELD_SIZE - 1):
+    GF_EXP[_i] = _x
+    GF_LOG[_x] = _i
+    _x <<= 1
+    if _x & FIELD_SIZE:
+        _x ^= PRIMITIVE_POLY
+GF_EXP[FIELD_SIZE - 1:] = GF_EXP[:FIELD_SIZE + 1]
+
+# Versions liste pour les calculs scalaires (plus rapides que l'indexation NumPy élément par élément)
+_EXP = GF_EXP.tolist()
+_LOG = GF_LOG.tolist()
+
+_BASES = np.frombuffer(b"ACGT", dtype=np.uint8)
+_BASE_VALUES = np.full(256, 255, dtype=np.uint8)
+_BASE_VALUES[_BASES] = np.arange(4, dtype=np.uint8)
+
+
+class ReedSolomonError(ValueError):
+    """Trop d'erreurs dans un bloc pour qu'il soit corrigé."""
+
+
+# ----- Arithmétique scalaire -----
+
+def gf_mul(x, y):
+    if x == 0 or y == 0:
+        return 0
+    return _EXP[_LOG[x] + _LOG[y]]
+
+
+def gf_div(x, y):
+    if y == 0:
+        raise ZeroDivisionError("Division par zéro dans GF(256)")
+    if x == 0:
+        return 0
+    return _EXP[(_LOG[x] + 255 - _LOG[y]) % 255]
+
+
+def gf_pow(x, power):
+    return _EXP[(_LOG[x] * power) % 255]
+
+
+def gf_inverse(x):
+    return _EXP[255 - _LOG[x]]
+
+
+def gf_poly_scale(p, x):
+    return [gf_mul(coef, x) for coef in p]
+
+
+def gf_poly_add(p, q):
+    result = [0] * max(len(p), len(q))
+    for i, coef in enumerate(p):
+        result[i + len(result) - len(p)] = coef
+    for i, coef in enumerate(q):
+        result[i + len(result) - len(q)] ^= coef
+    return result
+
+
+def gf_poly_mul(p, q):
+    result = [0] * (len(p) + len(q) - 1)
+    for j, q_coef in enumerate(q):
+        for i, p_coef in enumerate(p):
+            result[i + j] ^= gf_mul(p_coef, q_coef)
+    return result
+
+
+def gf_poly_eval(p, x):
+    """Évalue p (coefficients du plus haut degré au plus bas) en x (schéma de Horner)."""
+    y = p[0]
+    for coef in p[1:]:
+        y = gf_mul(y, x) ^ coef
+    return y
+
+
+def gf_poly_div(dividend, divisor):
+    """Division euclidienne (diviseur unitaire) : retourne (quotient, reste)."""
+    out = list(dividend)
+    for i in range(len(dividend) - len(divisor) + 1):
+        coef = out[i]
+        if coef:
+            for j in range(1, len(divisor)):
+                if divisor[j]:
+                    out[i + j] ^= gf_mul(divisor[j], coef)
+    separator = -(len(divisor) - 1)
+    return out[:separator], out[separator:]
+
+
+# ----- Arithmétique vectorisée -----
+
+def gf_mul_array(x, y):
+    """Produit élément par élément de deux tableaux d'octets dans GF(256)."""
+    x, y = np.asarray(x, dtype=np.intp), np.asarray(y, dtype=np.intp)
+    return np.where((x == 0) | (y == 0), 0, GF_EXP[GF_LOG[x] + GF_LOG[y]])
+
+
+def generator_poly(nsym):
+    """Polynôme générateur prod_{j < nsym} (x - 2^j), du plus haut degré au plus bas."""
+    g = [1]
+    for j in range(nsym):
+        g = gf_poly_mul(g, [1, gf_pow(2, j)])
+    return g
+
+
+def syndromes(codewords, nsym):
+    """
+    Syndromes S_j = c(2^j), j < nsym, de chaque mot de code (une ligne par bloc).
+    Retourne un tableau (n_blocs, nsym) ; un bloc sans erreur a des syndromes tous nuls.
+    """
+    codewords = np.atleast_2d(np.asarray(codewords, dtype=np.intp))
+    length = codewords.shape[1]
+    nonzero = codewords != 0
+    logs = GF_LOG[codewords]
+    powers = length - 1 - np.arange(length)
+    result = np.zeros((len(codewords), nsym), dtype=np.intp)
+    for j in range(nsym):
+        terms = np.where(nonzero, GF_EXP[(logs + j * powers) % 255], 0)
+        result[:, j] = np.bitwise_xor.reduce(terms, axis=1)
+    return result
+
+
+# ----- Encodage / décodage par blocs -----
+
+def _blocks(data, nsym):
+    """Découpe data en une matrice (n_blocs, k) ; le dernier bloc, plus court, est complété par des 0 en tête."""
+    k = FIELD_SIZE - 1 - nsym
+    n_blocks = max(-(-len(data) // k), 1)
+    matrix = np.zeros((n_blocks, k), dtype=np.intp)
+    full = (len(data) // k) * k
+    matrix[:len(data) // k] = np.frombuffer(bytes(data[:full]), dtype=np.uint8).reshape(-1, k)
+    rest = len(data) - full
+    if rest:
+        matrix[-1, k - rest:] = np.frombuffer(bytes(data[full:]), dtype=np.uint8)
+    return matrix, rest
+
+
+def protected_length(length, nsym=RS_NSYM):
+    """Nombre d'octets produits par rs_encode pour `length` octets de données."""
+    return length + max(-(-length // (FIELD_SIZE - 1 - nsym)), 1) * nsym
+
+
+def rs_encode(data, nsym=RS_NSYM):
+    """
+    Ajoute nsym octets de parité par bloc de 255 - nsym octets.
+
+    Paramètres :
+      - data (bytes) : Données à protéger.
+      - nsym (int) : Nombre d'octets de parité par bloc (corrige nsym // 2 erreurs par bloc).
+
+    Retourne :
+      - encoded (bytes) : data suivi des parités de tous les blocs.
+    """
+    if not 0 < nsym < FIELD_SIZE - 1:
+        raise ValueError(f"Nombre de symboles de parité invalide : {nsym}")
+    matrix, _ = _blocks(data, nsym)
+    g = np.array(generator_poly(nsym)[1:], dtype=np.intp)
+    # Registre à décalage : reste de la division par g, mis à jour pour tous les blocs à la fois
+    parity = np.zeros((len(matrix), nsym), dtype=np.intp)
+    for i in range(matrix.shape[1]):
+        feedback = matrix[:, i] ^ parity[:, 0]
+        parity[:, :-1] = parity[:, 1:]
+        parity[:, -1] = 0
+        parity ^= gf_mul_array(feedback[:, None], g[None, :])
+    return bytes(data) + parity.astype(np.uint8).tobytes()
+
+
+def _correct_block(codeword, synd, nsym):
+    """Corrige un bloc (liste d'octets) à partir de ses syndromes ; lève ReedSolomonError si impossible."""
+    synd = [0] + list(synd)  # convention : syndrome décalé d'un rang
+    # Berlekamp-Massey : polynôme localisateur d'erreurs
+    err_loc, old_loc = [1], [1]
+    for i in range(nsym):
+        delta = synd[i + 1]
+        for j in range(1, len(err_loc)):
+            delta ^= gf_mul(err_loc[-(j + 1)], synd[i + 1 - j])
+        old_loc = old_loc + [0]
+        if delta:
+            if len(old_loc) > len(err_loc):
+                new_loc = gf_poly_scale(old_loc, delta)
+                old_loc = gf_poly_scale(err_loc, gf_inverse(delta))
+                err_loc = new_loc
+            err_loc = gf_poly_add(err_loc, gf_poly_scale(old_loc, delta))
+    while err_loc and err_loc[0] == 0:
+        del err_loc[0]
+    errors = len(err_loc) - 1
+    if errors * 2 > nsym:
+        raise ReedSolomonError("Trop d'erreurs pour être corrigées.")
+
+    # Recherche de Chien, vectorisée sur toutes les positions : racines de err_loc inversé
+    length = len(codeword)
+    reversed_loc = np.array(err_loc[::-1], dtype=np.intp)
+    exponents = np.arange(length)
+    values = np.zeros(length, dtype=np.intp)
+    for degree, coef in enumerate(reversed_loc):
+        if coef:
+            values ^= GF_EXP[(GF_LOG[coef] + exponents * (len(reversed_loc) - 1 - degree)) % 255]
+    err_pos = (length - 1 - np.flatnonzero(values == 0)).tolist()
+    if len(err_pos) != errors:
+        raise ReedSolomonError("Impossible de localiser les erreurs.")
+
+    # Algorithme de Forney : amplitude de chaque erreur
+    coef_pos = [length - 1 - p for p in err_pos]
+    errata_loc = [1]
+    for i in coef_pos:
+        errata_loc = gf_poly_mul(errata_loc, gf_poly_add([1], [gf_pow(2, i), 0]))
+    _, remainder = gf_poly_div(gf_poly_mul(synd[::-1], errata_loc), [1] + [0] * len(errata_loc))
+    err_eval = remainder[::-1]
+    X = [gf_pow(2, -(FIELD_SIZE - 1 - p)) for p in coef_pos]
+    corrected = list(codeword)
+    for i, Xi in enumerate(X):
+        Xi_inv = gf_inverse(Xi)
+        prime = 1
+        for j, Xj in enumerate(X):
+            if j != i:
+                prime = gf_mul(prime, 1 ^ gf_mul(Xi_inv, Xj))
+        y = gf_mul(Xi, gf_poly_eval(err_eval[::-1], Xi_inv))
+        corrected[err_pos[i]] ^= gf_div(y, prime)
+    return corrected
+
+
+def rs_decode(encoded, length, nsym=RS_NSYM):
+    """
+    Corrige et retourne les `length` octets de données d'un message encodé par rs_encode.
+
+    Lève ReedSolomonError si un bloc contient plus de nsym // 2 octets erronés.
+    Retourne :
+      - data (bytes) : Données corrigées.
+      - corrected (int) : Nombre d'octets corrigés.
+    """
+    encoded = bytes(encoded)
+    matrix, rest = _blocks(encoded[:length], nsym)
+    parity = np.frombuffer(encoded[length:length + len(matrix) * nsym], dtype=np.uint8)
+    if len(parity) != len(matrix) * nsym:
+        raise ReedSolomonError("Parité tronquée.")
+    codewords = np.concatenate([matrix, parity.reshape(len(matrix), nsym).astype(np.intp)], axis=1)
+    synd = syndromes(codewords, nsym)
+    corrected = 0
+    # Positions de remplissage (dernier bloc raccourci) : toute correction à cet endroit est invalide
+    padding = (matrix.shape[1] - rest) if rest else 0
+    for block in np.flatnonzero(synd.any(axis=1)):
+        fixed = _correct_block(codewords[block].tolist(), synd[block].tolist(), nsym)
+        fixed = np.array(fixed, dtype=np.intp)
+        if block == len(matrix) - 1 and padding and fixed[:padding].any():
+            raise ReedSolomonError("Correction hors des données du bloc.")
+        if syndromes(fixed, nsym).any():
+            raise ReedSolomonError("Bloc non corrigible.")
+        corrected += int(np.count_nonzero(fixed != codewords[block]))
+        codewords[block] = fixed
+    data = codewords[:, :-nsym]
+    data = np.concatenate([data[:-1].ravel(), data[-1, padding:]]) if len(data) else data.ravel()
+    return data[:length].astype(np.uint8).tobytes(), corrected
+
+
+# ----- Bases -----
+
+def bytes_to_bases(data):
+    """Convertit des octets en bases (4 bases par octet, poids fort en premier)."""
+    values = np.frombuffer(bytes(data), dtype=np.uint8)
+    digits = (values[:, None] >> np.array([6, 4, 2, 0], dtype=np.uint8)) & 3
+    return _BASES[digits.ravel()].tobytes().decode("ascii")
+
+
+def bases_to_bytes(bases):
+    """Convertit des bases en octets (4 bases par octet) ; les bases inconnues valent A."""
+    codes = _BASE_VALUES[np.frombuffer("".join(bases).encode("ascii", "replace"), dtype=np.uint8)]
+    codes = np.where(codes == 255, 0, codes)
+    codes = codes[:len(codes) // 4 * 4].reshape(-1, 4).astype(np.uint8)
+    return ((codes[:, 0] << 6) | (codes[:, 1] << 4) | (codes[:, 2] << 2) | codes[:, 3]).astype(np.uint8).tobytes()
+
+
+def protect_bases(base_list, nsym=RS_NSYM):
+    """Ajoute les bases de parité Reed-Solomon à des bases de message (4 bases par octet)."""
+    return list(bytes_to_bases(rs_encode(bases_to_bytes(base_list), nsym)))
+
+
+def recover_bases(bases, length, nsym=RS_NSYM):
+    """
+    Corrige des bases protégées par protect_bases.
+
+    Paramètres :
+      - bases (list | str) : Bases reçues (données puis parité).
+      - length (int) : Nombre d'octets de données (caractères du message).
+
+    Retourne :
+      - bases (list) : Les 4 * length bases de données corrigées.
+      - corrected (int) : Nombre d'octets corrigés.
+    """
+    data, corrected = rs_decode(bases_to_bytes(bases), length, nsym)
+    return list(bytes_to_bases(data)), corrected
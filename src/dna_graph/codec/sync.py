@@ -0,0 +1,255 @@
+"""
+Marqueurs de synchronisation et décodage tolérant aux insertions/délétions.
+
+À l'encodage, un marqueur fixe (SYNC_MARKER) précède chaque tranche de SYNC_INTERVAL bases.
+Au décodage :
+  1. les occurrences exactes du marqueur sont cherchées en une passe (dna_graph.contraintes.scanner),
+     puis chaînées dans l'ordre : le k-ième marqueur est accepté s'il se trouve à moins de `band`
+     bases de sa position attendue, corrigée du décalage mesuré au marqueur précédent ; sinon le
+     décalage est réestimé sur l'occurrence suivante (reverrouillage après un indel de plus de
+     `band` bases, jusqu'à une demi-période : au-delà, les marqueurs périodiques sont ambigus) ;
+  2. entre deux marqueurs ancrés, si la longueur lue est la longueur attendue, les bases sont
+     reprises telles quelles (substitutions seulement) ;
+  3. sinon (insertion, délétion, marqueur abîmé), la portion lue est réalignée sur le gabarit
+     attendu (marqueurs connus, bases du message quelconques 'N') par une distance d'édition en
+     bande, par morceaux d'au plus ALIGN_SPAN_PERIODS périodes (mémoire bornée même sans marqueur).
+     Toutes ces portions sont alignées ensemble, anti-diagonale par anti-diagonale :
+     les cellules d'une anti-diagonale ne dépendent que des deux précédentes, d'où un calcul NumPy
+     sur (portions x bande) à chaque pas.
+Les bases du message supprimées par le bruit sont remplacées par 'A' et les bases insérées
+sont ignorées : les erreurs restent locales à une tranche (à corriger par Reed-Solomon).
+"""
+import numpy as np
+
+from config.config import SYNC_MARKER, SYNC_INTERVAL, SYNC_BAND
+from dna_graph.contraintes.scanner import compile_patterns, encode_sequence
+
+WILDCARD = "N"
+# Code des positions 'N' du gabarit (acceptent toute base)
+_ANY = 254
+_INF = np.iinfo(np.int32).max // 2
+_DIAG, _UP, _LEFT = 0, 1, 2
+# Nombre de portions réalignées ensemble
+ALIGN_BATCH = 1024
+# Longueur maximale (en périodes marqueur + tranche) d'une portion réalignée d'un seul tenant
+ALIGN_SPAN_PERIODS = 4
+# Fenêtre (en périodes) de recherche du marqueur suivant quand un marqueur manque
+REACQUIRE_PERIODS = 4
+
+
+def add_sync_markers(bases, interval=SYNC_INTERVAL, marker=SYNC_MARKER):
+    """Insère le marqueur avant chaque tranche de `interval` bases ; retourne une liste de bases."""
+    bases = "".join(bases)
+    chunks = [marker + bases[start:start + interval] for start in range(0, len(bases), interval)]
+    return list("".join(chunks))
+
+
+def sync_template(n_payload, interval=SYNC_INTERVAL, marker=SYNC_MARKER):
+    """Gabarit attendu pour n_payload bases de message : marqueurs et 'N' à la place des bases."""
+    return "".join(add_sync_markers(WILDCARD * n_payload, interval, marker))
+
+
+def banded_align_batch(pairs, band=SYNC_BAND):
+    """
+    Aligne chaque (gabarit, lecture, fin_libre) par distance d'édition en bande ('N' du gabarit
+    = toute base sans coût ; substitution, insertion et délétion coûtent 1). Avec fin_libre,
+    la fin de la lecture peut rester non alignée (bases en trop après le gabarit).
+
+    Le calcul est vectorisé sur les portions et sur la bande : l'anti-diagonale s = i + j est
+    calculée à partir des anti-diagonales s - 1 et s - 2, indexées par le décalage o = j - i.
+
+    Retourne :
+      - alignments (list) : pour chaque portion, (distance, liste de (i, j)) où i est l'indice
+        dans le gabarit (None : base insérée) et j l'indice dans la lecture (None : base supprimée).
+    """
+    if not pairs:
+        return []
+    size = len(pairs)
+    m = np.array([len(t) for t, _, _ in pairs], dtype=np.intp)
+    n = np.array([len(r) for _, r, _ in pairs], dtype=np.intp)
+    lo = int(min(0, (n - m).min())) - band
+    hi = int(max(0, (n - m).max())) + band
+    offsets = np.arange(lo, hi + 1)
+    width = len(offsets)
+
+    templates = np.zeros((size, max(m.max(), 1)), dtype=np.uint8)
+    reads = np.zeros((size, max(n.max(), 1)), dtype=np.uint8)
+    for b, (template, read, _) in enumerate(pairs):
+        codes = encode_sequence(template)
+        templates[b, :len(template)] = np.where(np.frombuffer(template.encode("ascii"), np.uint8) == ord(WILDCARD),
+                                                _ANY, codes)
+        reads[b, :len(read)] = encode_sequence(read)
+
+    n_diagonals = int((m + n).max()) + 1
+    costs = np.full((n_diagonals, size, width), _INF, dtype=np.int32)
+    moves = np.zeros((n_diagonals, size, width), dtype=np.uint8)
+    rows = np.arange(size)[:, None]
+    for s in range(n_diagonals):
+        i = (s - offsets) // 2
+        j = (s + offsets) // 2
+        valid = (((s - offsets) % 2) == 0) & (i >= 0) & (j >= 0)
+        valid = valid[None, :] & (i[None, :] <= m[:, None]) & (j[None, :] <= n[:, None])
+        if s == 0:
+            costs[0][valid] = 0
+            continue
+        best = np.full((size, width), _INF, dtype=np.int32)
+        move = np.zeros((size, width), dtype=np.uint8)
+        if s >= 2:
+            # Diagonale (i-1, j-1) : même décalage, anti-diagonale s - 2
+            ti = np.clip(i - 1, 0, templates.shape[1] - 1)
+            rj = np.clip(j - 1, 0, reads.shape[1] - 1)
+            t_codes, r_codes = templates[rows, ti[None, :]], reads[rows, rj[None, :]]
+            mismatch = (t_codes != _ANY) & (t_codes != r_codes)
+            ok = ((i >= 1) & (j >= 1))[None, :]
+            best = np.where(ok, costs[s - 2] + mismatch, _INF).astype(np.int32)
+        previous = costs[s - 1]
+        # Délétion (i-1, j) : décalage o + 1 ; insertion (i, j-1) : décalage o - 1
+        up = np.full((size, width), _INF, dtype=np.int32)
+        up[:, :-1] = previous[:, 1:] + 1
+        left = np.full((size, width), _INF, dtype=np.int32)
+        left[:, 1:] = previous[:, :-1] + 1
+        better = up < best
+        best, move = np.where(better, up, best), np.where(better, _UP, move)
+        better = left < best
+        best, move = np.where(better, left, best), np.where(better, _LEFT, move)
+        costs[s] = np.where(valid, np.minimum(best, _INF), _INF)
+        moves[s] = move
+
+    alignments = []
+    for b, (_, _, free_end) in enumerate(pairs):
+        mb, nb = int(m[b]), int(n[b])
+        if free_end:
+            ends = [e for e in range(min(mb, nb), nb + 1) if lo <= e - mb <= hi]
+        else:
+            ends = [nb]
+        end = min(ends, key=lambda e: costs[mb + e, b, e - mb - lo])
+        distance = int(costs[mb + end, b, end - mb - lo])
+        pairs_b = [(None, j) for j in range(nb - 1, end - 1, -1)]
+        i, j = mb, end
+        while i > 0 or j > 0:
+            move = moves[i + j, b, j - i - lo]
+            if move == _DIAG:
+                i, j = i - 1, j - 1
+                pairs_b.append((i, j))
+            elif move == _UP:
+                i -= 1
+                pairs_b.append((i, None))
+            else:
+                j -= 1
+                pairs_b.append((None, j))
+        alignments.append((distance, pairs_b[::-1]))
+    return alignments
+
+
+def _anchor_markers(read, template_length, interval, marker, band):
+    """
+    Chaîne les occurrences exactes du marqueur : liste de (position gabarit, position lecture).
+
+    Un marqueur est cherché à moins de `band` bases de sa position attendue corrigée du décalage
+    courant. S'il manque (marqueur abîmé, ou décalage de plus de `band` bases : indel long, préfixe
+    non retiré), le décalage est réestimé sur la première occurrence suivante, cherchée dans une
+    fenêtre de REACQUIRE_PERIODS périodes : elle est attribuée au marqueur dont la position attendue
+    est la plus proche, ce qui reverrouille les décalages de moins d'une demi-période.
+    """
+    hits = compile_patterns([marker]).scan(read)["hits"][marker]
+    period = interval + len(marker)
+    n_markers = -(-template_length // period)
+    anchors = []
+    drift, last = 0, -1
+    k = 0
+    while k < n_markers:
+        target = k * period + drift
+        start = np.searchsorted(hits, max(target - band, last + 1))
+        best = None
+        for hit in hits[start:]:
+            if hit > target + band:
+                break
+            if best is None or abs(hit - target) < abs(best - target):
+                best = int(hit)
+        if best is None:
+            # Reverrouillage : première occurrence dans la fenêtre élargie
+            start = np.searchsorted(hits, max(target - period // 2, last + 1))
+            if start < len(hits) and hits[start] <= target + REACQUIRE_PERIODS * period:
+                best = int(hits[start])
+                k = min(k + int(round((best - target) / period)), n_markers - 1)
+        if best is not None:
+            anchors.append((k * period, best))
+            drift, last = best - k * period, best
+        k += 1
+    return anchors
+
+
+def _split_window(t_start, r_start, t_end, r_end, free_end, max_span):
+    """
+    Découpe une portion à réaligner en morceaux d'au plus max_span bases du gabarit (mémoire et temps
+    de banded_align_batch bornés) ; la lecture est répartie proportionnellement, sauf avec fin libre
+    où elle suit le gabarit et le dernier morceau garde le reste.
+    """
+    span = t_end - t_start
+    pieces = max(-(-span // max_span), 1)
+    if pieces == 1:
+        return [(t_start, r_start, t_end, r_end, free_end)]
+    t_cuts = [t_start + span * p // pieces for p in range(pieces + 1)]
+    if free_end:
+        r_cuts = [min(r_start + t - t_start, r_end) for t in t_cuts[:-1]] + [r_end]
+    else:
+        r_cuts = [r_start + round((t - t_start) * (r_end - r_start) / span) for t in t_cuts]
+    return [(t_cuts[p], r_cuts[p], t_cuts[p + 1], r_cuts[p + 1], free_end and p == pieces - 1)
+            for p in range(pieces)]
+
+
+def resync_bases(read, n_payload, interval=SYNC_INTERVAL, marker=SYNC_MARKER, band=SYNC_BAND):
+    """
+    Retrouve les n_payload bases du message dans une lecture bruitée (marqueurs compris).
+    Les bases qui suivent le gabarit (complément, terminaison...) sont ignorées.
+
+    Retourne :
+      - bases (list) : n_payload bases du message.
+      - stats (dict) : 'anchors' (marqueurs reverrouillés), 'realigned' (portions réalignées)
+        et 'distance' (distance d'édition totale des portions réalignées).
+    """
+    read = "".join(read)
+    template = sync_template(n_payload, interval, marker)
+    anchors = _anchor_markers(read, len(template), interval, marker, band)
+    bounds = ([(0, 0)] if not anchors or anchors[0] != (0, 0) else []) + anchors
+
+    out = np.full(len(template), ord("A"), dtype=np.uint8)
+    raw = np.frombuffer(read.encode("ascii", "replace"), dtype=np.uint8)
+    period = interval + len(marker)
+    windows = []
+    for k, (t_start, r_start) in enumerate(bounds):
+        last = k + 1 == len(bounds)
+        t_end, r_end = (len(template), len(raw)) if last else bounds[k + 1]
+        span = t_end - t_start
+        # Longueur attendue (ou fin plus longue avec marqueurs intacts) : substitutions seulement
+        if r_end - r_start == span or (last and r_end - r_start > span and _fits(raw, template, t_start, r_start, t_end)):
+            out[t_start:t_end] = raw[r_start:r_start + span]
+        else:
+            if last:
+                # Fin libre : au-delà d'une période après le gabarit, la lecture n'est pas alignée
+                r_end = min(r_end, r_start + span + period)
+            windows.extend(_split_window(t_start, r_start, t_end, r_end, last, ALIGN_SPAN_PERIODS * period))
+
+    distance = 0
+    # Réalignement par lots de portions de longueurs voisines, pour borner la mémoire des matrices
+    # (anti-diagonales x portions x bande)
+    windows.sort(key=lambda window: (window[2] - window[0], window[3] - window[1]))
+    for start in range(0, len(windows), ALIGN_BATCH):
+        batch = windows[start:start + ALIGN_BATCH]
+        pairs = [(template[t0:t1], read[r0:r1], last) for t0, r0, t1, r1, last in batch]
+        for (t0, r0, _, _, _), (cost, alignment) in zip(batch, banded_align_batch(pairs, band)):
+            distance += cost
+            for i, j in alignment:
+                if i is not None and j is not None:
+                    out[t0 + i] = raw[r0 + j]
+    payload = out[np.frombuffer(template.encode("ascii"), dtype=np.uint8) == ord(WILDCARD)]
+    stats = {"anchors": len(anchors), "realigned": len(windows), "distance": distance}
+    return list(payload.tobytes().decode("ascii")), stats
+
+
+def _fits(raw, template, t_start, r_start, t_end):
+    """Vrai si les marqueurs du gabarit [t_start, t_end) sont intacts dans la lecture à partir de r_start."""
+    expected = np.frombuffer(template[t_start:t_end].encode("ascii"), dtype=np.uint8)
+    observed = raw[r_start:r_start + len(expected)]
+    fixed = expected != ord(WILDCARD)
+    return np.array_equal(observed[fixed], expected[fixed])
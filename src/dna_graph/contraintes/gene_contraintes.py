@@ -1,17 +1,52 @@
 import networkx as nx
-from config.config import PROMOTER, TERMINATION_SIGNAL, MANDATORY_NODES
+from config.config import PROMOTER, TERMINATION_SIGNAL, MANDATORY_NODES, GC_WINDOW, MAX_HOMOPOLYMER
+from dna_graph.contraintes.scanner import INVALID, compile_patterns
+from dna_graph.contraintes.profile import gc_window_violations, homopolymer_runs
+from dna_graph.contraintes.restriction import IUPAC, expand_iupac, get_restriction_scanner
+
+# Site de EcoRI, vérifié par défaut
+DEFAULT_RESTRICTION_SITES = ["GAATTC"]
+
+def _site_patterns(restriction_sites):
+    """
+    Motifs ACGT recherchés pour chaque site : ses développements IUPAC (voir restriction.expand_iupac),
+    ou aucun pour un site hors alphabet IUPAC, cherché tel quel dans la séquence comme auparavant.
+    """
+    return {site: expand_iupac(site) if site and not set(site) - set(IUPAC) else []
+            for site in restriction_sites}
+
+def _contains_site(dna_sequence, site, patterns, hits):
+    """Vrai si le site est présent : un de ses motifs a une occurrence, ou le site littéral figure dans la séquence."""
+    if patterns:
+        return any(len(hits[pattern]) for pattern in patterns)
+    return site in dna_sequence
 
 def validate_restriction_sites(dna_sequence: str, restriction_sites: list = None) -> bool:
     """
     Vérifie que la séquence d'ADN ne contient pas de motifs de restriction enzymatique indésirables.
     Par défaut, on vérifie pour le motif 'GAATTC' (site de EcoRI).
+    Les codes IUPAC (N, R, Y...) sont développés ; un site contenant d'autres caractères est cherché tel quel.
     """
     if restriction_sites is None:
-        restriction_sites = ["GAATTC"]  
-    for site in restriction_sites:
-        if site in dna_sequence:
-            return False
-    return True
+        restriction_sites = DEFAULT_RESTRICTION_SITES
+    sites = _site_patterns(restriction_sites)
+    patterns = [pattern for expanded in sites.values() for pattern in expanded]
+    hits = compile_patterns(patterns).scan(dna_sequence)["hits"] if patterns else {}
+    return not any(_contains_site(dna_sequence, site, expanded, hits) for site, expanded in sites.items())
+
+
+def find_restriction_enzymes(dna_sequence: str, enzymes=None) -> dict:
+    """
+    Cherche, sur les deux brins, les sites des enzymes de la bibliothèque (codes IUPAC).
+    enzymes : liste de noms ou dictionnaire nom -> site ; par défaut toute la bibliothèque.
+    Retourne un dictionnaire nom -> positions de début, pour les enzymes présentes uniquement.
+    """
+    return get_restriction_scanner(enzymes).scan(dna_sequence)
+
+
+def validate_restriction_enzymes(dna_sequence: str, enzymes=None) -> bool:
+    """Vérifie qu'aucun site des enzymes données (par défaut toute la bibliothèque) n'est présent."""
+    return not find_restriction_enzymes(dna_sequence, enzymes)
 
 
 def validate_gc_ratio(dna_sequence: str, lower_bound: float = 0.40, upper_bound: float = 0.60) -> bool:
@@ -24,6 +59,22 @@ def validate_gc_ratio(dna_sequence: str, lower_bound: float = 0.40, upper_bound:
     gc_ratio = gc_count / len(dna_sequence)
     return lower_bound <= gc_ratio <= upper_bound
 
+def validate_gc_windows(dna_sequence: str, window: int = GC_WINDOW,
+                        lower_bound: float = 0.40, upper_bound: float = 0.60) -> bool:
+    """
+    Vérifie que le ratio GC de chaque fenêtre glissante de `window` bases est compris entre
+    lower_bound et upper_bound. Une séquence plus courte que la fenêtre est jugée sur son ratio global.
+    """
+    if len(dna_sequence) < window:
+        return validate_gc_ratio(dna_sequence, lower_bound, upper_bound)
+    return not gc_window_violations(dna_sequence, window, lower_bound, upper_bound).any()
+
+
+def validate_homopolymers(dna_sequence: str, max_run: int = MAX_HOMOPOLYMER) -> bool:
+    """Vérifie qu'aucune base n'est répétée plus de max_run fois consécutivement."""
+    _, lengths, bases = homopolymer_runs(dna_sequence)
+    return not ((lengths > max_run) & (bases != INVALID)).any()
+
 def validate_promoter(dna_sequence: str) -> bool:
     """Vérifie que le promoteur est présent dans la séquence ADN."""
     return PROMOTER in dna_sequence
@@ -77,18 +128,38 @@ def validate_mandatory_nodes(G: nx.Graph) -> bool:
     """Vérifie que tous les nœuds obligatoires sont présents dans le graphe."""
     return all(node in G.nodes for node in MANDATORY_NODES)
 
-def validate_gene_expression_constraints(dna_sequence, G) -> dict:
+def validate_gene_expression_constraints(dna_sequence, G, restriction_sites=None,
+                                         gc_window=None, max_homopolymer=None, enzymes=None) -> dict:
     """
     Valide l'ensemble des contraintes pour l'expression génique.
-    Renvoie un dictionnaire avec le statut et les messages d'erreur.
+    Promoteur, terminaison, sites de restriction et ratio GC sont lus sur un seul scan
+    de la séquence (dna_graph.contraintes.scanner).
+    Contraintes locales optionnelles : ratio GC par fenêtre de gc_window bases
+    et répétitions de plus de max_homopolymer bases (dna_graph.contraintes.profile),
+    sites des enzymes données par leur nom (dna_graph.contraintes.restriction, deux brins).
+    Renvoie un dictionnaire avec le statut, les messages d'erreur et un rapport
+    (positions de chaque motif, composition en bases, ratio GC).
     """
+    if restriction_sites is None:
+        restriction_sites = DEFAULT_RESTRICTION_SITES
+    sites = _site_patterns(restriction_sites)
+    patterns = [pattern for expanded in sites.values() for pattern in expanded]
+    report = compile_patterns([PROMOTER, TERMINATION_SIGNAL, *patterns]).scan(dna_sequence)
+    hits, length = report["hits"], report["length"]
+    promoter_hits, termination_hits = hits[PROMOTER], hits[TERMINATION_SIGNAL]
     errors = {}
-    
-    if not validate_promoter(dna_sequence):
+
+    if not len(promoter_hits):
         errors["promoteur"] = "Le promoteur n'est pas present dans la sequence ADN."
-    if not validate_termination_signal(dna_sequence):
+    if not len(termination_hits):
         errors["termination"] = "Le signal de terminaison n'est pas present dans la sequence ADN."
-    if not validate_length_for_codons(dna_sequence):
+    # Même calcul que validate_length_for_codons, à partir des positions trouvées
+    coding_length = length
+    if len(promoter_hits) and promoter_hits[0] == 0:
+        coding_length -= len(PROMOTER)
+    if len(termination_hits) and termination_hits[-1] == length - len(TERMINATION_SIGNAL):
+        coding_length -= len(TERMINATION_SIGNAL)
+    if max(coding_length, 0) % 3 != 0:
         errors["longueur"] = "La sequence entre le promoteur et le signal de terminaison n'est pas un multiple de 3."
     if not validate_mandatory_nodes(G):
         errors["noeuds"] = "Tous les noeuds obligatoires ne sont pas presents dans le graphe."
@@ -96,14 +167,29 @@ def validate_gene_expression_constraints(dna_sequence, G) -> dict:
     errors.update(validate_classification_nodes(G))
     errors.update(validate_complementarity_edges(G))
 
-        # Nouvelle contrainte : éviter les sites de restriction enzymatique
-    if not validate_restriction_sites(dna_sequence):
+    # Éviter les sites de restriction enzymatique
+    if any(_contains_site(dna_sequence, site, expanded, hits) for site, expanded in sites.items()):
         errors["restriction_site"] = "La séquence ADN contient des sites de restriction enzymatique indésirables."
-    
-    # Nouvelle contrainte : vérifier le ratio GC (40-60%)
-    if not validate_gc_ratio(dna_sequence):
-        errors["gc_ratio"] = "La séquence ADN ne respecte pas le ratio GC requis (40-60%)."
 
-    
-    return {"is_valid": len(errors) == 0, "errors": errors}
+    # Vérifier le ratio GC (40-60%)
+    if not length or not 0.40 <= report["gc_ratio"] <= 0.60:
+        errors["gc_ratio"] = "La séquence ADN ne respecte pas le ratio GC requis (40-60%)."
+    if gc_window is not None and not validate_gc_windows(dna_sequence, gc_window):
+        errors["gc_window"] = f"Une fenêtre de {gc_window} bases ne respecte pas le ratio GC requis (40-60%)."
+    if max_homopolymer is not None and not validate_homopolymers(dna_sequence, max_homopolymer):
+        errors["homopolymere"] = f"La séquence ADN contient une base répétée plus de {max_homopolymer} fois."
+    enzyme_hits = find_restriction_enzymes(dna_sequence, enzymes) if enzymes is not None else {}
+    if enzyme_hits:
+        errors["restriction_enzymes"] = ("La séquence ADN contient des sites de restriction : "
+                                         + ", ".join(sorted(enzyme_hits)) + ".")
 
+    return {
+        "is_valid": len(errors) == 0,
+        "errors": errors,
+        "report": {
+            "positions": {pattern: positions.tolist() for pattern, positions in hits.items()},
+            "composition": report["composition"],
+            "gc_ratio": report["gc_ratio"],
+            "enzymes": {name: positions.tolist() for name, positions in enzyme_hits.items()},
+        },
+    }
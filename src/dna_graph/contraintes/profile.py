@@ -0,0 +1,110 @@
+"""
+Profil local d'une séquence ADN : ratio GC par fenêtre glissante et répétitions d'une même base.
+
+Tout est vectorisé sur le tableau uint8 de codes de dna_graph.contraintes.scanner (A=0, C=1, G=2, T=3) :
+  - GC par fenêtre : somme cumulée des indicatrices G/C, puis différence entre les bornes de
+    chaque fenêtre ; une seule somme cumulée sert pour toutes les tailles de fenêtre ;
+  - homopolymères : codage par plages (run-length) à partir des positions où la base change ;
+  - masques de violation : une entrée par fenêtre (GC hors bornes, ou fenêtre contenant une
+    répétition trop longue).
+Le coût est O(n) par taille de fenêtre, sans boucle Python sur la séquence.
+"""
+import numpy as np
+
+from dna_graph.contraintes.scanner import BASES, INVALID, encode_sequence
+
+
+def _gc_cumsum(codes):
+    """Somme cumulée (avec 0 initial) des positions G ou C."""
+    return np.concatenate([[0], np.cumsum((codes == 1) | (codes == 2), dtype=np.int64)])
+
+
+def _window_sums(cumsum, window):
+    if window <= 0:
+        raise ValueError(f"Taille de fenêtre invalide : {window}")
+    if len(cumsum) - 1 < window:
+        return np.zeros(0, dtype=np.int64)
+    return cumsum[window:] - cumsum[:-window]
+
+
+def gc_profile(dna_sequence, window):
+    """
+    Ratio GC de chaque fenêtre de `window` bases.
+
+    Retourne :
+      - profile (ndarray) : ratio GC de la fenêtre commençant en chaque position
+        (n - window + 1 valeurs, vide si la séquence est plus courte que la fenêtre).
+    """
+    return _window_sums(_gc_cumsum(encode_sequence(dna_sequence)), window) / window
+
+
+def gc_profiles(dna_sequence, windows):
+    """Ratios GC pour plusieurs tailles de fenêtre (une seule somme cumulée) : taille -> profil."""
+    cumsum = _gc_cumsum(encode_sequence(dna_sequence))
+    return {window: _window_sums(cumsum, window) / window for window in windows}
+
+
+def homopolymer_runs(dna_sequence):
+    """
+    Codage par plages de la séquence.
+
+    Retourne :
+      - starts (ndarray) : position de début de chaque plage.
+      - lengths (ndarray) : longueur de chaque plage.
+      - bases (ndarray uint8) : code de la base répétée (255 pour un caractère hors ACGT).
+    """
+    codes = encode_sequence(dna_sequence)
+    if not len(codes):
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty, np.zeros(0, dtype=np.uint8)
+    starts = np.concatenate([[0], np.flatnonzero(codes[1:] != codes[:-1]) + 1])
+    lengths = np.diff(np.append(starts, len(codes)))
+    return starts, lengths, codes[starts]
+
+
+def max_homopolymers(dna_sequence):
+    """Longueur de la plus longue répétition de chaque base : {'A': ..., 'C': ..., 'G': ..., 'T': ...}."""
+    _, lengths, bases = homopolymer_runs(dna_sequence)
+    maxima = np.zeros(len(BASES) + 1, dtype=np.intp)
+    np.maximum.at(maxima, np.minimum(bases, len(BASES)), lengths)
+    return {base: int(maxima[i]) for i, base in enumerate(BASES)}
+
+
+def homopolymer_mask(dna_sequence, max_run):
+    """Masque par position des bases appartenant à une répétition (ACGT) de plus de max_run bases."""
+    _, lengths, bases = homopolymer_runs(dna_sequence)
+    return np.repeat((lengths > max_run) & (bases != INVALID), lengths)
+
+
+def gc_window_violations(dna_sequence, window, lower_bound=0.40, upper_bound=0.60):
+    """Masque par fenêtre : True si le ratio GC de la fenêtre sort de [lower_bound, upper_bound]."""
+    profile = gc_profile(dna_sequence, window)
+    return (profile < lower_bound) | (profile > upper_bound)
+
+
+def homopolymer_window_violations(dna_sequence, window, max_run):
+    """Masque par fenêtre : True si la fenêtre contient une base d'une répétition de plus de max_run bases."""
+    mask = homopolymer_mask(dna_sequence, max_run)
+    return _window_sums(np.concatenate([[0], np.cumsum(mask, dtype=np.int64)]), window) > 0
+
+
+def sequence_profile(dna_sequence, window, lower_bound=0.40, upper_bound=0.60, max_run=6):
+    """
+    Profil complet d'une séquence pour une taille de fenêtre.
+
+    Retourne :
+      - profile (dict) : 'gc' (ratio par fenêtre), 'gc_min', 'gc_max', 'max_homopolymer'
+        (par base), 'gc_violations' et 'homopolymer_violations' (masques par fenêtre).
+    """
+    codes = encode_sequence(dna_sequence)
+    gc = gc_profile(codes, window)
+    return {
+        "length": len(codes),
+        "window": window,
+        "gc": gc,
+        "gc_min": float(gc.min()) if len(gc) else None,
+        "gc_max": float(gc.max()) if len(gc) else None,
+        "max_homopolymer": max_homopolymers(codes),
+        "gc_violations": (gc < lower_bound) | (gc > upper_bound),
+        "homopolymer_violations": homopolymer_window_violations(codes, window, max_run),
+    }
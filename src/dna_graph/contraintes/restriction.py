@@ -0,0 +1,188 @@
+"""
+Bibliothèque d'enzymes de restriction et recherche de leurs sites (codes IUPAC) sur les deux brins.
+
+Les sites sont lus dans data/restriction_enzymes.tsv (nom, site). Chaque site et son complément
+inverse (s'il diffère : site non palindromique) occupent un bit d'un mot de 64 bits ; la table
+T[d][base] contient, pour chaque décalage d, le masque des motifs dont la position d accepte
+la base (ou qui sont plus courts que d : position libre). Le masque des motifs présents à la
+position i vaut alors ET_d T[d][séquence[i + d]] : un motif présent ne perd jamais son bit.
+
+Le calcul est vectorisé sur les positions (NumPy) et bit-parallèle sur les motifs : une passe sur
+la séquence par tranche de 64 motifs et par décalage. Après les premiers décalages, seules
+les positions dont le masque n'est pas nul sont conservées, ce qui rend les décalages suivants
+presque gratuits.
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from dna_graph.contraintes.scanner import INVALID, SCAN_CHUNK, encode_sequence
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "restriction_enzymes.tsv")
+
+# Code IUPAC -> bases acceptées
+IUPAC = {
+    "A": "A", "C": "C", "G": "G", "T": "T",
+    "R": "AG", "Y": "CT", "S": "CG", "W": "AT", "K": "GT", "M": "AC",
+    "B": "CGT", "D": "AGT", "H": "ACT", "V": "ACG", "N": "ACGT",
+}
+_COMPLEMENT = str.maketrans("ACGTRYSWKMBDHVN", "TGCAYRSWMKVHDBN")
+
+# Code des caractères hors ACGT (et de la fin de séquence) : accepté seulement au-delà de la fin d'un motif
+_OTHER = 4
+# Nombre de décalages calculés sur toutes les positions avant de ne garder que les candidates
+_DENSE_STEPS = 4
+
+
+def reverse_complement(site):
+    """Complément inverse d'un site (codes IUPAC compris)."""
+    return site.translate(_COMPLEMENT)[::-1]
+
+
+def expand_iupac(site):
+    """Liste des séquences ACGT représentées par un site IUPAC (4^k pour k positions 'N')."""
+    sequences = [""]
+    for code in site:
+        sequences = [prefix + base for prefix in sequences for base in IUPAC[code]]
+    return sequences
+
+
+def load_enzymes(path=DATA_FILE):
+    """
+    Charge la bibliothèque d'enzymes.
+
+    Retourne :
+      - enzymes (dict) : nom -> site de reconnaissance, dans l'ordre du fichier.
+    """
+    enzymes = {}
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, site = line.split("\t")[:2]
+            site = site.strip().upper()
+            if not site or set(site) - set(IUPAC):
+                raise ValueError(f"{path}:{line_number} : site invalide pour {name} : {site!r}")
+            enzymes[name.strip()] = site
+    return enzymes
+
+
+class RestrictionScanner:
+    """
+    Matcher bit-parallèle d'un ensemble d'enzymes (voir le docstring du module).
+
+    Paramètres :
+      - enzymes (dict) : nom -> site IUPAC.
+    """
+
+    def __init__(self, enzymes):
+        self.enzymes = dict(enzymes)
+        # Motifs : (nom, site orienté, brin) ; le complément inverse d'un palindrome est omis
+        self.motifs = []
+        for name, site in self.enzymes.items():
+            self.motifs.append((name, site, "+"))
+            if reverse_complement(site) != site:
+                self.motifs.append((name, reverse_complement(site), "-"))
+        self.max_length = max((len(site) for _, site, _ in self.motifs), default=0)
+
+        n_words = -(-len(self.motifs) // 64)
+        # tables[d, code, mot] : motifs acceptant la base `code` au décalage d
+        self.tables = np.zeros((self.max_length, _OTHER + 1, n_words), dtype=np.uint64)
+        for lane, (_, site, _) in enumerate(self.motifs):
+            word, bit = divmod(lane, 64)
+            bit = np.uint64(1) << np.uint64(bit)
+            for d in range(self.max_length):
+                accepted = "ACGT" if d >= len(site) else IUPAC[site[d]]
+                for code, base in enumerate("ACGT"):
+                    if base in accepted:
+                        self.tables[d, code, word] |= bit
+                # Au-delà du motif, même un caractère hors ACGT (ou la fin de séquence) est accepté
+                if d >= len(site):
+                    self.tables[d, _OTHER, word] |= bit
+
+    def _match_block(self, codes, count):
+        """Occurrences commençant dans les `count` premières positions de codes : liste de (motif, positions)."""
+        matches = []
+        for word in range(self.tables.shape[2]):
+            table = self.tables[:, :, word]
+            candidates = np.arange(count)
+            mask = table[0, codes[:count]]
+            for d in range(1, self.max_length):
+                if d == _DENSE_STEPS:
+                    # Les masques sont désormais presque tous nuls : on ne garde que les candidates
+                    keep = np.flatnonzero(mask)
+                    candidates, mask = candidates[keep], mask[keep]
+                mask &= table[d, codes[candidates + d]]
+            keep = np.flatnonzero(mask)
+            candidates, mask = candidates[keep], mask[keep]
+            for bit in range(min(64, len(self.motifs) - 64 * word)):
+                hit = (mask >> np.uint64(bit)) & np.uint64(1) == 1
+                if hit.any():
+                    matches.append((word * 64 + bit, candidates[hit]))
+        return matches
+
+    def find_all(self, dna_sequence):
+        """
+        Positions (brin direct) de début des sites de chaque enzyme, sur les deux brins.
+
+        Retourne :
+          - hits (dict) : nom -> {'+': positions brin direct, '-': positions du complément inverse}
+            (pour un site palindromique, '-' reprend les positions de '+').
+        """
+        codes = encode_sequence(dna_sequence)
+        codes = np.where(codes == INVALID, _OTHER, codes).astype(np.intp)
+        found = {lane: [] for lane in range(len(self.motifs))}
+        if self.motifs:
+            for start in range(0, len(codes), SCAN_CHUNK):
+                block = codes[start:start + SCAN_CHUNK + self.max_length - 1]
+                count = min(SCAN_CHUNK, len(block))
+                # Complète par des caractères hors ACGT : seuls les motifs déjà terminés y survivent
+                padding = np.full(count + self.max_length - 1 - len(block), _OTHER, dtype=np.intp)
+                for lane, positions in self._match_block(np.concatenate([block, padding]), count):
+                    found[lane].append(positions + start)
+
+        empty = np.zeros(0, dtype=np.intp)
+        hits = {name: {"+": empty, "-": empty} for name in self.enzymes}
+        for lane, (name, site, strand) in enumerate(self.motifs):
+            positions = np.concatenate(found[lane]) if found[lane] else empty
+            hits[name][strand] = positions
+            if strand == "+" and reverse_complement(site) == site:
+                hits[name]["-"] = positions
+        return hits
+
+    def scan(self, dna_sequence):
+        """Enzymes ayant au moins un site : nom -> positions de début (deux brins confondus, triées)."""
+        hits = self.find_all(dna_sequence)
+        return {name: np.union1d(strands["+"], strands["-"])
+                for name, strands in hits.items() if len(strands["+"]) or len(strands["-"])}
+
+
+@lru_cache(maxsize=16)
+def _compile(enzymes):
+    return RestrictionScanner(dict(enzymes))
+
+
+def get_restriction_scanner(enzymes=None):
+    """
+    Matcher compilé une seule fois par ensemble d'enzymes.
+
+    Paramètres :
+      - enzymes (dict | list, optionnel) : nom -> site, ou liste de noms de la bibliothèque ;
+        par défaut toute la bibliothèque.
+    """
+    library = _library()
+    if enzymes is None:
+        enzymes = library
+    elif not isinstance(enzymes, dict):
+        unknown = [name for name in enzymes if name not in library]
+        if unknown:
+            raise KeyError(f"Enzyme(s) inconnue(s) : {unknown}")
+        enzymes = {name: library[name] for name in enzymes}
+    return _compile(tuple(enzymes.items()))
+
+
+@lru_cache(maxsize=1)
+def _library():
+    return load_enzymes()
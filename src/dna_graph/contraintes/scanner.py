@@ -0,0 +1,180 @@
+"""
+Recherche de motifs ADN en une passe : positions de toutes les occurrences et composition en bases.
+
+La séquence est convertie une seule fois en codes uint8 (A=0, C=1, G=2, T=3, autre=255) ;
+la composition se lit sur ces codes (np.bincount). Un PatternScanner est compilé une fois par
+ensemble de motifs (compile_patterns, mis en cache) : les motifs sont regroupés par longueur L,
+et chaque groupe est un tableau trié des codes en base 4 de ses motifs. Le scan calcule, pour
+chaque position, le code des bases qui suivent (vectorisé, une fois pour la longueur maximale ;
+les longueurs plus courtes s'en déduisent par décalage), puis cherche ces codes dans le tableau
+trié de chaque groupe (np.searchsorted).
+
+Le coût est donc linéaire en la longueur de la séquence et ne dépend que faiblement du nombre de
+longueurs distinctes, pas du nombre de motifs : ajouter des motifs de même longueur ne coûte presque rien.
+Les occurrences qui se chevauchent sont toutes rapportées.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+BASES = "ACGT"
+# Code des caractères hors ACGT : une fenêtre qui en contient ne correspond à aucun motif
+INVALID = 255
+# Longueur maximale codée exactement sur un int64 (4^31 < 2^63) ; au-delà, les candidats sont vérifiés
+MAX_CODE_LENGTH = 31
+# Nombre de positions traitées par bloc : borne la mémoire des tableaux de fenêtres
+SCAN_CHUNK = 1 << 18
+
+_CODE_TABLE = np.full(256, INVALID, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _CODE_TABLE[ord(_base)] = _code
+
+
+def encode_sequence(dna_sequence):
+    """Convertit une séquence en tableau uint8 de codes (A=0, C=1, G=2, T=3, autre=255)."""
+    if isinstance(dna_sequence, np.ndarray):
+        return dna_sequence
+    raw = np.frombuffer(dna_sequence.encode("ascii", "replace"), dtype=np.uint8)
+    return _CODE_TABLE[raw]
+
+
+def base_composition(codes):
+    """Nombre de A, C, G, T (et d'autres caractères) dans un tableau de codes."""
+    counts = np.bincount(codes, minlength=256)
+    composition = {base: int(counts[i]) for i, base in enumerate(BASES)}
+    composition["other"] = int(len(codes) - counts[:4].sum())
+    return composition
+
+
+def window_codes(codes, length):
+    """
+    Code en base 4 des `length` bases (au plus MAX_CODE_LENGTH) qui commencent en chaque position.
+    Les fenêtres qui dépassent la fin de la séquence sont complétées par des A (code 0) :
+    le tableau a une entrée par position et le préfixe de longueur l < length s'obtient par
+    décalage (window >> 2 * (length - l)).
+
+    Retourne :
+      - window (ndarray uint32, ou int64 au-delà de 16 bases) : code de chaque fenêtre.
+    """
+    width = min(length, MAX_CODE_LENGTH)
+    dtype = np.uint32 if width <= 16 else np.int64
+    values = np.concatenate([np.where(codes == INVALID, 0, codes), np.zeros(width - 1, dtype=np.uint8)])
+    values = values.astype(dtype)
+    count = len(codes)
+    window = np.zeros(count, dtype=dtype)
+    for j in range(width):
+        window <<= 2
+        window |= values[j:j + count]
+    return window
+
+
+def _valid_windows(codes, length):
+    """Masque des fenêtres de `length` bases entièrement incluses dans codes et sans caractère hors ACGT."""
+    count = max(len(codes) - length + 1, 0)
+    invalid = codes == INVALID
+    if not invalid.any():
+        return np.ones(count, dtype=bool)
+    seen = np.concatenate([[0], np.cumsum(invalid)])
+    return seen[length:] == seen[:count]
+
+
+def _pattern_code(pattern):
+    code = 0
+    for base in pattern[:MAX_CODE_LENGTH]:
+        code = code * 4 + BASES.index(base)
+    return code
+
+
+class PatternScanner:
+    """
+    Ensemble de motifs compilé (voir le docstring du module).
+
+    Paramètres :
+      - patterns (iterable) : Motifs sur l'alphabet ACGT (les doublons sont ignorés).
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(dict.fromkeys(patterns))
+        for pattern in self.patterns:
+            if not pattern or set(pattern) - set(BASES):
+                raise ValueError(f"Motif invalide (ACGT uniquement) : {pattern!r}")
+        # Longueur -> (codes triés, indices des motifs correspondants)
+        self._groups = {}
+        by_length = {}
+        for index, pattern in enumerate(self.patterns):
+            by_length.setdefault(len(pattern), []).append(index)
+        for length, indices in by_length.items():
+            pattern_codes = np.array([_pattern_code(self.patterns[i]) for i in indices], dtype=np.int64)
+            order = np.argsort(pattern_codes, kind="stable")
+            self._groups[length] = (pattern_codes[order], np.array(indices, dtype=np.intp)[order])
+
+    def find_all(self, codes):
+        """
+        Positions de début de toutes les occurrences de chaque motif dans un tableau de codes.
+
+        Retourne :
+          - hits (dict) : motif -> ndarray des positions (croissantes), vide si absent.
+        """
+        found = {index: [] for index in range(len(self.patterns))}
+        max_length = max(self._groups, default=0)
+        width = min(max_length, MAX_CODE_LENGTH)
+        for start in range(0, len(codes), SCAN_CHUNK):
+            # Le bloc déborde de max_length - 1 bases pour ne manquer aucune fenêtre à cheval
+            block = codes[start:start + SCAN_CHUNK + max_length - 1]
+            # Un seul calcul de fenêtres (la plus longue), les autres longueurs par décalage
+            full = window_codes(block, max_length)
+            for length, (pattern_codes, indices) in self._groups.items():
+                valid = _valid_windows(block, length)[:SCAN_CHUNK]
+                window = full[:len(valid)] >> (2 * (width - min(length, MAX_CODE_LENGTH)))
+                pattern_codes = pattern_codes.astype(window.dtype)
+                if len(pattern_codes) == 1:
+                    positions = np.flatnonzero(valid & (window == pattern_codes[0]))
+                    matched = np.full(len(positions), indices[0])
+                else:
+                    slot = np.minimum(np.searchsorted(pattern_codes, window), len(pattern_codes) - 1)
+                    positions = np.flatnonzero(valid & (pattern_codes[slot] == window))
+                    matched = indices[slot[positions]]
+                for index in np.unique(matched):
+                    found[index].append(positions[matched == index] + start)
+
+        hits = {}
+        for index, pattern in enumerate(self.patterns):
+            positions = np.concatenate(found[index]) if found[index] else np.zeros(0, dtype=np.intp)
+            if len(pattern) > MAX_CODE_LENGTH:
+                # Le code ne couvre que le début du motif : vérification de la fin
+                tail = encode_sequence(pattern[MAX_CODE_LENGTH:])
+                positions = np.array([p for p in positions
+                                      if np.array_equal(codes[p + MAX_CODE_LENGTH:p + len(pattern)], tail)],
+                                     dtype=np.intp)
+            hits[pattern] = positions
+        return hits
+
+    def scan(self, dna_sequence):
+        """
+        Analyse une séquence en une passe : occurrences des motifs et composition en bases.
+
+        Retourne :
+          - report (dict) : 'length', 'composition' (A, C, G, T, other), 'gc_ratio'
+            et 'hits' (motif -> ndarray des positions de début).
+        """
+        codes = encode_sequence(dna_sequence)
+        composition = base_composition(codes)
+        length = len(codes)
+        gc_ratio = (composition["G"] + composition["C"]) / length if length else 0.0
+        return {"length": length, "composition": composition, "gc_ratio": gc_ratio,
+                "hits": self.find_all(codes)}
+
+
+@lru_cache(maxsize=64)
+def _compile(patterns):
+    return PatternScanner(patterns)
+
+
+def compile_patterns(patterns):
+    """Retourne le PatternScanner d'un ensemble de motifs, compilé une seule fois par ensemble."""
+    return _compile(tuple(patterns))
+
+
+def scan_sequence(dna_sequence, patterns):
+    """Raccourci : compile_patterns(patterns).scan(dna_sequence)."""
+    return compile_patterns(patterns).scan(dna_sequence)
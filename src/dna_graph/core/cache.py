@@ -0,0 +1,182 @@
+"""
+Cache des résultats de Monte Carlo (tests gaussiens), adressé par le contenu.
+
+La clé est un hash SHA-256 des paramètres qui déterminent entièrement le tirage
+(mot, valeurs par défaut, écarts-types, nombre de tests, seed, méthode de score...).
+Deux niveaux :
+  - mémoire : LRU de CACHE_SIZE entrées (OrderedDict) ;
+  - disque (optionnel, CACHE_DIR) : un fichier pickle par clé, les plus anciens (dernier accès)
+    étant supprimés dès que le total dépasse CACHE_DISK_LIMIT octets.
+
+Le niveau disque n'est actif que pour un dossier explicitement configuré. Relire un pickle
+exécute du code : le dossier est créé en accès privé (0700) et, sur les systèmes POSIX, il est
+ignoré s'il appartient à un autre utilisateur ou s'il est modifiable par le groupe ou les autres ;
+un fichier d'un autre propriétaire n'est jamais relu.
+
+Les résultats non reproductibles (sans seed) ne doivent pas être mis en cache.
+"""
+import hashlib
+import logging
+import os
+import pickle
+from collections import OrderedDict
+
+from config.config import CACHE_SIZE, CACHE_DIR, CACHE_DISK_LIMIT
+
+# À incrémenter quand le moteur de tirage ou de score change : invalide les entrées sur disque
+CACHE_VERSION = 1
+
+_MISSING = object()
+
+
+def make_key(*parts):
+    """
+    Calcule la clé d'un résultat à partir de ses paramètres (types simples : str, int, float, tuple, None).
+    repr() est utilisé pour conserver la valeur exacte des flottants.
+    """
+    return hashlib.sha256(repr((CACHE_VERSION,) + parts).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache LRU en mémoire, doublé d'un niveau disque optionnel borné en taille.
+
+    Paramètres :
+      - max_entries (int) : nombre d'entrées conservées en mémoire (0 désactive ce niveau).
+      - cache_dir (str, optionnel) : dossier du niveau disque ; None pour le désactiver.
+      - max_bytes (int) : taille maximale du niveau disque.
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE, cache_dir=CACHE_DIR, max_bytes=CACHE_DISK_LIMIT):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        if cache_dir and not _private_dir(cache_dir):
+            logging.warning("Dossier de cache %s partage ou d'un autre utilisateur : niveau disque desactive",
+                            cache_dir)
+            self.cache_dir = None
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".pkl")
+
+    def get(self, key, default=None):
+        """Retourne la valeur associée à key (mémoire puis disque), ou default."""
+        value = self._memory.get(key, _MISSING)
+        if value is not _MISSING:
+            self._memory.move_to_end(key)
+        elif self.cache_dir:
+            value = self._load(key)
+            if value is not _MISSING:
+                self._remember(key, value)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Enregistre value dans les deux niveaux."""
+        self._remember(key, value)
+        if self.cache_dir:
+            self._store(key, value)
+
+    def clear(self):
+        """Vide les deux niveaux et remet les compteurs à zéro."""
+        self._memory.clear()
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.cache_dir, name))
+        self.hits = self.misses = 0
+
+    def stats(self):
+        """Compteurs du cache : succès, échecs et nombre d'entrées en mémoire."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._memory)}
+
+    def _remember(self, key, value):
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                if not _owned(os.fstat(f.fileno())):
+                    logging.warning("Entree de cache d'un autre utilisateur ignoree : %s", path)
+                    return _MISSING
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return _MISSING
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logging.warning("Entree de cache illisible %s : %s", path, e)
+            return _MISSING
+        # Met à jour la date d'accès utilisée pour l'éviction
+        os.utime(path)
+        return value
+
+    def _store(self, key, value):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning("Ecriture du cache impossible %s : %s", path, e)
+            return
+        self._evict()
+
+    def _evict(self):
+        """Supprime les fichiers les moins récemment utilisés tant que le total dépasse max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+def _owned(stat):
+    """Vrai si le fichier appartient à l'utilisateur courant (toujours vrai hors POSIX)."""
+    return not hasattr(os, "getuid") or stat.st_uid == os.getuid()
+
+
+def _private_dir(cache_dir):
+    """Crée cache_dir en accès privé ; faux s'il appartient à un autre utilisateur ou est modifiable par d'autres."""
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    stat = os.stat(cache_dir)
+    return _owned(stat) and not (hasattr(os, "getuid") and stat.st_mode & 0o022)
+
+
+# Cache partagé du processus (créé à la première utilisation)
+_default_cache = None
+
+
+def get_cache():
+    """Retourne le cache partagé du processus, configuré depuis config.config."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+def configure_cache(max_entries=CACHE_SIZE, cache_dir=CACHE_DIR, max_bytes=CACHE_DISK_LIMIT):
+    """Remplace le cache partagé du processus ; retourne le nouveau cache."""
+    global _default_cache
+    _default_cache = ResultCache(max_entries, cache_dir, max_bytes)
+    return _default_cache
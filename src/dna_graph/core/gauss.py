@@ -1,34 +1,91 @@
 import numpy as np
-import difflib
 from dna_graph.codec.encode_decode import convert_message_to_bases
-from sklearn.cluster import KMeans
-import dna_graph.bio.genetic_code as gen_code
-from dna_graph.codec.codon_graph import build_aa_to_codons
+import dna_graph.bio.codon_index as codon_index
+from dna_graph.core.scoring import score_variants
+from dna_graph.core.cache import get_cache, make_key
+from dna_graph.core.results import GaussianResults, as_results
+
+# Nombre de variantes tirées et notées à la fois par le chemin en flux (mémoire bornée par mot)
+SAMPLE_BATCH_SIZE = 4096
+# Écarts-types par défaut des perturbations (alpha, beta, gamma, mutation_rate)
+DEFAULT_SIGMAS = (0.1, 0.1, 0.1, 0.005)
+# Quantile de la loi normale pour un intervalle de confiance à 95 %
+Z_95 = 1.959963984540054
+# Demi-largeur visée des intervalles de confiance et taille des lots du mode adaptatif
+ADAPTIVE_TOLERANCE = 0.01
+ADAPTIVE_BATCH_SIZE = 64
 
 def gaussian_kernel_test_sentence(sentence, default_alpha, default_beta, default_gamma, default_mutation_rate,
                                   num_tests=10, sigma_alpha=0.1, sigma_beta=0.1, sigma_gamma=0.1, sigma_mutation=0.005,
-                                  random_seed=None):
+                                  random_seed=None, scorer="identity", workers=None, use_cache=True):
     """
     Découpe une phrase en mots et effectue le test pour chacun d'eux.
     Seed pour des résultats reproductibles pour les tests et la clustering.
-    Retourne un dictionnaire où chaque mot (sans ponctuation) est associé à sa liste de résultats.
+    Retourne un dictionnaire où chaque mot (sans ponctuation) est associé à ses résultats (GaussianResults).
+
+    Avec workers=None, les mots sont traités l'un après l'autre avec l'état global de np.random
+    (comportement historique). Avec workers >= 1, chaque mot reçoit son propre Generator, dérivé par
+    SeedSequence(random_seed).spawn selon sa position dans la phrase, et les mots sont répartis sur
+    un pool de `workers` processus : les résultats sont identiques quel que soit le nombre de workers.
+
+    Avec une seed et use_cache=True, le résultat est mis en cache (voir dna_graph.core.cache).
     """
+    defaults = (default_alpha, default_beta, default_gamma, default_mutation_rate)
+    sigmas = (sigma_alpha, sigma_beta, sigma_gamma, sigma_mutation)
+    if use_cache and random_seed is not None:
+        # Le mode parallèle ne dépend pas du nombre de workers : une seule entrée pour tous
+        mode = "sequential" if workers is None else "spawn"
+        key = make_key("sentence", mode, sentence, defaults, sigmas, num_tests, random_seed, scorer)
+        return _cached(key, lambda: gaussian_kernel_test_sentence(
+            sentence, *defaults, num_tests, *sigmas, random_seed=random_seed, scorer=scorer,
+            workers=workers, use_cache=False), restore_state=workers is None)
+
+    words = sentence.split()
+    if workers is not None:
+        return _gaussian_kernel_test_words(words, defaults, sigmas, num_tests, random_seed, scorer, workers)
+
     if random_seed is not None:
         np.random.seed(random_seed)
-    words = sentence.split()
     sentence_results = {}
     for word in words:
         # Pour chaque mot, on génère les tests sans réinitialiser le seed
         results = gaussian_kernel_test(word, default_alpha, default_beta, default_gamma,
                                     default_mutation_rate, num_tests,
                                     sigma_alpha, sigma_beta, sigma_gamma, sigma_mutation,
-                                    random_seed=None)
+                                    random_seed=None, scorer=scorer)
         sentence_results[word] = results
     return sentence_results
 
+def _word_task(task):
+    """
+    Tests gaussiens d'un mot avec son propre Generator (exécuté dans un worker).
+    Avec n_best, seuls les n_best meilleurs résultats sont conservés, en flux.
+    """
+    word, defaults, sigmas, num_tests, seed_seq, scorer, n_best, batch_size = task
+    rng = np.random.default_rng(seed_seq)
+    if n_best is None:
+        return gaussian_kernel_test(word, *defaults, num_tests, *sigmas, scorer=scorer, rng=rng)
+    return top_k_results(iter_gaussian_kernel_test(word, defaults, sigmas, num_tests, scorer, rng, batch_size), n_best)
+
+def _gaussian_kernel_test_words(words, defaults, sigmas, num_tests, random_seed, scorer, workers,
+                                n_best=None, batch_size=SAMPLE_BATCH_SIZE):
+    """Mode parallèle de gaussian_kernel_test_sentence : une graine dérivée par mot, dans l'ordre de la phrase."""
+    seeds = np.random.SeedSequence(random_seed).spawn(len(words))
+    tasks = [(word, defaults, sigmas, num_tests, seed, scorer, n_best, batch_size) for word, seed in zip(words, seeds)]
+    if workers <= 1 or len(tasks) <= 1:
+        all_results = [_word_task(task) for task in tasks]
+    else:
+        # Import différé : le pool n'est utile qu'en mode parallèle
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            all_results = list(pool.map(_word_task, tasks, chunksize=chunksize))
+    # Un mot répété garde les résultats de sa dernière occurrence, comme en mode séquentiel
+    return dict(zip(words, all_results))
+
 def gaussian_kernel_test(word, default_alpha, default_beta, default_gamma, default_mutation_rate,
                          num_tests=10, sigma_alpha=0.1, sigma_beta=0.1, sigma_gamma=0.1, sigma_mutation=0.005,
-                         random_seed=None):
+                         random_seed=None, scorer="identity", rng=None, use_cache=True):
     """
     Génère plusieurs variantes de la séquence correspondant à un mot en choisissant pour chaque codon
     une alternative parmi les options codoniques disponibles (selon le code génétique).
@@ -41,105 +98,304 @@ def gaussian_kernel_test(word, default_alpha, default_beta, default_gamma, defau
       - sigma_alpha, sigma_beta, sigma_gamma (float) : Écart-type des perturbations pour chaque paramètre.
       - sigma_mutation (float) : Écart-type de la perturbation pour le taux de mutation.
       - random_seed (int, optionnel) : Seed pour la reproductibilité.
+      - scorer (str) : Méthode de score de dna_graph.core.scoring ('identity', 'banded' ou 'difflib').
+      - rng (numpy.random.Generator, optionnel) : Source aléatoire dédiée ; sinon l'état global np.random.
+      - use_cache (bool) : Avec une seed (et sans rng), réutilise un résultat déjà calculé pour les mêmes paramètres.
       
     Retourne :
-      - results (list) : Liste de dictionnaires pour chaque test contenant :
+      - results (GaussianResults) : Résultats en colonnes (voir dna_graph.core.results) ; chaque ligne
+        se lit comme un dictionnaire contenant :
           * 'alpha', 'beta', 'gamma' : Paramètres utilisés.
           * 'mutation_rate' : Taux de mutation (calculé mais non appliqué).
           * 'sequence' : Séquence obtenue en choisissant aléatoirement parmi les codons alternatifs.
           * 'score' : Similarité (0 à 1) entre la séquence originale et la séquence générée.
     """
-    if random_seed is not None:
-        np.random.seed(random_seed)
-        
-    results = []
+    defaults = (default_alpha, default_beta, default_gamma, default_mutation_rate)
+    sigmas = (sigma_alpha, sigma_beta, sigma_gamma, sigma_mutation)
+    if use_cache and rng is None and random_seed is not None:
+        key = make_key("word", word, defaults, sigmas, num_tests, random_seed, scorer)
+        return _cached(key, lambda: gaussian_kernel_test(word, *defaults, num_tests, *sigmas, random_seed=random_seed,
+                                                         scorer=scorer, use_cache=False))
+
+    if rng is None:
+        if random_seed is not None:
+            np.random.seed(random_seed)
+        rng = np.random
+
+    # Un seul lot : même flux aléatoire qu'un tirage de num_tests variantes en une fois
+    batches = iter_gaussian_kernel_test(word, defaults, sigmas, num_tests, scorer, rng, batch_size=max(num_tests, 1))
+    return GaussianResults.concat(batches)
+
+def iter_gaussian_kernel_test(word, defaults, sigmas, num_tests, scorer="identity", rng=np.random,
+                              batch_size=SAMPLE_BATCH_SIZE):
+    """
+    Version en flux de gaussian_kernel_test : les variantes sont tirées et notées par lots de batch_size,
+    chaque lot étant produit sous forme de GaussianResults.
+    La mémoire utilisée ne dépend que de batch_size, pas de num_tests.
+
+    Paramètres :
+      - word (str) : Le mot à tester.
+      - defaults, sigmas (tuple) : Moyennes et écarts-types de (alpha, beta, gamma, mutation_rate).
+      - num_tests (int) : Nombre total de variantes.
+      - scorer (str) : Méthode de score de dna_graph.core.scoring.
+      - rng : Source aléatoire (np.random ou numpy.random.Generator).
+      - batch_size (int) : Nombre de variantes par lot.
+    """
     # Conversion du mot en liste de bases puis en chaîne
     base_list = convert_message_to_bases(word)
     original_sequence = ''.join(base_list)
-    
-    # Construction du mapping des acides aminés vers codons alternatifs (incluant les stop pour la fidélité)
-    aa_to_codons = build_aa_to_codons(gen_code.GENETIC_CODE, include_stop=True)
-    
-    # Découper la séquence originale en codons (groupes de 3 bases)
-    codons = [original_sequence[i:i+3] for i in range(0, len(original_sequence), 3)]
-    
-    for _ in range(num_tests):
-        # Perturber les paramètres par bruit gaussien
-        alpha = np.random.normal(default_alpha, sigma_alpha)
-        beta = np.random.normal(default_beta, sigma_beta)
-        gamma = np.random.normal(default_gamma, sigma_gamma)
-        # Bien que le taux de mutation soit calculé, il ne sera pas appliqué ici
-        mutation_rate = np.random.normal(default_mutation_rate, sigma_mutation)
-        mutation_rate = np.clip(mutation_rate, 0, 1)
-        
-        new_sequence = ""
-        # Pour chaque codon du mot, choisir aléatoirement une alternative parmi celles disponibles
-        for codon in codons:
-            if len(codon) < 3:
-                new_sequence += codon
-                continue
-            aa = gen_code.GENETIC_CODE.get(codon, None)
-            if aa is not None:
-                alternatives = aa_to_codons.get(aa, [codon])
-            else:
-                alternatives = [codon]
-            # Choisir aléatoirement parmi les alternatives (ceci peut donner un codon différent même si le mot est court)
-            chosen_codon = np.random.choice(alternatives)
-            new_sequence += chosen_codon
-        
-        # Calcul du score de similarité entre la séquence originale et la séquence générée
-        score = difflib.SequenceMatcher(None, original_sequence, new_sequence).ratio()
-        
-        results.append({
-            'alpha': alpha,
-            'beta': beta,
-            'gamma': gamma,
-            'mutation_rate': mutation_rate,
-            'sequence': new_sequence,
-            'score': score
+
+    for start in range(0, num_tests, batch_size):
+        params, sequences = sample_variants(original_sequence, min(batch_size, num_tests - start),
+                                            defaults, sigmas, rng)
+        # Similarité entre la séquence originale et chaque séquence générée, en un seul appel par lot
+        scores = score_variants(original_sequence, sequences, scorer)
+        yield GaussianResults(params, sequences, scores)
+
+def _best_score_interval(scores, low=0.025, high=0.975, n=None):
+    """
+    Intervalle percentile bootstrap du meilleur score, calculé exactement (équivalent à une infinité
+    de rééchantillons) : le maximum de n tirages avec remise dans la distribution empirique F
+    a pour fonction de répartition F(x) ** n.
+
+    Avec n, scores ne contient que les plus grands des n scores tirés (voir _tail_size) : la
+    répartition est alors comptée depuis le haut, F(x) = 1 - (nombre de scores > x) / n.
+    """
+    if n is None:
+        n = len(scores)
+    values, counts = np.unique(scores, return_counts=True)
+    greater = len(scores) - np.cumsum(counts)
+    cdf_max = ((n - greater) / n) ** n
+    return (float(values[np.searchsorted(cdf_max, low)]),
+            float(values[min(np.searchsorted(cdf_max, high), len(values) - 1)]))
+
+def _tail_size(low=0.025):
+    """
+    Nombre de plus grands scores suffisant pour _best_score_interval : une valeur x n'est retenue que si
+    (1 - k / n) ** n >= low, k étant le nombre de scores > x ; or (1 - k / n) ** n <= exp(-k), d'où k <= -ln(low).
+    """
+    return int(np.ceil(-np.log(low))) + 1
+
+def _mean_interval_from(n, mean, m2):
+    """
+    Intervalle de confiance normal à 95 % du score moyen, Z_95 * écart-type / sqrt(n), à partir de n,
+    de la moyenne et de la somme des carrés des écarts m2.
+    """
+    half_width = Z_95 * (m2 / (n - 1)) ** 0.5 / n ** 0.5 if n > 1 else float("inf")
+    return mean - half_width, mean + half_width
+
+def adaptive_gaussian_kernel_test(word, default_alpha, default_beta, default_gamma, default_mutation_rate,
+                                  tolerance=ADAPTIVE_TOLERANCE, max_tests=10000, batch_size=ADAPTIVE_BATCH_SIZE,
+                                  sigma_alpha=0.1, sigma_beta=0.1, sigma_gamma=0.1, sigma_mutation=0.005,
+                                  random_seed=None, scorer="identity", rng=None):
+    """
+    Tests gaussiens à arrêt adaptatif : les variantes sont tirées par lots de batch_size jusqu'à ce que
+    les intervalles de confiance à 95 % du score moyen et du meilleur score aient une demi-largeur
+    inférieure à tolerance, ou que max_tests variantes aient été tirées.
+
+      - score moyen : intervalle normal, Z_95 * écart-type / sqrt(n) ;
+      - meilleur score : intervalle percentile bootstrap (2,5 % - 97,5 %) du maximum, calculé
+        exactement à partir de la distribution empirique (voir _best_score_interval).
+
+    Paramètres :
+      - word, default_*, sigma_*, random_seed, scorer, rng : comme gaussian_kernel_test.
+      - tolerance (float) : Demi-largeur maximale des deux intervalles de confiance.
+      - max_tests (int) : Budget maximal de variantes.
+      - batch_size (int) : Nombre de variantes tirées entre deux tests d'arrêt.
+
+    Retourne :
+      - results (GaussianResults) : Toutes les variantes tirées.
+      - summary (dict) : 'samples_used', 'converged', 'mean', 'mean_ci', 'best', 'best_ci'
+        (intervalles sous forme de tuples (bas, haut)).
+    """
+    if rng is None:
+        if random_seed is not None:
+            np.random.seed(random_seed)
+        rng = np.random
+    defaults = (default_alpha, default_beta, default_gamma, default_mutation_rate)
+    sigmas = (sigma_alpha, sigma_beta, sigma_gamma, sigma_mutation)
+
+    # État courant en O(1) par variante : moyenne et somme des carrés des écarts (fusion par lot,
+    # Chan et al.) et les plus grands scores, seuls utiles à l'intervalle du meilleur score
+    batches = []
+    n, mean, m2 = 0, 0.0, 0.0
+    tail = np.empty(0)
+    tail_size = _tail_size()
+    converged = False
+    for batch in iter_gaussian_kernel_test(word, defaults, sigmas, max_tests, scorer, rng, batch_size):
+        batches.append(batch)
+        size = len(batch)
+        batch_mean = float(batch.scores.mean())
+        batch_m2 = float(((batch.scores - batch_mean) ** 2).sum())
+        delta = batch_mean - mean
+        m2 += batch_m2 + delta ** 2 * n * size / (n + size)
+        mean += delta * size / (n + size)
+        n += size
+        tail = np.concatenate([tail, batch.scores])
+        if len(tail) > tail_size:
+            tail = np.partition(tail, -tail_size)[-tail_size:]
+        mean_low, mean_high = _mean_interval_from(n, mean, m2)
+        best_low, best_high = _best_score_interval(tail, n=n)
+        if (mean_high - mean_low) / 2 <= tolerance and (best_high - best_low) / 2 <= tolerance:
+            converged = True
+            break
+
+    results = GaussianResults.concat(batches)
+    summary = {"samples_used": n, "converged": converged}
+    if n:
+        summary.update({
+            "mean": mean,
+            "mean_ci": _mean_interval_from(n, mean, m2),
+            "best": float(tail.max()),
+            "best_ci": _best_score_interval(tail, n=n),
         })
-        
-    return results
+    return results, summary
+
+def top_k_results(batches, n_best):
+    """
+    Retourne les n_best résultats de meilleur score (ordre décroissant, ex aequo dans l'ordre d'arrivée)
+    à partir d'une suite de lots GaussianResults : seuls n_best résultats sont conservés entre deux lots,
+    ce qui équivaut à un tri complet suivi d'une coupe.
+    """
+    best = GaussianResults.empty()
+    for batch in batches:
+        # Tri stable : les meilleurs déjà retenus sont arrivés avant le lot courant
+        best = GaussianResults.concat([best, batch]).top_k(n_best)
+    return best
 
-def cluster_results(test_results, n_clusters=5):
+def _copy_results(results):
+    """Copie les résultats : l'appelant peut les modifier (ex. 'cluster') sans altérer le cache."""
+    if isinstance(results, dict):
+        return {word: _copy_results(word_results) for word, word_results in results.items()}
+    return results.copy()
+
+def _cached(key, compute, restore_state=True):
+    """
+    Retourne le résultat en cache pour key, ou le calcule et l'enregistre.
+    L'état de np.random après le calcul est conservé avec le résultat et restauré lors d'un succès,
+    afin que les tirages suivants de l'appelant soient les mêmes qu'avec un calcul réel.
+    """
+    cache = get_cache()
+    entry = cache.get(key)
+    if entry is None:
+        results = compute()
+        entry = (results, np.random.get_state() if restore_state else None)
+        cache.put(key, entry)
+    else:
+        results, state = entry
+        if state is not None:
+            np.random.set_state(state)
+    return _copy_results(results)
+
+def sample_variants(original_sequence, num_tests, defaults, sigmas, rng=np.random):
+    """
+    Moteur vectorisé des tests gaussiens : tire en une fois les paramètres et les variantes synonymes.
+
+    Paramètres :
+      - original_sequence (str) : Séquence de bases du mot.
+      - num_tests (int) : Nombre de variantes à générer.
+      - defaults (tuple) : Valeurs moyennes (alpha, beta, gamma, mutation_rate).
+      - sigmas (tuple) : Écarts-types correspondants.
+      - rng : Source aléatoire exposant normal() et random() (np.random ou numpy.random.Generator).
+
+    Retourne :
+      - params (ndarray) : Tableau (num_tests, 4) des paramètres perturbés, taux de mutation borné à [0, 1].
+      - sequences (ndarray) : Matrice uint8 (num_tests, longueur) des variantes en octets ASCII ; chaque codon
+        complet est remplacé par un synonyme (stops inclus) tiré uniformément, la fin incomplète (< 3 bases)
+        est conservée.
+    """
+    params = rng.normal(defaults, sigmas, size=(num_tests, 4))
+    params[:, 3] = np.clip(params[:, 3], 0, 1)
+
+    # Index des codons complets, puis indice de synonyme tiré pour chaque (test, codon)
+    codon_ids = codon_index.sequence_to_codon_ids(original_sequence)
+    counts = codon_index.SYNONYM_COUNT[codon_ids]
+    picks = (rng.random((num_tests, len(codon_ids))) * counts).astype(np.intp)
+    chosen = codon_index.SYNONYM_CODONS[codon_index.SYNONYM_START[codon_ids] + picks]
+
+    # Matrice d'octets (num_tests, longueur)
+    tail = original_sequence[len(codon_ids) * 3:]
+    length = len(codon_ids) * 3 + len(tail)
+    matrix = np.empty((num_tests, length), dtype=np.uint8)
+    matrix[:, :len(codon_ids) * 3] = codon_index.CODON_BYTES[chosen].reshape(num_tests, -1)
+    matrix[:, len(codon_ids) * 3:] = np.frombuffer(tail.encode("ascii"), dtype=np.uint8)
+    return params, matrix
+
+# Au-delà de ce nombre de tests, method="auto" passe à MiniBatchKMeans
+MINIBATCH_THRESHOLD = 10000
+
+def cluster_results(test_results, n_clusters=5, method="auto", batch_size=4096):
     """
     Regroupe les résultats en n_clusters et sélectionne, pour chaque cluster, le test avec le meilleur score.
     
     Paramètres :
-      - test_results (list) : Liste de dictionnaires issus de gaussian_kernel_test.
+      - test_results (GaussianResults | list) : Résultats de gaussian_kernel_test (ou liste de dictionnaires).
       - n_clusters (int) : Nombre de clusters souhaités.
+      - method (str) : 'kmeans' (KMeans complet), 'minibatch' (MiniBatchKMeans alimenté par blocs
+        de batch_size, mémoire bornée pour 10^5 à 10^6 tests) ou 'auto' (minibatch au-delà de
+        MINIBATCH_THRESHOLD tests).
+      - batch_size (int) : Taille des blocs en mode minibatch.
     
     Retourne :
-      - best_representatives (list) : Liste des meilleurs résultats (un par cluster).
+      - best_representatives (GaussianResults) : Meilleurs résultats (un par cluster), dans l'ordre
+        de première apparition des clusters. La colonne 'cluster' de test_results est renseignée.
     """
+    if method == "auto":
+        method = "minibatch" if len(test_results) > MINIBATCH_THRESHOLD else "kmeans"
+    if method not in ("kmeans", "minibatch"):
+        raise ValueError(f"Méthode de clustering inconnue : {method}")
+
     # Ajuster le nombre de clusters si le nombre de tests est inférieur
     n_clusters = min(n_clusters, len(test_results))
     
-    features = np.array([
-        [res['alpha'], res['beta'], res['gamma'], res['mutation_rate']]
-        for res in test_results
-    ])
-    
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42).fit(features)
-    labels = kmeans.labels_
+    results = as_results(test_results)
+    features, scores = results.params, results.scores
     
-    for i, res in enumerate(test_results):
-        res['cluster'] = labels[i]
-    
-    best_in_cluster = {}
-    for res in test_results:
-        cluster = res['cluster']
-        if cluster not in best_in_cluster or res['score'] > best_in_cluster[cluster]['score']:
-            best_in_cluster[cluster] = res
-            
-    best_representatives = list(best_in_cluster.values())
+    # Import différé : sklearn est coûteux au démarrage
+    if method == "kmeans":
+        from sklearn.cluster import KMeans
+        labels = KMeans(n_clusters=n_clusters, random_state=42).fit(features).labels_
+    else:
+        from sklearn.cluster import MiniBatchKMeans
+        model = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, batch_size=batch_size, n_init=3)
+        # Le premier bloc doit contenir au moins n_clusters points
+        first = max(batch_size, n_clusters)
+        model.partial_fit(features[:first])
+        for i in range(first, len(features), batch_size):
+            model.partial_fit(features[i:i + batch_size])
+        labels = np.concatenate([model.predict(features[i:i + batch_size])
+                                 for i in range(0, len(features), batch_size)])
+
+    results.cluster = labels
+    if results is not test_results:
+        # Liste de dictionnaires (ancien format) : étiquette ajoutée à chaque dictionnaire
+        for res, label in zip(test_results, labels):
+            res['cluster'] = label
+
+    # Argmax par groupe : tri par cluster puis score décroissant (tri stable, le premier ex aequo l'emporte)
+    order = np.lexsort((-scores, labels))
+    sorted_labels = labels[order]
+    is_first = np.ones(len(order), dtype=bool)
+    is_first[1:] = sorted_labels[1:] != sorted_labels[:-1]
+    best = dict(zip(sorted_labels[is_first].tolist(), order[is_first].tolist()))
+
+    # Clusters dans l'ordre de leur première apparition
+    cluster_ids, first_index = np.unique(labels, return_index=True)
+    ordered = cluster_ids[np.argsort(first_index)].tolist()
+    best_representatives = results.take([best[c] for c in ordered])
     return best_representatives
 
-def get_word_test_results(sentence, num_tests, n_best, alpha, beta, gamma, mutation_rate, seed):
+def get_word_test_results(sentence, num_tests, n_best, alpha, beta, gamma, mutation_rate, seed, workers=None,
+                          batch_size=SAMPLE_BATCH_SIZE, use_cache=True, sampler="monte_carlo",
+                          tolerance=ADAPTIVE_TOLERANCE):
     """
     Pour chaque mot de la phrase, effectue les tests gaussiens et retourne un dictionnaire
-    où chaque clé est un mot et la valeur est une liste (de longueur n_best) des meilleurs
-    résultats sous forme de dictionnaires (contenant 'sequence' et 'score').
+    où chaque clé est un mot et la valeur contient les n_best meilleurs résultats
+    (GaussianResults, lignes lisibles comme des dictionnaires avec 'sequence' et 'score').
+
+    Les variantes sont tirées en flux (lots de batch_size) et seules les n_best meilleures sont
+    conservées entre deux lots : la mémoire par mot ne dépend pas de num_tests. Tant que
+    num_tests <= batch_size, le résultat est identique au tri complet des tests de la phrase.
     
     Paramètres:
       - sentence (str) : La phrase à traiter.
@@ -148,20 +404,50 @@ def get_word_test_results(sentence, num_tests, n_best, alpha, beta, gamma, mutat
       - alpha, beta, gamma (float) : Paramètres de l'algorithme gaussien.
       - mutation_rate (float) : Taux de mutation par défaut.
       - seed (int) : Seed pour la reproductibilité.
+      - workers (int, optionnel) : Nombre de processus pour le mode parallèle par mot
+        (voir gaussian_kernel_test_sentence) ; None pour le mode séquentiel historique.
+      - batch_size (int) : Nombre de variantes tirées à la fois (en mode 'adaptive', entre deux tests
+        d'arrêt : ADAPTIVE_BATCH_SIZE convient mieux que la valeur par défaut).
+      - use_cache (bool) : Avec une seed, réutilise un résultat déjà calculé (voir dna_graph.core.cache).
+      - sampler (str) : 'monte_carlo' (tirage aléatoire de num_tests variantes) ou 'kbest' (énumération
+        exacte et déterministe des n_best meilleures variantes distinctes, voir dna_graph.core.kbest ;
+        num_tests, seed et workers sont alors ignorés) ou 'adaptive' (tirage arrêté dès que les
+        intervalles de confiance atteignent tolerance, num_tests servant de budget maximal ; voir
+        adaptive_gaussian_kernel_test ; workers et use_cache sont alors ignorés).
+      - tolerance (float) : Demi-largeur visée des intervalles de confiance du mode 'adaptive'.
     
     Retourne:
-      - filtered_results (dict) : Dictionnaire avec pour chaque mot une liste de dictionnaires.
+      - filtered_results (dict) : Dictionnaire {mot: GaussianResults}.
     """
-    # Utilise la fonction gaussienne déjà définie qui retourne un dictionnaire {mot: [résultats]}
-    sentence_results = gaussian_kernel_test_sentence(
-        sentence, alpha, beta, gamma, mutation_rate,
-        num_tests=num_tests, random_seed=seed
-    )
-    
-    # Pour chaque mot, on trie les résultats par score décroissant et on garde les n_best
+    defaults = (alpha, beta, gamma, mutation_rate)
+    if sampler == "kbest":
+        from dna_graph.core.kbest import k_best_results
+        return {word: k_best_results(word, n_best, defaults) for word in sentence.split()}
+    if sampler == "adaptive":
+        if seed is not None:
+            np.random.seed(seed)
+        return {word: adaptive_gaussian_kernel_test(word, *defaults, tolerance=tolerance, max_tests=num_tests,
+                                                    batch_size=batch_size)[0].top_k(n_best)
+                for word in sentence.split()}
+    if sampler != "monte_carlo":
+        raise ValueError(f"Échantillonneur inconnu : {sampler}")
+    if use_cache and seed is not None:
+        mode = "sequential" if workers is None else "spawn"
+        key = make_key("top_k", mode, sentence, defaults, DEFAULT_SIGMAS, num_tests, seed, n_best, batch_size)
+        return _cached(key, lambda: get_word_test_results(sentence, num_tests, n_best, alpha, beta, gamma,
+                                                          mutation_rate, seed, workers, batch_size, use_cache=False),
+                       restore_state=workers is None)
+
+    words = sentence.split()
+    if workers is not None:
+        return _gaussian_kernel_test_words(words, defaults, DEFAULT_SIGMAS, num_tests, seed, "identity", workers,
+                                           n_best=n_best, batch_size=batch_size)
+
+    if seed is not None:
+        np.random.seed(seed)
+    # Pour chaque mot, on garde les n_best meilleurs résultats au fil du tirage
     filtered_results = {}
-    for word, results in sentence_results.items():
-        sorted_results = sorted(results, key=lambda r: r.get('score', 0), reverse=True)
-        filtered_results[word] = sorted_results[:n_best]
+    for word in words:
+        filtered_results[word] = top_k_results(
+            iter_gaussian_kernel_test(word, defaults, DEFAULT_SIGMAS, num_tests, batch_size=batch_size), n_best)
     return filtered_results
-
@@ -0,0 +1,117 @@
+"""
+Énumération exacte des k meilleures variantes synonymes d'une séquence.
+
+Chaque codon complet peut être remplacé par l'un de ses synonymes (table de build_aa_to_codons,
+précompilée dans dna_graph.bio.codon_index) ; la fin incomplète (< 3 bases) est conservée.
+Le score d'une variante est la somme d'un score par position, ce qui permet une recherche
+paresseuse au meilleur d'abord (tas) au lieu d'un échantillonnage aléatoire :
+  - les options de chaque position sont triées par score décroissant ;
+  - un état est le vecteur des rangs choisis, l'état initial (tous les rangs à 0) est optimal ;
+  - chaque état a un pivot p (dernière position modifiée) ; ses successeurs incrémentent le rang
+    de p, ou passent à 1 le rang d'une position q > p. Chaque vecteur de rangs n'est atteint
+    que par un seul chemin : pas de doublon, et les scores décroissent le long des chemins.
+
+Les k variantes retournées sont distinctes, triées par score décroissant, de façon déterministe
+(ex aequo départagés par ordre de découverte). Le tas reçoit au plus k * (positions libres) entrées
+de taille constante : un état est stocké comme une chaîne (position, rang, parent).
+"""
+import heapq
+
+import numpy as np
+
+import dna_graph.bio.codon_index as codon_index
+from dna_graph.codec.encode_decode import convert_message_to_bases
+from dna_graph.core.results import GaussianResults
+
+
+def identity_position_score(original_codon, candidate):
+    """Nombre de bases identiques entre le codon d'origine et le candidat."""
+    return sum(a == b for a, b in zip(original_codon, candidate))
+
+
+POSITION_SCORES = {
+    "identity": identity_position_score,
+}
+
+
+def k_best_variants(sequence, k, position_score="identity", include_stop=True):
+    """
+    Énumère les k variantes synonymes de meilleur score total.
+
+    Paramètres :
+      - sequence (str) : Séquence de bases d'origine.
+      - k (int) : Nombre de variantes voulues (moins si la séquence en admet moins).
+      - position_score (str | callable) : Nom dans POSITION_SCORES, ou fonction
+        (codon_origine, codon_candidat) -> float ; le score d'une variante est la somme sur les positions.
+      - include_stop (bool) : Autorise les codons stop synonymes d'un codon stop.
+
+    Retourne :
+      - variants (list) : Liste de (score, séquence) par score décroissant.
+    """
+    score_fn = POSITION_SCORES[position_score] if isinstance(position_score, str) else position_score
+    n_codons = len(sequence) // 3
+    codons = [sequence[3 * i:3 * i + 3] for i in range(n_codons)]
+    tail = sequence[3 * n_codons:]
+
+    # Options triées par score décroissant (tri stable : ordre du code génétique pour les ex aequo)
+    base_score = 0.0
+    free = []  # positions ayant au moins deux options : (indice, options, scores)
+    fixed = list(codons)
+    for i, codon in enumerate(codons):
+        options = codon_index.synonymous_codons(codon, include_stop=include_stop)
+        scores = [score_fn(codon, option) for option in options]
+        order = sorted(range(len(options)), key=lambda j: -scores[j])
+        options = [options[j] for j in order]
+        scores = [scores[j] for j in order]
+        fixed[i] = options[0]
+        base_score += scores[0]
+        if len(options) > 1:
+            # Pertes (>= 0) par rapport à la meilleure option de la position
+            free.append((i, options, [scores[0] - s for s in scores]))
+
+    def build(node):
+        chosen = list(fixed)
+        # Un état est une chaîne (pivot, rang, parent) : une entrée par position modifiée
+        while node is not None:
+            position, rank, node = node
+            chosen[free[position][0]] = free[position][1][rank]
+        return "".join(chosen) + tail
+
+    variants = []
+    counter = 0
+    # Entrées du tas : (perte totale, ordre de découverte, pivot, rang, parent) ; état initial : tous les rangs à 0
+    heap = [(0.0, counter, -1, 0, None)]
+    while heap and len(variants) < k:
+        loss, _, pivot, rank, parent = heapq.heappop(heap)
+        node = (pivot, rank, parent) if pivot >= 0 else None
+        variants.append((base_score - loss, build(node)))
+        children = []
+        if pivot >= 0 and rank + 1 < len(free[pivot][1]):
+            losses = free[pivot][2]
+            children.append((loss - losses[rank] + losses[rank + 1], pivot, rank + 1, parent))
+        for q in range(pivot + 1, len(free)):
+            children.append((loss + free[q][2][1], q, 1, node))
+        for child_loss, position, child_rank, child_parent in children:
+            counter += 1
+            heapq.heappush(heap, (child_loss, counter, position, child_rank, child_parent))
+    return variants
+
+
+def k_best_results(word, k, defaults, position_score="identity", include_stop=True):
+    """
+    Version de k_best_variants au format des tests gaussiens, pour un mot.
+    Les paramètres (alpha, beta, gamma, mutation_rate) valent defaults pour toutes les variantes ;
+    avec le score 'identity', le score est normalisé par la longueur comme dans dna_graph.core.scoring.
+
+    Retourne :
+      - results (GaussianResults) : Les k meilleures variantes, par score décroissant.
+    """
+    sequence = "".join(convert_message_to_bases(word))
+    variants = k_best_variants(sequence, k, position_score, include_stop)
+    scores = np.array([score for score, _ in variants], dtype=float)
+    if position_score == "identity" and sequence:
+        # La fin incomplète, toujours conservée, compte comme identique
+        scores = (scores + len(sequence) % 3) / len(sequence)
+    matrix = np.frombuffer("".join(seq for _, seq in variants).encode("ascii"), dtype=np.uint8)
+    params = np.tile(np.asarray(defaults, dtype=float), (len(variants), 1))
+    return GaussianResults(params, matrix.reshape(len(variants), len(sequence)), scores)
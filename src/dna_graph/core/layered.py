@@ -0,0 +1,184 @@
+"""
+Graphe en couches des meilleures séquences par mot, sous forme compacte.
+
+LayeredCandidates range les candidats de chaque mot (n_best au plus) en colonnes concaténées :
+la couche i occupe les lignes offsets[i]:offsets[i + 1] de params et scores (même principe
+que SYNONYM_OFFSETS dans codon_index). Le candidat j de la couche i porte le nom "i_j",
+comme dans le nx.DiGraph de draw_layered_sequence_graph.
+
+Les arêtes ne sont pas stockées : chaque candidat est relié à tous ceux de la couche suivante,
+le départ aux candidats de la première couche et ceux de la dernière à l'arrivée. Le meilleur
+chemin est calculé couche par couche (layered_shortest_path) ; to_graph() ne construit le graphe
+NetworkX équivalent que pour le dessin ou les algorithmes NetworkX.
+"""
+import networkx as nx
+import numpy as np
+
+from dna_graph.core.results import PARAM_COLUMNS, as_results
+
+START = "start_fictif"
+END = "end_fictif"
+# Séquence d'un mot sans candidat
+MISSING_SEQUENCE = "—"
+# Poids des arêtes de départ et d'arrivée (identiques à ceux de compute_on_layered_graph)
+VIRTUAL_EDGE = {"weight_cost": 0.01, "weight_stability": 1.0, "weight_error": 0.0}
+
+
+class LayeredCandidates:
+    """
+    Candidats par mot en colonnes (voir le docstring du module).
+
+    Paramètres :
+      - words (list) : mots de la phrase, un par couche.
+      - offsets (array (n_couches + 1,)) : début de chaque couche dans les colonnes.
+      - params (array (n, 4)) : alpha, beta, gamma, mutation_rate (NaN pour un mot sans candidat).
+      - scores (array (n,)) : scores de similarité.
+      - sequences (list) : séquence de chaque candidat.
+    """
+    __slots__ = ("words", "offsets", "params", "scores", "sequences")
+
+    def __init__(self, words, offsets, params, scores, sequences):
+        self.words = list(words)
+        self.offsets = np.asarray(offsets, dtype=np.intp)
+        self.params = np.asarray(params, dtype=float).reshape(-1, len(PARAM_COLUMNS))
+        self.scores = np.asarray(scores, dtype=float)
+        self.sequences = list(sequences)
+
+    def __len__(self):
+        """Nombre de couches (mots)."""
+        return len(self.words)
+
+    @property
+    def layer_sizes(self):
+        return np.diff(self.offsets)
+
+    def node(self, layer, j):
+        """Nom du candidat j de la couche `layer`."""
+        return f"{layer}_{j}"
+
+    def index(self, node):
+        """Ligne (dans les colonnes) du candidat nommé node ("i_j")."""
+        layer, j = (int(part) for part in node.split("_"))
+        return self.offsets[layer] + j
+
+    def aggregate(self, path):
+        """Séquence totale le long d'un chemin (nœuds fictifs et mots sans candidat ignorés)."""
+        sequences = (self.sequences[self.index(node)] for node in path if node not in (START, END))
+        return "".join(seq for seq in sequences if seq and seq != MISSING_SEQUENCE)
+
+    def node_attributes(self, row, layer):
+        """Attributs du nœud d'un candidat, comme dans draw_layered_sequence_graph."""
+        params = [None if np.isnan(value) else value for value in self.params[row]]
+        return dict(word=self.words[layer], sequence=self.sequences[row], score=self.scores[row],
+                    **dict(zip(PARAM_COLUMNS, params)))
+
+    def to_graph(self):
+        """
+        nx.DiGraph équivalent, arêtes entre couches comprises (n_best² par paire de couches),
+        avec les nœuds fictifs "start" et "end".
+        """
+        G = nx.DiGraph()
+        layers = []
+        for layer in range(len(self)):
+            nodes = []
+            for j, row in enumerate(range(self.offsets[layer], self.offsets[layer + 1])):
+                G.add_node(self.node(layer, j), **self.node_attributes(row, layer))
+                nodes.append(self.node(layer, j))
+            layers.append(nodes)
+        for current, following in zip(layers, layers[1:]):
+            G.add_edges_from((u, v) for u in current for v in following)
+        G.add_node("start", type="virtual", label="Start", word="Start")
+        G.add_node("end", type="virtual", label="End", word="End")
+        if layers:
+            G.add_edges_from((("start", node) for node in layers[0]), interaction="virtual", **VIRTUAL_EDGE)
+            G.add_edges_from(((node, "end") for node in layers[-1]), interaction="virtual", **VIRTUAL_EDGE)
+        return G
+
+
+def build_layered_candidates(sentence, word_results, n_best=10):
+    """
+    Construit les couches de candidats d'une phrase, sans graphe ni dessin.
+
+    Paramètres :
+      - sentence (str) : La phrase, découpée en mots.
+      - word_results (dict) : {mot: GaussianResults} (ou {mot: [résultats]}).
+      - n_best (int) : Nombre maximum de candidats conservés par mot (meilleurs scores).
+
+    Retourne :
+      - layered (LayeredCandidates) : un mot sans résultat reçoit un candidat vide ("—", score 0).
+    """
+    words = sentence.split()
+    offsets, params, scores, sequences = [0], [], [], []
+    for word in words:
+        results = as_results(word_results.get(word, []))
+        if not len(results):
+            params.append(np.full((1, len(PARAM_COLUMNS)), np.nan))
+            scores.append(np.zeros(1))
+            sequences.append(MISSING_SEQUENCE)
+            offsets.append(offsets[-1] + 1)
+            continue
+        best = results.top_k(n_best)
+        params.append(best.params)
+        scores.append(best.scores)
+        sequences.extend(best.sequence(j) for j in range(len(best)))
+        offsets.append(offsets[-1] + len(best))
+    if not words:
+        return LayeredCandidates([], [0], np.zeros((0, len(PARAM_COLUMNS))), [], [])
+    return LayeredCandidates(words, offsets, np.concatenate(params), np.concatenate(scores), sequences)
+
+
+def layered_shortest_path(layered, global_alpha, global_beta, global_gamma, weighted=True,
+                          noise_scale=0.01, add_noise=True):
+    """
+    Meilleur chemin START -> un candidat par couche -> END, par programmation dynamique.
+
+    Coût d'une arête (fonction multi-critères de compute_on_layered_graph) : seul le nœud d'arrivée
+    compte, les arêtes implicites ayant les poids par défaut (coût 1, stabilité 1, erreur 0) et
+    celles de départ/arrivée les poids de VIRTUAL_EDGE ; alpha vaut 1 pour un mot sans candidat.
+    Sans bruit, le meilleur prédécesseur est le même pour toute la couche : O(candidats).
+    Avec bruit (un tirage uniforme par arête, np.random), la couche est traitée en une matrice
+    (précédents x courants), calculée puis oubliée.
+
+    Paramètres :
+      - weighted (bool) : False reproduit le coût de floyd_warshall/johnson, qui ignore les
+        attributs des nœuds et le bruit : tous les candidats d'une couche sont alors équivalents.
+
+    Retourne :
+      - path (list) : [START, "0_j0", "1_j1", ..., END].
+    """
+    if not len(layered):
+        raise ValueError("Aucune couche de candidats.")
+    alpha = np.where(np.isnan(layered.params[:, 0]), 1.0, layered.params[:, 0])
+    if weighted:
+        # Stabilité 1 et erreur 0 : seuls alpha et le poids de coût interviennent
+        enter = global_alpha * alpha
+    else:
+        add_noise = False
+        enter = np.zeros(len(alpha))
+    offsets = layered.offsets
+
+    def noise(*shape):
+        return np.random.uniform(0, noise_scale, size=shape) if add_noise else 0
+
+    first = enter[offsets[0]:offsets[1]]
+    # Arêtes de départ : poids de coût 0.01 au lieu de 1
+    dist = first * VIRTUAL_EDGE["weight_cost"] + noise(len(first))
+    back = []
+    for layer in range(1, len(layered)):
+        current = enter[offsets[layer]:offsets[layer + 1]]
+        if add_noise:
+            total = dist[:, None] + noise(len(dist), len(current))
+            previous = total.argmin(axis=0)
+            dist = total[previous, np.arange(len(current))] + current
+        else:
+            previous = np.full(len(current), dist.argmin())
+            dist = dist[previous] + current
+        back.append(previous)
+
+    # Arêtes d'arrivée : coût identique pour tous, hormis le bruit
+    j = int((dist + noise(len(dist))).argmin())
+    nodes = [layered.node(len(layered) - 1, j)]
+    for layer in range(len(layered) - 1, 0, -1):
+        j = int(back[layer - 1][j])
+        nodes.append(layered.node(layer - 1, j))
+    return [START] + nodes[::-1] + [END]
@@ -0,0 +1,103 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from config.config import LOG_FILE, LOG_LEVEL, LOG_FORMAT, LOG_FILE_MODE, LOG_PAYLOAD_LIMIT
+
+# Listener actif (un seul par processus)
+_listener = None
+
+
+class Truncated:
+    """
+    Enveloppe paresseuse pour journaliser une liste volumineuse (bases, chemin...).
+    La conversion en texte n'a lieu que si le message est réellement émis, et seuls
+    les `limit` premiers éléments sont affichés, suivis du nombre d'éléments omis.
+
+    Exemple :
+        logging.info("Bases generees : %s", Truncated(base_list))
+    """
+    __slots__ = ("payload", "limit")
+
+    def __init__(self, payload, limit=LOG_PAYLOAD_LIMIT):
+        self.payload = payload
+        self.limit = limit
+
+    def __str__(self):
+        payload, limit = self.payload, self.limit
+        if len(payload) <= limit:
+            return str(payload)
+        omitted = len(payload) - limit
+        if isinstance(payload, str):
+            return f"{payload[:limit]}... (+{omitted} caracteres)"
+        return f"{list(payload[:limit])}... (+{omitted} elements)"
+
+    __repr__ = __str__
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler qui met l'enregistrement en file tel quel : QueueHandler.prepare formaterait le
+    message (msg % args, Truncated compris) dans le thread appelant ; ici tout le formatage a lieu
+    dans le thread du QueueListener. Les arguments sont lus au moment de l'écriture : ne pas
+    modifier un objet journalisé juste après l'appel (même processus, pas de sérialisation).
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level=LOG_LEVEL, log_file=LOG_FILE, file_mode=LOG_FILE_MODE):
+    """
+    Configure le logging racine avec une écriture asynchrone :
+    les enregistrements passent par une DeferredQueueHandler et sont formatés puis écrits par un
+    QueueListener dans un thread d'arrière-plan, ce qui retire le formatage et les E/S fichier
+    des boucles critiques.
+
+    Paramètres :
+      - level (str | int) : niveau de log (ex. "INFO", "DEBUG").
+      - log_file (str) : fichier de destination, ou "-" pour la sortie d'erreur.
+      - file_mode (str) : 'w' pour écraser, 'a' pour ajouter.
+
+    Retourne :
+      - listener (QueueListener) : le listener démarré (arrêté automatiquement à la sortie).
+    """
+    global _listener
+    stop_logging()
+
+    # Supprimez les handlers existants pour éviter des doublons
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+    if log_file == "-":
+        target = logging.StreamHandler(sys.stderr)
+    else:
+        target = logging.FileHandler(log_file, mode=file_mode, encoding="utf-8")
+    target.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    # Réduit le niveau de log pour certains modules
+    logging.getLogger("PIL.PngImagePlugin").setLevel(logging.WARNING)
+    logging.getLogger("matplotlib.font_manager").setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, target, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Vide la file et arrête le listener en cours (sans effet s'il n'y en a pas)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -1,7 +1,7 @@
 import networkx as nx
 from dna_graph.bio.gene_expression import simulate_gene_expression
+from dna_graph.core.layered import LayeredCandidates, layered_shortest_path, START, END
 import numpy as np
-import pandas as pd
 
 
 def multi_criteria_weight(u, v, data, alpha, beta, gamma):
@@ -155,7 +155,8 @@ def compute_on_layered_graph(G, global_alpha, global_beta, global_gamma, algorit
     Calcule le chemin optimal sur un graphe en couches en utilisant une fonction de coût multi-critères.
 
     Paramètres :
-      - G : le graphe (NetworkX)
+      - G : le graphe (NetworkX), ou les couches compactes de build_layered_candidates
+        (LayeredCandidates : arêtes implicites, chemin calculé couche par couche sans graphe)
       - global_alpha, global_beta, global_gamma : pondérations globales
       - algorithm : algorithme à utiliser ('dijkstra', 'bellman_ford', 'astar', 'bfs', 'dfs',
                     'floyd_warshall', 'johnson')
@@ -166,6 +167,9 @@ def compute_on_layered_graph(G, global_alpha, global_beta, global_gamma, algorit
     Retourne :
       - best_path : chemin optimal trouvé ou None en cas d'erreur.
     """
+    if isinstance(G, LayeredCandidates):
+        return _compute_on_candidates(G, global_alpha, global_beta, global_gamma, algorithm, noise_scale, add_noise)
+
     # Regrouper les nœuds par couche à partir de leur nom au format "i_..."
     layers = {}
     for node in G.nodes():
@@ -245,6 +249,30 @@ def compute_on_layered_graph(G, global_alpha, global_beta, global_gamma, algorit
         return None
 
 
+def _compute_on_candidates(layered, global_alpha, global_beta, global_gamma, algorithm, noise_scale, add_noise):
+    """
+    compute_on_layered_graph sur des couches compactes. Le graphe est acyclique et chaque couche
+    est entièrement reliée à la suivante : tous les algorithmes pondérés donnent le plus court
+    chemin de la programmation dynamique ; bfs/dfs (nombre d'arêtes) retiennent le premier candidat
+    de chaque couche, comme nx.shortest_path sur le graphe équivalent.
+    """
+    try:
+        algo = algorithm.lower()
+        if algo in ("dijkstra", "bellman_ford", "astar"):
+            return layered_shortest_path(layered, global_alpha, global_beta, global_gamma,
+                                         noise_scale=noise_scale, add_noise=add_noise)
+        if algo in ("floyd_warshall", "johnson"):
+            return layered_shortest_path(layered, global_alpha, global_beta, global_gamma, weighted=False)
+        if algo in ("bfs", "dfs"):
+            if not len(layered):
+                raise ValueError("Aucune couche de candidats.")
+            return [START] + [layered.node(i, 0) for i in range(len(layered))] + [END]
+        raise ValueError(f"Algorithme non supporté : {algorithm}")
+    except Exception as e:
+        print("Erreur lors de la recherche sur le second graphe :", e)
+        return None
+
+
 # ---- Algorithme Floyd-Warshall ---- #
 def floyd_warshall(G, source, target, alpha, beta, gamma):
     """
@@ -305,6 +333,9 @@ def display_floyd_warshall_matrix(G):
     """
     Calcule la matrice des distances avec Floyd-Warshall et l'affiche sous forme de DataFrame.
     """
+    # Import différé : pandas n'est utile que pour l'affichage des matrices
+    import pandas as pd
+
     # Calcul des distances avec Floyd-Warshall
     distances = dict(nx.floyd_warshall(G, weight=lambda u, v, d: cost_func(u, v, d)))
     
@@ -322,6 +353,9 @@ def display_johnson_matrix(G):
     """
     Calcule la matrice des distances avec l'algorithme de Johnson et l'affiche.
     """
+    # Import différé : pandas n'est utile que pour l'affichage des matrices
+    import pandas as pd
+
     # Calcul des distances avec Johnson
     distances = nx.johnson(G, weight=lambda u, v, d: cost_func(u, v, d))
     
@@ -0,0 +1,196 @@
+"""
+Conteneur compact des résultats des tests gaussiens (structure de tableaux).
+
+Au lieu d'un dictionnaire par échantillon, GaussianResults stocke des colonnes NumPy :
+  - params (n, 4) float64 : alpha, beta, gamma, mutation_rate ;
+  - sequences (n, L) uint8 : séquences en octets ASCII (complétées par des 0 si les longueurs diffèrent) ;
+  - scores (n,) float64 ;
+  - cluster (n,) int, ou None tant que cluster_results n'a pas été appelé.
+
+L'indexation par entier et l'itération retournent des vues ResultRow, qui se lisent comme les
+dictionnaires d'origine (res['score'], res.get('cluster', -1)...) pour la compatibilité.
+"""
+from collections.abc import Mapping
+
+import numpy as np
+
+PARAM_COLUMNS = ("alpha", "beta", "gamma", "mutation_rate")
+_PARAM_INDEX = {name: i for i, name in enumerate(PARAM_COLUMNS)}
+
+
+class ResultRow(Mapping):
+    """Vue d'une ligne de GaussianResults, lisible comme un dictionnaire de résultat."""
+    __slots__ = ("_results", "_index")
+
+    def __init__(self, results, index):
+        self._results = results
+        self._index = index
+
+    def _keys(self):
+        keys = PARAM_COLUMNS + ("sequence", "score")
+        return keys + ("cluster",) if self._results.cluster is not None else keys
+
+    def __getitem__(self, key):
+        results, i = self._results, self._index
+        if key in _PARAM_INDEX:
+            return results.params[i, _PARAM_INDEX[key]]
+        if key == "score":
+            return results.scores[i]
+        if key == "sequence":
+            return results.sequence(i)
+        if key == "cluster" and results.cluster is not None:
+            return results.cluster[i]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        """Seule la colonne 'cluster' est modifiable (créée à -1 au premier usage)."""
+        if key != "cluster":
+            raise KeyError(f"Colonne en lecture seule : {key}")
+        results = self._results
+        if results.cluster is None:
+            results.cluster = np.full(len(results), -1, dtype=np.intp)
+        results.cluster[self._index] = value
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class GaussianResults:
+    """
+    Résultats d'un test gaussien en colonnes NumPy (voir le docstring du module).
+
+    Paramètres :
+      - params (array (n, 4)) : alpha, beta, gamma, mutation_rate.
+      - sequences (array (n, L) uint8) : séquences en octets ASCII.
+      - scores (array (n,)) : scores de similarité.
+      - cluster (array (n,), optionnel) : étiquettes de cluster.
+    """
+    __slots__ = ("params", "sequences", "scores", "cluster")
+
+    def __init__(self, params, sequences, scores, cluster=None):
+        self.params = np.asarray(params, dtype=float).reshape(-1, len(PARAM_COLUMNS))
+        sequences = np.asarray(sequences, dtype=np.uint8)
+        self.sequences = sequences if sequences.ndim == 2 else sequences.reshape(len(self.params), -1)
+        self.scores = np.asarray(scores, dtype=float)
+        self.cluster = None if cluster is None else np.asarray(cluster)
+
+    @classmethod
+    def empty(cls, length=0):
+        return cls(np.empty((0, len(PARAM_COLUMNS))), np.empty((0, length), dtype=np.uint8), np.empty(0))
+
+    @classmethod
+    def from_records(cls, records):
+        """Construit les colonnes à partir d'une liste de dictionnaires (ancien format) ou de ResultRow."""
+        if isinstance(records, GaussianResults):
+            return records
+        records = list(records)
+        if not records:
+            return cls.empty()
+        params = np.array([[res[name] for name in PARAM_COLUMNS] for res in records], dtype=float)
+        encoded = [res["sequence"].encode("ascii") for res in records]
+        width = max(len(seq) for seq in encoded)
+        sequences = np.frombuffer(b"".join(seq.ljust(width, b"\0") for seq in encoded), dtype=np.uint8)
+        scores = np.array([res["score"] for res in records], dtype=float)
+        cluster = None
+        if all("cluster" in res for res in records):
+            cluster = np.array([res["cluster"] for res in records])
+        return cls(params, sequences.reshape(len(records), width), scores, cluster)
+
+    @classmethod
+    def concat(cls, parts):
+        """Concatène plusieurs résultats (même longueur de séquence) dans l'ordre."""
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+        cluster = None
+        if all(part.cluster is not None for part in parts):
+            cluster = np.concatenate([part.cluster for part in parts])
+        return cls(np.concatenate([part.params for part in parts]),
+                   np.concatenate([part.sequences for part in parts]),
+                   np.concatenate([part.scores for part in parts]), cluster)
+
+    def column(self, name):
+        """Retourne une colonne par son nom ('alpha', ..., 'score', 'cluster')."""
+        if name in _PARAM_INDEX:
+            return self.params[:, _PARAM_INDEX[name]]
+        if name == "score":
+            return self.scores
+        if name == "cluster" and self.cluster is not None:
+            return self.cluster
+        raise KeyError(name)
+
+    def sequence(self, i):
+        """Séquence de la ligne i sous forme de chaîne."""
+        return self.sequences[i].tobytes().rstrip(b"\0").decode("ascii")
+
+    def sequence_strings(self):
+        """Toutes les séquences sous forme de chaînes."""
+        return [self.sequence(i) for i in range(len(self))]
+
+    def take(self, indices):
+        """Sous-ensemble (copie) des lignes d'indices donnés, dans cet ordre."""
+        indices = np.asarray(indices, dtype=np.intp)
+        cluster = None if self.cluster is None else self.cluster[indices]
+        return GaussianResults(self.params[indices], self.sequences[indices], self.scores[indices], cluster)
+
+    def top_k(self, n_best):
+        """Les n_best meilleurs scores, par score décroissant (ex aequo dans l'ordre des lignes)."""
+        order = np.argsort(-self.scores, kind="stable")[:n_best]
+        return self.take(order)
+
+    def copy(self):
+        return self.take(np.arange(len(self)))
+
+    def to_records(self):
+        """Convertit en liste de dictionnaires (ancien format)."""
+        return [dict(row) for row in self]
+
+    @property
+    def nbytes(self):
+        size = self.params.nbytes + self.sequences.nbytes + self.scores.nbytes
+        return size + (self.cluster.nbytes if self.cluster is not None else 0)
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError(index)
+            return ResultRow(self, index)
+        if isinstance(index, str):
+            return self.column(index)
+        return self.take(np.arange(len(self))[index])
+
+    def __iter__(self):
+        return (ResultRow(self, i) for i in range(len(self)))
+
+    def __eq__(self, other):
+        if isinstance(other, GaussianResults):
+            return (np.array_equal(self.params, other.params) and np.array_equal(self.sequences, other.sequences)
+                    and np.array_equal(self.scores, other.scores)
+                    and (self.cluster is None) == (other.cluster is None)
+                    and (self.cluster is None or np.array_equal(self.cluster, other.cluster)))
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"GaussianResults(n={len(self)}, length={self.sequences.shape[1]})"
+
+
+def as_results(test_results):
+    """Accepte un GaussianResults ou une liste de dictionnaires ; retourne un GaussianResults."""
+    if isinstance(test_results, GaussianResults):
+        return test_results
+    return GaussianResults.from_records(test_results)
@@ -0,0 +1,144 @@
+"""
+Scores de similarité entre une séquence originale et ses variantes (tests de Monte Carlo).
+
+Chaque méthode note toutes les variantes en un seul appel (liste de chaînes, ou matrice uint8
+(n_variants, longueur) d'octets ASCII) et retourne un tableau de scores dans [0, 1] (1 = identique) :
+  - 'identity' : proportion de positions identiques, vectorisée sur une matrice uint8.
+    Les substitutions synonymes ne changent pas la longueur, d'où un calcul en O(n).
+    Les variantes de longueur différente sont notées par 'banded'.
+  - 'banded' : 1 - distance d'édition / longueur maximale, par alignement global restreint
+    à une bande diagonale (O(n * bande)).
+  - 'difflib' : difflib.SequenceMatcher.ratio(), comportement historique (lent, pur Python).
+"""
+import difflib
+
+import numpy as np
+
+# Demi-largeur par défaut de la bande d'alignement (élargie à l'écart de longueur si besoin)
+DEFAULT_BAND = 8
+
+_INF = np.iinfo(np.int32).max // 2
+
+
+def _as_matrix(variants, length):
+    """Convertit des chaînes de même longueur en une matrice uint8 (n_variants, length)."""
+    if isinstance(variants, np.ndarray):
+        return variants
+    raw = "".join(variants).encode("ascii", "replace")
+    return np.frombuffer(raw, dtype=np.uint8).reshape(len(variants), length)
+
+
+def hamming_distances(original, variants):
+    """
+    Distance de Hamming entre original et chaque variante (toutes de même longueur que original).
+    Retourne un tableau d'entiers (n_variants,).
+    """
+    if not len(variants):
+        return np.zeros(0, dtype=np.intp)
+    reference = np.frombuffer(original.encode("ascii", "replace"), dtype=np.uint8)
+    matrix = _as_matrix(variants, len(original))
+    return np.count_nonzero(matrix != reference, axis=1)
+
+
+def banded_edit_distances(original, variants, band=DEFAULT_BAND):
+    """
+    Distance d'édition (Levenshtein) entre original et chaque variante, calculée dans une bande
+    de demi-largeur `band` autour de la diagonale (exacte si la distance reste dans la bande).
+    Les variantes de même longueur sont traitées ensemble, ligne par ligne de la matrice DP.
+
+    Retourne un tableau d'entiers (n_variants,).
+    """
+    variants = _as_strings(variants)
+    reference = np.frombuffer(original.encode("ascii", "replace"), dtype=np.uint8)
+    n = len(reference)
+    distances = np.zeros(len(variants), dtype=np.intp)
+
+    by_length = {}
+    for i, variant in enumerate(variants):
+        by_length.setdefault(len(variant), []).append(i)
+
+    for m, indices in by_length.items():
+        k = max(band, abs(n - m))
+        matrix = _as_matrix([variants[i] for i in indices], m)
+        prev = np.full((len(indices), m + 2), _INF, dtype=np.int64)
+        prev[:, :min(m, k) + 1] = np.arange(min(m, k) + 1)
+        cur = np.full_like(prev, _INF)
+        for i in range(1, n + 1):
+            lo, hi = max(0, i - k), min(m, i + k)
+            # Seule la colonne à droite de la bande est relue à la ligne suivante
+            cur[:, hi + 1] = _INF
+            start = max(lo, 1)
+            # Substitution (diagonale) ou suppression (colonne précédente)
+            best = np.minimum(prev[:, start - 1:hi] + (matrix[:, start - 1:hi] != reference[i - 1]),
+                              prev[:, start:hi + 1] + 1)
+            if lo == 0:
+                best = np.concatenate([np.full((len(indices), 1), i), best], axis=1)
+            # Insertion : D[j] = min_{j' <= j} best[j'] + (j - j'), via un minimum cumulé
+            offsets = np.arange(best.shape[1])
+            cur[:, lo:hi + 1] = np.minimum.accumulate(best - offsets, axis=1) + offsets
+            prev, cur = cur, prev
+        distances[indices] = prev[:, m]
+    return distances
+
+
+def _as_strings(variants):
+    """Convertit une matrice uint8 en liste de chaînes (sans les 0 de complétion)."""
+    if isinstance(variants, np.ndarray):
+        return [row.tobytes().rstrip(b"\0").decode("ascii") for row in variants]
+    return list(variants)
+
+
+def identity_scores(original, variants):
+    """Proportion de positions identiques ; repli sur 'banded' pour les variantes de longueur différente."""
+    if isinstance(variants, np.ndarray) and variants.shape[1] == len(original):
+        if not original:
+            return np.ones(len(variants))
+        return 1 - hamming_distances(original, variants) / len(original)
+    variants = _as_strings(variants)
+    scores = np.ones(len(variants))
+    same = [i for i, v in enumerate(variants) if len(v) == len(original)]
+    other = [i for i, v in enumerate(variants) if len(v) != len(original)]
+    if same and original:
+        scores[same] = 1 - hamming_distances(original, [variants[i] for i in same]) / len(original)
+    if other:
+        scores[other] = banded_scores(original, [variants[i] for i in other])
+    return scores
+
+
+def banded_scores(original, variants, band=DEFAULT_BAND):
+    """1 - distance d'édition en bande / longueur de la plus longue des deux séquences."""
+    variants = _as_strings(variants)
+    lengths = np.maximum(len(original), np.array([len(v) for v in variants], dtype=np.intp))
+    distances = banded_edit_distances(original, variants, band)
+    return np.where(lengths > 0, 1 - distances / np.maximum(lengths, 1), 1.0)
+
+
+def difflib_scores(original, variants):
+    """Ratio de difflib.SequenceMatcher, comme l'implémentation d'origine."""
+    return np.array([difflib.SequenceMatcher(None, original, v).ratio() for v in _as_strings(variants)])
+
+
+SCORERS = {
+    "identity": identity_scores,
+    "banded": banded_scores,
+    "difflib": difflib_scores,
+}
+
+
+def score_variants(original, variants, method="identity"):
+    """
+    Note toutes les variantes par rapport à la séquence originale en un seul appel.
+
+    Paramètres :
+      - original (str) : Séquence de référence.
+      - variants (list | ndarray) : Séquences à noter (chaînes ou matrice uint8).
+      - method (str) : Méthode de SCORERS ('identity', 'banded' ou 'difflib').
+
+    Retourne :
+      - scores (ndarray) : Score dans [0, 1] de chaque variante, dans l'ordre.
+    """
+    if method not in SCORERS:
+        raise ValueError(f"Méthode de score inconnue : {method} (disponibles : {sorted(SCORERS)})")
+    if not isinstance(variants, np.ndarray):
+        variants = list(variants)
+    return SCORERS[method](original, variants)
@@ -1,52 +1,92 @@
+import inspect
+import os
+
 import networkx as nx
-import matplotlib.pyplot as plt
 import numpy as np
-from sklearn.decomposition import PCA
-from config.config import COLOR_MAP, NODE_SIZE, FONT_SIZE_NODE, FONT_COLOR, FONT_SIZE_INTERACTION, OPTI_PATH, XSIZE, YSIZE, OPTI_PSIZE
+from dna_graph.core.layered import build_layered_candidates
+from dna_graph.core.results import as_results
+from config.config import (COLOR_MAP, NODE_SIZE, FONT_SIZE_NODE, FONT_COLOR, FONT_SIZE_INTERACTION, OPTI_PATH,
+                           XSIZE, YSIZE, OPTI_PSIZE, FIGURE_FORMAT)
+
+
+def _pyplot():
+    """Import différé de matplotlib : évite son coût au démarrage quand rien n'est dessiné."""
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _new_figure(figsize, output_dir):
+    """
+    Figure à l'écran (pyplot) si output_dir est None ; sinon figure autonome rendue par Agg,
+    sans pyplot ni affichage : utilisable sans écran et dans des processus parallèles.
+    """
+    if output_dir is None:
+        return _pyplot().figure(figsize=figsize)
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _finish(figure, output_dir, filename):
+    """Affiche la figure, ou l'écrit dans output_dir (format déduit de l'extension) et retourne son chemin."""
+    if output_dir is None:
+        _pyplot().show()
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, filename)
+    figure.savefig(path)
+    return path
+
+
+def draw_graph(G, pos, path=None, show_codon_nodes=False, output_dir=None, filename=f"graph.{FIGURE_FORMAT}"):
+    """
+    Dessine le graphe de connaissance et le chemin optimal.
+    Sans show_codon_nodes, seuls les codons du chemin sont conservés : le dessin porte sur une vue
+    du sous-graphe (nœuds gardés dans un ensemble), sans parcourir les arêtes des autres codons.
+    Avec output_dir, la figure est écrite dans ce dossier et son chemin est retourné.
+    """
+    figure = _new_figure((XSIZE, YSIZE), output_dir)
+    ax = figure.gca()
 
-def draw_graph(G, pos, path=None, show_codon_nodes=False):
-    plt.figure(figsize=(XSIZE, YSIZE))
-    
     # Si on ne veut pas afficher tous les codons, on conserve néanmoins ceux qui font partie du chemin optimal.
     if not show_codon_nodes:
-        codon_nodes_in_path = set()
+        nodes_to_draw = {n for n, node_type in G.nodes(data="type") if node_type != "segment_3mer"}
         if path:
-            codon_nodes_in_path = {n for n in path if G.nodes[n].get("type") == "segment_3mer"}
-        nodes_to_draw = [n for n, d in G.nodes(data=True) 
-                         if d.get("type") != "segment_3mer" or n in codon_nodes_in_path]
+            nodes_to_draw.update(n for n in path if G.nodes[n].get("type") == "segment_3mer")
+        H = G.subgraph(nodes_to_draw)
     else:
-        nodes_to_draw = list(G.nodes())
-    
+        nodes_to_draw = G.nodes
+        H = G
+
     # Couleurs pour les noeuds à afficher
-    node_colors = [COLOR_MAP.get(G.nodes[n].get("type"), "gray") for n in nodes_to_draw]
-    nx.draw_networkx_nodes(G, pos, nodelist=nodes_to_draw, node_color=node_colors, node_size=NODE_SIZE)
-    
-    # Filtrer les arêtes pour n'afficher que celles reliant des noeuds affichés
-    edges_to_draw = [(u, v) for (u, v, d) in G.edges(data=True)
-                     if d.get("display", True) and u in nodes_to_draw and v in nodes_to_draw]
-    nx.draw_networkx_edges(G, pos, edgelist=edges_to_draw)
-    
+    node_list = list(H.nodes(data="type"))
+    node_colors = [COLOR_MAP.get(node_type, "gray") for _, node_type in node_list]
+    nx.draw_networkx_nodes(H, pos, nodelist=[n for n, _ in node_list], node_color=node_colors,
+                           node_size=NODE_SIZE, ax=ax)
+
+    # Arêtes entre noeuds affichés (celles marquées display=False sont masquées)
+    edges_to_draw = [(u, v) for u, v, shown in H.edges(data="display", default=True) if shown]
+    nx.draw_networkx_edges(H, pos, edgelist=edges_to_draw, ax=ax)
+
     # Labels de noeuds pour ceux affichés
-    labels = {n: d.get("label", n) for n, d in G.nodes(data=True) if n in nodes_to_draw}
-    nx.draw_networkx_labels(G, pos, labels, font_size=FONT_SIZE_NODE)
-    
-    # Labels d'arêtes filtrés
-    edge_labels = nx.get_edge_attributes(G, "interaction")
-    filtered_edge_labels = {(u, v): label for (u, v), label in edge_labels.items()
-                            if u in nodes_to_draw and v in nodes_to_draw}
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=filtered_edge_labels, font_color=FONT_COLOR, font_size=FONT_SIZE_INTERACTION)
-    
+    labels = {n: d.get("label", n) for n, d in H.nodes(data=True)}
+    nx.draw_networkx_labels(H, pos, labels, font_size=FONT_SIZE_NODE, ax=ax)
+
+    # Labels d'arêtes entre noeuds affichés
+    edge_labels = {(u, v): label for u, v, label in H.edges(data="interaction") if label is not None}
+    nx.draw_networkx_edge_labels(H, pos, edge_labels=edge_labels, font_color=FONT_COLOR,
+                                 font_size=FONT_SIZE_INTERACTION, ax=ax)
+
     # Si un chemin optimal est passé, on le dessine (en filtrant également)
     if path:
-        path_edges = list(zip(path, path[1:]))
-        filtered_path_edges = [(u, v) for u, v in path_edges if u in nodes_to_draw and v in nodes_to_draw]
-        nx.draw_networkx_edges(G, pos, edgelist=filtered_path_edges, width=OPTI_PSIZE, edge_color=OPTI_PATH)
-    
-    plt.title("Graphe de connaissance ADN (configuration par couche)")
-    plt.axis("off")
-    plt.show()
+        path_edges = [(u, v) for u, v in zip(path, path[1:]) if u in nodes_to_draw and v in nodes_to_draw]
+        nx.draw_networkx_edges(G, pos, edgelist=path_edges, width=OPTI_PSIZE, edge_color=OPTI_PATH, ax=ax)
 
-    #plt.savefig("graph.png") # pour sav le graph en png
+    ax.set_title("Graphe de connaissance ADN (configuration par couche)")
+    ax.set_axis_off()
+    return _finish(figure, output_dir, filename)
 
 
 def set_positions_by_layer(G, layer_config, default_pos=(10, 0), random_seed=None):
@@ -83,41 +123,55 @@ def set_positions_by_layer(G, layer_config, default_pos=(10, 0), random_seed=Non
 
     return pos
 
-def plot_clusters(test_results, dimensions=2):
+def plot_clusters(test_results, dimensions=2, max_points=5000, random_state=0, output_dir=None,
+                  filename=f"clusters.{FIGURE_FORMAT}"):
     """
     Visualise les clusters sur une projection en 2D ou 3D.
     
     Paramètres :
-      - test_results (list) : Liste de dictionnaires contenant 'alpha', 'beta', 'gamma', 'mutation_rate' et 'cluster'.
+      - test_results (GaussianResults | list) : Résultats avec 'alpha', 'beta', 'gamma', 'mutation_rate' et 'cluster'.
       - dimensions (int) : Dimension de la projection (2 ou 3).
+      - max_points (int) : Au-delà, un sous-échantillon uniforme de max_points résultats est projeté et affiché
+        (None pour tout afficher).
+      - random_state (int) : Seed du sous-échantillonnage.
+      - output_dir (str, optionnel) : Dossier où écrire la figure (sinon affichage) ;
+        le chemin du fichier est alors retourné.
     """
-    features = np.array([[res['alpha'], res['beta'], res['gamma'], res['mutation_rate']] 
-                         for res in test_results])
-    clusters = np.array([res.get('cluster', -1) for res in test_results])
+    from sklearn.decomposition import PCA
+
+    results = as_results(test_results)
+    if max_points is not None and len(results) > max_points:
+        rng = np.random.default_rng(random_state)
+        results = results.take(np.sort(rng.choice(len(results), size=max_points, replace=False)))
+
+    features = results.params
+    clusters = results.cluster if results.cluster is not None else np.full(len(results), -1)
     
     pca = PCA(n_components=dimensions)
     projected = pca.fit_transform(features)
     
     if dimensions == 2:
-        plt.figure(figsize=(8,6))
-        scatter = plt.scatter(projected[:, 0], projected[:, 1], c=clusters, cmap='viridis', marker='o')
-        plt.xlabel("PCA 1")
-        plt.ylabel("PCA 2")
-        plt.title("Projection des clusters en 2D")
-        plt.colorbar(scatter, label="Cluster")
-        plt.show()
+        fig = _new_figure((8, 6), output_dir)
+        ax = fig.gca()
+        scatter = ax.scatter(projected[:, 0], projected[:, 1], c=clusters, cmap='viridis', marker='o')
+        ax.set_xlabel("PCA 1")
+        ax.set_ylabel("PCA 2")
+        ax.set_title("Projection des clusters en 2D")
+        fig.colorbar(scatter, ax=ax, label="Cluster")
+        return _finish(fig, output_dir, filename)
     elif dimensions == 3:
-        fig = plt.figure(figsize=(8,6))
+        fig = _new_figure((8, 6), output_dir)
         ax = fig.add_subplot(111, projection='3d')
         scatter = ax.scatter(projected[:, 0], projected[:, 1], projected[:, 2], c=clusters, cmap='viridis', marker='o')
         ax.set_xlabel("PCA 1")
         ax.set_ylabel("PCA 2")
         ax.set_zlabel("PCA 3")
-        plt.title("Projection des clusters en 3D")
+        ax.set_title("Projection des clusters en 3D")
         fig.colorbar(scatter, ax=ax, label="Cluster")
-        plt.show()
+        return _finish(fig, output_dir, filename)
 
-def plot_gaussian_distribution(default_value, sigma, num_points=1000):
+def plot_gaussian_distribution(default_value, sigma, num_points=1000, output_dir=None,
+                               filename=f"gaussian.{FIGURE_FORMAT}"):
     """
     Affiche la courbe de la distribution gaussienne pour le taux de mutation.
     
@@ -125,47 +179,53 @@ def plot_gaussian_distribution(default_value, sigma, num_points=1000):
       - default_value (float) : La moyenne (mu).
       - sigma (float) : L'écart-type.
       - num_points (int) : Nombre de points pour tracer la courbe.
+      - output_dir (str, optionnel) : Dossier où écrire la figure (sinon affichage).
     """
     # Définir l'intervalle de x en respectant [0, 1]
     x = np.linspace(max(0, default_value - 4 * sigma), min(1, default_value + 4 * sigma), num_points)
     y = (1 / (sigma * np.sqrt(2 * np.pi))) * np.exp(-0.5 * ((x - default_value) / sigma) ** 2)
     
-    plt.figure(figsize=(8,6))
-    plt.plot(x, y, label=f"mu={default_value}, sigma={sigma}")
-    plt.xlabel("Taux de mutation")
-    plt.ylabel("Densité de probabilité")
-    plt.title("Distribution Gaussienne pour le taux de mutation")
-    plt.legend()
-    plt.show()
-
-def plot_gaussian_with_histogram(test_results, default_value, sigma, num_points=1000, bins=30):
+    fig = _new_figure((8, 6), output_dir)
+    ax = fig.gca()
+    ax.plot(x, y, label=f"mu={default_value}, sigma={sigma}")
+    ax.set_xlabel("Taux de mutation")
+    ax.set_ylabel("Densité de probabilité")
+    ax.set_title("Distribution Gaussienne pour le taux de mutation")
+    ax.legend()
+    return _finish(fig, output_dir, filename)
+
+def plot_gaussian_with_histogram(test_results, default_value, sigma, num_points=1000, bins=30, output_dir=None,
+                                 filename=f"gaussian_histogram.{FIGURE_FORMAT}"):
     """
     Affiche la distribution gaussienne et superpose un histogramme des taux de mutation obtenus.
     
     Paramètres :
-      - test_results (list) : Liste de dictionnaires issus de gaussian_kernel_test.
+      - test_results (GaussianResults | list) : Résultats de gaussian_kernel_test.
       - default_value (float) : Valeur moyenne (mu) pour la courbe.
       - sigma (float) : Écart-type de la distribution.
       - num_points (int) : Nombre de points pour tracer la courbe.
       - bins (int) : Nombre de bins pour l'histogramme.
+      - output_dir (str, optionnel) : Dossier où écrire la figure (sinon affichage).
     """
-    rates = [res['mutation_rate'] for res in test_results]
+    rates = as_results(test_results).column('mutation_rate')
     x = np.linspace(max(0, default_value - 4 * sigma), min(1, default_value + 4 * sigma), num_points)
     y = (1 / (sigma * np.sqrt(2 * np.pi))) * np.exp(-0.5 * ((x - default_value) / sigma) ** 2)
     
-    plt.figure(figsize=(8,6))
-    plt.plot(x, y, label=f"Distribution Gaussienne (mu={default_value}, sigma={sigma})", color="blue")
-    plt.hist(rates, bins=bins, density=True, alpha=0.5, label="Histogramme des taux", color="orange")
-    plt.xlabel("Taux de mutation")
-    plt.ylabel("Densité")
-    plt.title("Courbe gaussienne et histogramme")
-    plt.legend()
-    plt.show()
-
-def draw_layered_sequence_graph(sentence, word_results, n_best=10):
+    fig = _new_figure((8, 6), output_dir)
+    ax = fig.gca()
+    ax.plot(x, y, label=f"Distribution Gaussienne (mu={default_value}, sigma={sigma})", color="blue")
+    ax.hist(rates, bins=bins, density=True, alpha=0.5, label="Histogramme des taux", color="orange")
+    ax.set_xlabel("Taux de mutation")
+    ax.set_ylabel("Densité")
+    ax.set_title("Courbe gaussienne et histogramme")
+    ax.legend()
+    return _finish(fig, output_dir, filename)
+
+def draw_layered_sequence_graph(sentence, word_results, n_best=10, show=True, output_dir=None,
+                                filename=f"layered_graph.{FIGURE_FORMAT}"):
     """
-    Construit et dessine un graphe orienté en couches, où chaque couche représente
-    un mot de la phrase et contient jusqu'à n_best candidats. Chaque candidat
+    Construit (build_layered_candidates) et dessine un graphe orienté en couches, où chaque couche
+    représente un mot de la phrase et contient jusqu'à n_best candidats. Chaque candidat
     comporte une séquence, un score et des paramètres (alpha, beta, gamma, mutation_rate).
 
     Paramètres
@@ -173,74 +233,46 @@ def draw_layered_sequence_graph(sentence, word_results, n_best=10):
     sentence : str
         La phrase d'entrée, découpée en mots.
     word_results : dict
-        Un dictionnaire {mot: [résultats]} où chaque résultat contient au moins :
+        Un dictionnaire {mot: GaussianResults} (ou {mot: [résultats]}) où chaque résultat contient au moins :
             - 'sequence'
             - 'score'
             - 'alpha', 'beta', 'gamma'
             - 'mutation_rate'
     n_best : int
         Nombre maximum de candidats à conserver par mot.
+    show : bool
+        Si False, construit le graphe sans le dessiner (mode headless).
+    output_dir : str, optionnel
+        Dossier où écrire la figure au lieu de l'afficher (même avec show=False).
 
     Retourne
     -------
     nx.DiGraph
         Le graphe orienté en couches.
     """
-    # Séparer la phrase en mots
-    words = sentence.split()
-
-    # Créer un graphe orienté pour représenter le chemin
-    G = nx.DiGraph()
-    layers = []  # Liste de listes de nœuds par couche
-
-    # Remplir chaque couche avec les meilleurs candidats (n_best) pour chaque mot
-    for i, word in enumerate(words):
-        results = word_results.get(word, [])
-        if not results:
-            node_id = f"{i}_0"
-            G.add_node(node_id,
-                       word=word,
-                       sequence="—",
-                       score=0,
-                       alpha=None,
-                       beta=None,
-                       gamma=None,
-                       mutation_rate=None)
-            layers.append([node_id])
-            continue
-
-        # Trier par score décroissant et garder les n_best
-        sorted_results = sorted(results, key=lambda r: r.get('score', 0), reverse=True)
-        best_candidates = sorted_results[:n_best]
-
-        current_layer = []
-        for j, res in enumerate(best_candidates):
-            node_id = f"{i}_{j}"
-            G.add_node(
-                node_id,
-                word=word,
-                sequence=res.get('sequence', ''),
-                score=res.get('score', 0),
-                alpha=res.get('alpha'),
-                beta=res.get('beta'),
-                gamma=res.get('gamma'),
-                mutation_rate=res.get('mutation_rate')
-            )
-            current_layer.append(node_id)
+    layered = build_layered_candidates(sentence, word_results, n_best)
+    G = layered.to_graph()
+    if show or output_dir is not None:
+        draw_layered_candidates(layered, G, output_dir, filename)
+    return G
 
-        layers.append(current_layer)
 
-    # Connecter chaque couche à la suivante
-    for i in range(len(layers) - 1):
-        for node_u in layers[i]:
-            for node_v in layers[i + 1]:
-                G.add_edge(node_u, node_v)
+def draw_layered_candidates(layered, G=None, output_dir=None, filename=f"layered_graph.{FIGURE_FORMAT}"):
+    """
+    Dessine les couches de build_layered_candidates (étape facultative : le calcul du chemin
+    n'en a pas besoin). G est le graphe équivalent (layered.to_graph() par défaut).
+    Avec output_dir, la figure est écrite dans ce dossier et son chemin est retourné.
+    """
+    if G is None:
+        G = layered.to_graph()
+    layers = [[layered.node(i, j) for j in range(size)] for i, size in enumerate(layered.layer_sizes)]
 
     # Générer des positions et une couleur différente par couche
     pos = {}
     layer_spacing = 6
     vertical_spacing = 3
-    layer_colors = plt.cm.viridis(np.linspace(0, 1, len(layers)))
+    from matplotlib import colormaps
+    layer_colors = colormaps["viridis"](np.linspace(0, 1, len(layers)))
     node_colors = {}
 
     for i, layer_nodes in enumerate(layers):
@@ -255,22 +287,6 @@ def draw_layered_sequence_graph(sentence, word_results, n_best=10):
             pos[node] = (x, y)
             node_colors[node] = layer_colors[i]
 
-    # --- Ajouter des noeuds fictifs de début et de fin ---
-    start_layer = 0
-    end_layer = len(layers) - 1
-
-    # Noeud fictif de départ
-    G.add_node("start", type="virtual", label="Start", word="Start")
-    for node in layers[start_layer]:
-        G.add_edge("start", node, interaction="virtual",
-                   weight_cost=0.01, weight_stability=1.0, weight_error=0.0)
-
-    # Noeud fictif d'arrivée
-    G.add_node("end", type="virtual", label="End", word="End")
-    for node in layers[end_layer]:
-        G.add_edge(node, "end", interaction="virtual",
-                   weight_cost=0.01, weight_stability=1.0, weight_error=0.0)
-
     # Position et couleur pour les nœuds fictifs
     pos["start"] = (-layer_spacing, 0)
     pos["end"] = (len(layers) * layer_spacing, 0)
@@ -278,14 +294,16 @@ def draw_layered_sequence_graph(sentence, word_results, n_best=10):
     node_colors["end"] = "orange"
 
     # Dessin du graphe
-    plt.figure(figsize=(12, 8))
+    figure = _new_figure((12, 8), output_dir)
+    ax = figure.gca()
 
     # Dessin des nœuds
     nx.draw_networkx_nodes(
         G, pos,
         node_color=[node_colors.get(n, "gray") for n in G.nodes()],
         node_size=1000,
-        alpha=0.9
+        alpha=0.9,
+        ax=ax
     )
 
     # Dessin des arêtes
@@ -293,7 +311,8 @@ def draw_layered_sequence_graph(sentence, word_results, n_best=10):
         G, pos,
         arrowstyle='->',
         arrowsize=15,
-        alpha=0.4
+        alpha=0.4,
+        ax=ax
     )
 
     # Préparation des labels
@@ -312,10 +331,40 @@ def draw_layered_sequence_graph(sentence, word_results, n_best=10):
             )
 
     # Dessin des labels
-    nx.draw_networkx_labels(G, pos, labels=node_labels, font_size=7)
+    nx.draw_networkx_labels(G, pos, labels=node_labels, font_size=7, ax=ax)
 
-    plt.title("Graphe en couches des meilleures séquences par mot")
-    plt.axis('off')
-    plt.show()
+    ax.set_title("Graphe en couches des meilleures séquences par mot")
+    ax.set_axis_off()
+    return _finish(figure, output_dir, filename)
 
-    return G
+
+def _render_job(task):
+    """Exécute une tâche de rendu (fonction, args, kwargs, dossier) ; retourne le chemin de la figure."""
+    func, args, kwargs, output_dir = task
+    kwargs = dict(kwargs, output_dir=output_dir)
+    func(*args, **kwargs)
+    filename = kwargs.get("filename", inspect.signature(func).parameters["filename"].default)
+    return os.path.join(output_dir, filename)
+
+
+def render_figures(jobs, output_dir, workers=1):
+    """
+    Rend une liste de figures dans output_dir, en parallèle sur un pool de processus.
+
+    Paramètres :
+      - jobs (list) : Tâches (fonction, args, kwargs), par exemple
+        (plot_clusters, (results,), {"dimensions": 3}) ; chaque fonction de ce module accepte
+        output_dir et filename. Les arguments doivent être sérialisables (pickle).
+      - output_dir (str) : Dossier de sortie (créé au besoin).
+      - workers (int) : Nombre de processus ; 1 (ou une seule tâche) : rendu dans le processus courant.
+
+    Retourne :
+      - paths (list) : Chemins des figures écrites, dans l'ordre des tâches.
+    """
+    tasks = [(func, tuple(args), dict(kwargs), output_dir) for func, args, kwargs in jobs]
+    if workers is None or workers <= 1 or len(tasks) <= 1:
+        return [_render_job(task) for task in tasks]
+    # Import différé, comme pour les tests gaussiens parallèles
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return list(pool.map(_render_job, tasks))
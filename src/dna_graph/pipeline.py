@@ -0,0 +1,233 @@
+import logging
+import time
+
+from dna_graph.codec.codon_graph import add_codon_subgraph_bio
+from dna_graph.codec.encode_decode import convert_message_to_bases, decode_message_from_path
+from dna_graph.codec.constrained import repair_sequence
+from dna_graph.codec.reed_solomon import protect_bases, recover_bases, protected_length
+from dna_graph.codec.sync import add_sync_markers, resync_bases
+from dna_graph.core.optimisation import compute_path_weight, dijkstra, bellman_ford, astar
+from dna_graph.bio.gene_expression import simulate_gene_expression
+from dna_graph.contraintes.gene_contraintes import validate_gene_expression_constraints
+from dna_graph.contraintes.restriction import get_restriction_scanner
+from dna_graph.core.init_graph import init_graph
+from dna_graph.core.logs import Truncated
+from config.config import (ALPHA, BETA, GAMMA, MANDATORY_NODES, PROMOTER, TERMINATION_SIGNAL, ADRN,
+                           RESTRICTION_ENZYMES)
+
+# Solveurs disponibles pour la recherche du chemin contraint, dans l'ordre d'exécution par défaut
+# (A* utilise par défaut une heuristique nulle)
+SOLVERS = {
+    "bellman_ford": bellman_ford,
+    "astar": astar,
+    "dijkstra": dijkstra,
+}
+
+
+class GenimgPipeline:
+    """
+    Pipeline Genimg réutilisable : le graphe de connaissance est construit une seule fois,
+    puis chaque message est encodé sur une copie de ce graphe.
+    Destiné aux processus longs (batch, service) qui traitent de nombreux messages.
+
+    Paramètres :
+      - alpha, beta, gamma (float) : pondérations de la fonction de coût.
+      - algorithms (tuple) : solveurs à exécuter parmi SOLVERS ; le chemin de poids minimal est retenu.
+      - mandatory_nodes (list) : noeuds par lesquels le chemin doit passer.
+      - ecc_symbols (int) : octets de parité Reed-Solomon par bloc ajoutés après les bases du message
+        (0 : pas de code correcteur).
+      - sync_markers (bool) : insère un marqueur de synchronisation toutes les SYNC_INTERVAL bases,
+        pour décoder malgré des insertions/délétions.
+      - enzymes (list | str) : enzymes de la bibliothèque dont les sites (deux brins) sont interdits,
+        à la validation comme à la correction ; "all" pour toute la bibliothèque, None pour aucune.
+    """
+
+    def __init__(self, alpha=ALPHA, beta=BETA, gamma=GAMMA,
+                 algorithms=("bellman_ford", "astar", "dijkstra"), mandatory_nodes=MANDATORY_NODES,
+                 ecc_symbols=0, sync_markers=False, enzymes=RESTRICTION_ENZYMES):
+        unknown = [alg for alg in algorithms if alg not in SOLVERS]
+        if unknown:
+            raise ValueError(f"Algorithme(s) non supporté(s) : {unknown}")
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.algorithms = tuple(algorithms)
+        self.mandatory_nodes = list(mandatory_nodes)
+        self.ecc_symbols = ecc_symbols
+        self.sync_markers = sync_markers
+        # Sites résolus une fois (nom -> site) ; un nom inconnu est refusé dès la construction (KeyError)
+        if enzymes == "all":
+            enzymes = get_restriction_scanner().enzymes
+        elif enzymes is not None:
+            enzymes = get_restriction_scanner(enzymes).enzymes
+        self.enzymes = enzymes
+
+        start_time = time.perf_counter()
+        self.graph = init_graph()
+        self.init_time = time.perf_counter() - start_time
+        logging.info("Pipeline initialise en %.4f s", self.init_time)
+
+    def encode(self, message, keep_graph=False):
+        """
+        Encode un message et retourne un dictionnaire de résultats :
+          - 'message', 'length' : message d'origine et nombre de caractères.
+          - 'bases' : bases générées, suivies de la parité Reed-Solomon si ecc_symbols > 0,
+            avec les marqueurs de synchronisation si sync_markers (complétées à un multiple de 3) ;
+            ce sont les bases de 'sequence', variante corrigée comprise.
+          - 'sequence' : séquence ADN complète (promoteur + ATG + bases + terminaison) ;
+            si les contraintes échouent, variante corrigée quand elle existe (codons de remplissage
+            ajoutés après les bases, ignorés au décodage).
+          - 'is_valid', 'errors' : statut des contraintes d'expression génique.
+          - 'repair' : résultat de repair_sequence (None si la séquence d'origine est valide) ; une
+            variante qui changerait le message décodé est refusée ('feasible' False).
+            ('bases' et 'sequence' contiennent alors les 3 * repair['spacers'] bases de remplissage.)
+          - 'protein' : protéine synthétisée (None si les contraintes échouent).
+          - 'algorithm', 'path', 'weight' : meilleur chemin contraint et son poids.
+          - 'decoded' : message reconstruit à partir des bases.
+          - 'timings' : durée (s) de chaque étape.
+          - 'graph' : graphe du message, uniquement si keep_graph=True.
+        """
+        timings = {}
+        t0 = time.perf_counter()
+        base_list = convert_message_to_bases(message)
+        if self.ecc_symbols:
+            base_list = protect_bases(base_list, self.ecc_symbols)
+        if self.sync_markers:
+            base_list = add_sync_markers(base_list)
+        timings["encode"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        G = self.graph.copy()
+        start, end = add_codon_subgraph_bio(G, base_list)
+        timings["codon_graph"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        n_bases = len(base_list)
+        if len(base_list) % 3 != 0:
+            base_list += ["A"] * (3 - len(base_list) % 3)
+        dna_sequence = PROMOTER + ADRN + "".join(base_list) + TERMINATION_SIGNAL
+        constraints = validate_gene_expression_constraints(dna_sequence, G, enzymes=self.enzymes)
+        repair = None
+        if not constraints["is_valid"]:
+            # Variante respectant les contraintes : les bases lues au décodage sont verrouillées,
+            # seuls le complément et des codons de remplissage ajoutés à la fin sont libres
+            repair = repair_sequence(G, base_list, locked_bases=n_bases, enzymes=self.enzymes)
+            if repair["feasible"] and self._decode_bases(repair["bases"], len(message)) != message:
+                repair.update(feasible=False, reason="La variante modifie le message décodé.")
+            if repair["feasible"]:
+                base_list = repair["bases"]
+                dna_sequence = repair["sequence"]
+                constraints = validate_gene_expression_constraints(dna_sequence, G, enzymes=self.enzymes)
+                logging.info("Sequence corrigee : %d codon(s) synonyme(s) remplace(s), %d codon(s) de remplissage",
+                             repair["substitutions"], repair["spacers"])
+            else:
+                logging.warning("Aucune variante ne respecte les contraintes : %s", repair["reason"])
+        protein = None
+        if constraints["is_valid"]:
+            try:
+                protein = simulate_gene_expression(dna_sequence)
+                logging.info("Proteine synthetisee : %s", Truncated(protein))
+            except ValueError as e:
+                logging.error("Erreur lors de la simulation de l'expression génique: %s", e)
+        timings["expression"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        candidates = []
+        for alg in self.algorithms:
+            try:
+                path = SOLVERS[alg](G, start, end, self.mandatory_nodes, self.alpha, self.beta, self.gamma)
+            except Exception as e:
+                logging.error("%s a échoué: %s", alg, e)
+                continue
+            weight = compute_path_weight(G, path, self.alpha, self.beta, self.gamma, dna_sequence)
+            logging.info("%s path: %s avec poids %s", alg, Truncated(path), weight)
+            candidates.append((alg, path, weight))
+        if not candidates:
+            raise ValueError("Aucun chemin n'a pu être calculé.")
+        algorithm, path, weight = min(candidates, key=lambda c: c[2])
+        timings["path"] = time.perf_counter() - t0
+        logging.info("Chemin optimal choisi par %s: %s avec poids %s", algorithm, Truncated(path), weight)
+
+        t0 = time.perf_counter()
+        decoded = self._decode_bases(base_list, len(message), path)
+        timings["decode"] = time.perf_counter() - t0
+        timings["total"] = sum(timings.values())
+
+        result = {
+            "message": message,
+            "length": len(message),
+            "bases": "".join(base_list),
+            "sequence": dna_sequence,
+            "is_valid": constraints["is_valid"],
+            "errors": constraints["errors"],
+            "repair": repair,
+            "protein": protein,
+            "algorithm": algorithm,
+            "path": path,
+            "weight": weight,
+            "decoded": decoded,
+            "timings": timings,
+        }
+        if keep_graph:
+            result["graph"] = G
+        return result
+
+    def encode_many(self, messages):
+        """Encode une suite de messages avec le même graphe de connaissance ; retourne la liste des résultats."""
+        return [self.encode(message) for message in messages]
+
+    def decode(self, encoded, length=None):
+        """
+        Reconstruit un message à partir :
+          - d'un résultat de encode() (dictionnaire),
+          - d'une séquence ADN complète (promoteur + ATG + bases + terminaison),
+          - ou d'une liste/chaîne de bases seules.
+        length limite le nombre de caractères décodés (par défaut : toutes les bases disponibles,
+        à éviter pour une séquence corrigée dont les codons de remplissage seraient décodés) ;
+        avec un code correcteur (ecc_symbols > 0) ou des marqueurs (sync_markers), length est
+        obligatoire : les bases sont réalignées sur les marqueurs, puis les substitutions
+        sont corrigées avant le décodage.
+
+        Retourne un dictionnaire {'message', 'length', 'corrected', 'timings'}
+        ('corrected' : nombre d'octets corrigés par le code correcteur).
+        """
+        t0 = time.perf_counter()
+        if isinstance(encoded, dict):
+            bases = encoded["bases"]
+            length = encoded["length"] if length is None else length
+        else:
+            bases = "".join(encoded)
+            prefix = PROMOTER + ADRN
+            if bases.startswith(prefix):
+                bases = bases[len(prefix):]
+                if bases.endswith(TERMINATION_SIGNAL):
+                    bases = bases[:-len(TERMINATION_SIGNAL)]
+        corrected = 0
+        if self.ecc_symbols or self.sync_markers:
+            if length is None:
+                raise ValueError("La longueur du message est nécessaire pour le code correcteur "
+                                 "et les marqueurs de synchronisation.")
+            bases, corrected = self._unpack(bases, length)
+        if length is None:
+            length = len(bases) // 4
+        message = decode_message_from_path([], original_bases=list(bases), original_length=length)
+        return {"message": message, "length": length, "corrected": corrected,
+                "timings": {"decode": time.perf_counter() - t0}}
+
+    def _decode_bases(self, bases, length, path=()):
+        """Message reconstruit à partir des bases encodées (None si le code correcteur échoue)."""
+        try:
+            payload = self._unpack(bases, length)[0]
+        except ValueError:
+            return None
+        return decode_message_from_path(list(path), original_bases=payload, original_length=length)
+
+    def _unpack(self, bases, length):
+        """Retire les marqueurs (réalignement) puis corrige par Reed-Solomon ; retourne (bases, octets corrigés)."""
+        corrected = 0
+        if self.sync_markers:
+            n_bytes = protected_length(length, self.ecc_symbols) if self.ecc_symbols else length
+            bases, _ = resync_bases(bases, 4 * n_bytes)
+        if self.ecc_symbols:
+            bases, corrected = recover_bases(bases, length, self.ecc_symbols)
+        return list(bases), corrected
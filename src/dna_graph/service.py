@@ -0,0 +1,253 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import dna_graph.batch as batch
+from dna_graph.core.logs import setup_logging
+from config.config import ALPHA, BETA, GAMMA, MAX_BODY_SIZE
+
+# Nombre de latences conservées pour le calcul des percentiles
+LATENCY_WINDOW = 10000
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestRejected(Exception):
+    """Requête refusée avant lecture du corps ; status est le code HTTP de la réponse."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def process_requests(requests):
+    """
+    Traite un micro-batch de requêtes [(kind, payload), ...] avec le pipeline du worker.
+    kind vaut 'encode' ({"message": ...}) ou 'decode' ({"sequence": ..., "length": ...}).
+    Les requêtes sont regroupées par type : un seul appel à encode_chunk et un seul à decode_chunk.
+    Retourne la liste des réponses (un dictionnaire par requête, avec 'error' en cas d'échec),
+    dans l'ordre des requêtes.
+    """
+    responses = [None] * len(requests)
+    for encode, chunk in ((True, batch.encode_chunk), (False, batch.decode_chunk)):
+        indices = [i for i, (kind, _) in enumerate(requests) if (kind == "encode") == encode]
+        if indices:
+            for i, response in zip(indices, chunk([requests[i][1] for i in indices])):
+                responses[i] = response
+    return responses
+
+
+class MicroBatcher:
+    """
+    Regroupe les requêtes concurrentes en micro-batches envoyés au pool de workers.
+    Un batch part dès qu'il atteint max_batch_size requêtes ou que la première requête
+    a attendu max_wait secondes.
+    """
+
+    def __init__(self, executor, max_batch_size=16, max_wait=0.005, max_in_flight=2):
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.n_requests = 0
+        self.n_batches = 0
+        # Batches en cours : asyncio ne garde qu'une référence faible aux tâches
+        self._dispatchers = set()
+
+    async def submit(self, kind, payload):
+        """Ajoute une requête à la file et attend sa réponse."""
+        future = asyncio.get_running_loop().create_future()
+        start_time = time.perf_counter()
+        await self.queue.put((kind, payload, future))
+        response = await future
+        self.latencies.append(time.perf_counter() - start_time)
+        self.n_requests += 1
+        return response
+
+    async def run(self):
+        """Boucle de collecte : forme les batches et les dispatche sans attendre leur fin."""
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(items) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self.in_flight.acquire()
+            task = loop.create_task(self._dispatch(items))
+            self._dispatchers.add(task)
+            task.add_done_callback(self._dispatch_done)
+
+    def _dispatch_done(self, task):
+        self._dispatchers.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.error("Batch interrompu : %s", task.exception(), exc_info=task.exception())
+
+    async def close(self):
+        """Annule les batches en cours et attend leur fin (arrêt du service)."""
+        tasks = list(self._dispatchers)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _dispatch(self, items):
+        try:
+            requests = [(kind, payload) for kind, payload, _ in items]
+            responses = await asyncio.get_running_loop().run_in_executor(self.executor, process_requests, requests)
+            self.n_batches += 1
+            for (_, _, future), response in zip(items, responses):
+                if not future.done():
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            for _, _, future in items:
+                future.cancel()
+            raise
+        except Exception as e:
+            logging.exception("Erreur lors du traitement d'un batch : %s", e)
+            for _, _, future in items:
+                if not future.done():
+                    future.set_result({"error": str(e)})
+        finally:
+            self.in_flight.release()
+
+    def stats(self):
+        """Statistiques du service : nombre de requêtes, taille moyenne des batches et percentiles de latence (ms)."""
+        stats = {
+            "requests": self.n_requests,
+            "batches": self.n_batches,
+            "mean_batch_size": self.n_requests / self.n_batches if self.n_batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+        if self.latencies:
+            latencies = np.array(self.latencies) * 1000
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            stats["latency_ms"] = {"p50": p50, "p90": p90, "p99": p99, "max": float(latencies.max())}
+        return stats
+
+
+async def _read_request(reader, max_body_size=MAX_BODY_SIZE):
+    """
+    Lit une requête HTTP/1.1 ; retourne (méthode, chemin, en-têtes, corps) ou None si la connexion est fermée.
+    Lève RequestRejected (400) si Content-Length n'est pas un entier positif, (413) s'il dépasse max_body_size.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = headers.get("content-length", "0")
+    if not length.isdigit():
+        raise RequestRejected(400, f"Content-Length invalide : {length!r}")
+    length = int(length)
+    if length > max_body_size:
+        raise RequestRejected(413, f"Corps de requête trop volumineux ({length} octets, maximum {max_body_size})")
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("latin-1") + body)
+
+
+async def _route(batcher, method, path, body):
+    """Associe une requête à son traitement ; retourne (statut, réponse)."""
+    if path == "/stats" and method == "GET":
+        return 200, batcher.stats()
+    if path == "/health" and method == "GET":
+        return 200, {"status": "ok"}
+    if path not in ("/encode", "/decode"):
+        return 404, {"error": f"Chemin inconnu : {path}"}
+    if method != "POST":
+        return 405, {"error": "Méthode attendue : POST"}
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError as e:
+        return 400, {"error": f"JSON invalide : {e}"}
+    key = "message" if path == "/encode" else "sequence"
+    if not isinstance(payload, dict) or not isinstance(payload.get(key), str):
+        return 400, {"error": f"Champ '{key}' manquant"}
+    response = await batcher.submit(path[1:], payload)
+    return (500 if "error" in response else 200), response
+
+
+async def _handle_connection(batcher, reader, writer, max_body_size=MAX_BODY_SIZE):
+    try:
+        while True:
+            try:
+                request = await _read_request(reader, max_body_size)
+            except RequestRejected as e:
+                _write_response(writer, e.status, {"error": str(e)}, keep_alive=False)
+                break
+            except (ValueError, asyncio.IncompleteReadError):
+                _write_response(writer, 400, {"error": "Requête HTTP invalide"}, keep_alive=False)
+                break
+            if request is None:
+                break
+            method, path, headers, body = request
+            keep_alive = headers.get("connection", "").lower() != "close"
+            status, payload = await _route(batcher, method, path, body)
+            _write_response(writer, status, payload, keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=8080, workers=1, max_batch_size=16, max_wait_ms=5.0,
+                alpha=ALPHA, beta=BETA, gamma=GAMMA, log_level=None, log_file=None, max_body_size=MAX_BODY_SIZE):
+    """
+    Lance le service HTTP d'encodage. Le graphe de connaissance est initialisé une fois par worker
+    et reste chaud pendant toute la durée de vie du service.
+
+    Points d'accès :
+      - POST /encode {"message": ...}            -> chemin, poids, séquence, protéine, temps.
+      - POST /decode {"sequence": ..., "length"} -> message décodé.
+      - GET  /stats                               -> percentiles de latence et taille des batches.
+      - GET  /health
+    Un corps de plus de max_body_size octets est refusé (413).
+    """
+    if log_level is not None:
+        # Mode ajout : les workers écrivent dans le même fichier que le processus principal
+        setup_logging(log_level, log_file, file_mode="a")
+    with ProcessPoolExecutor(max_workers=workers, initializer=batch.init_worker,
+                             initargs=(alpha, beta, gamma, log_level, log_file)) as executor:
+        batcher = MicroBatcher(executor, max_batch_size, max_wait_ms / 1000, max_in_flight=2 * workers)
+        collector = asyncio.create_task(batcher.run())
+        server = await asyncio.start_server(lambda r, w: _handle_connection(batcher, r, w, max_body_size), host, port)
+        logging.info("Service Genimg en ecoute sur %s:%d (%d worker(s))", host, port, workers)
+        print(f"Service Genimg en écoute sur http://{host}:{port} ({workers} worker(s))")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            collector.cancel()
+            await asyncio.gather(collector, return_exceptions=True)
+            await batcher.close()
@@ -0,0 +1,21 @@
+import json
+from dna_graph.batch import run_batch
+
+
+def test_run_batch_preserves_order(tmp_path):
+    """
+    Vérifie que le mode batch écrit un résultat par message, dans l'ordre d'entrée,
+    avec le chemin, le poids, la séquence et les temps d'exécution.
+    """
+    messages = ["hello", "world", "genimg"]
+    input_path = tmp_path / "messages.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    input_path.write_text("\n".join(json.dumps({"id": i, "message": m}) for i, m in enumerate(messages)))
+
+    summary = run_batch(input_path, output_path, workers=1, chunk_size=2)
+
+    lines = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert [line["id"] for line in lines] == [0, 1, 2]
+    for line in lines:
+        assert {"path", "weight", "sequence", "timings"} <= set(line)
+    assert summary["messages"] == 3 and summary["bases_per_s"] > 0
@@ -0,0 +1,47 @@
+import numpy as np
+from dna_graph.core.cache import ResultCache, configure_cache, make_key
+from dna_graph.core.gauss import gaussian_kernel_test
+
+
+def test_result_cache_tiers(tmp_path):
+    """
+    Vérifie l'éviction LRU en mémoire, la relecture depuis le disque et la borne de taille du disque.
+    """
+    cache = ResultCache(max_entries=2, cache_dir=str(tmp_path), max_bytes=10_000)
+    keys = [make_key("word", w, 42) for w in ("a", "b", "c")]
+    for i, key in enumerate(keys):
+        cache.put(key, [i])
+    assert cache.stats()["entries"] == 2
+    assert cache.get(keys[0]) == [0]  # relu depuis le disque
+    cache.put(make_key("big"), b"x" * 20_000)
+    assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 10_000
+
+
+def test_gaussian_kernel_test_cached():
+    """
+    Vérifie qu'un appel avec seed est servi par le cache, avec des copies indépendantes
+    et le même état de np.random qu'après un calcul réel.
+    """
+    cache = configure_cache(max_entries=8, cache_dir=None)
+    first = gaussian_kernel_test("hello", 0.5, 0.5, 0.5, 0.01, num_tests=10, random_seed=1)
+    after_compute = np.random.random()
+    first[0]["cluster"] = 3
+    second = gaussian_kernel_test("hello", 0.5, 0.5, 0.5, 0.01, num_tests=10, random_seed=1)
+    assert np.random.random() == after_compute
+    assert cache.stats()["hits"] == 1
+    assert "cluster" not in second[0]
+    assert second == gaussian_kernel_test("hello", 0.5, 0.5, 0.5, 0.01, num_tests=10, random_seed=1, use_cache=False)
+    configure_cache()
+
+
+def test_shared_cache_dir_is_not_loaded(tmp_path):
+    """Un dossier modifiable par les autres utilisateurs désactive le niveau disque (pas de pickle relu)."""
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    key = make_key("word")
+    (shared / f"{key}.pkl").write_bytes(b"not a pickle")
+    cache = ResultCache(max_entries=0, cache_dir=str(shared))
+    assert cache.cache_dir is None and cache.get(key) is None
+    private = ResultCache(cache_dir=str(tmp_path / "private"))
+    assert private.cache_dir is not None and (tmp_path / "private").stat().st_mode & 0o777 == 0o700
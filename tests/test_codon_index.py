@@ -0,0 +1,38 @@
+import dna_graph.bio.codon_index as codon_index
+from dna_graph.bio.genetic_code import GENETIC_CODE
+from dna_graph.codec.codon_graph import build_aa_to_codons
+
+
+def test_codon_index_matches_genetic_code():
+    """
+    Vérifie que l'index précompilé est cohérent avec GENETIC_CODE :
+    acides aminés, masque des stops et codons synonymes dans le même ordre que build_aa_to_codons.
+    """
+    aa_to_codons = build_aa_to_codons(GENETIC_CODE, include_stop=True)
+    for codon, aa in GENETIC_CODE.items():
+        i = codon_index.codon_id(codon)
+        assert codon_index.CODONS[i] == codon
+        assert codon_index.AMINO_ACIDS[codon_index.CODON_TO_AA_ID[i]] == aa
+        assert codon_index.STOP_MASK[i] == (aa == "Stop")
+        assert list(codon_index.synonymous_codons(codon)) == aa_to_codons[aa]
+    assert codon_index.amino_acid("AUG") == "M"
+    assert list(codon_index.sequence_to_codon_ids("ATGTAAXX")) == [codon_index.codon_id("ATG"), codon_index.codon_id("TAA")]
+
+
+def test_codon_subgraph_completes_missing_table():
+    """
+    Vérifie qu'un code génétique fourni seul (ou une table acide aminé -> codons seule) donne
+    les mêmes couches de codons synonymes que l'index précompilé, au lieu du seul codon du message.
+    """
+    import networkx as nx
+    from dna_graph.codec.codon_graph import add_codon_subgraph_bio
+
+    def layers(**kwargs):
+        G = nx.DiGraph()
+        add_codon_subgraph_bio(G, list("ATGGCTTTA"), **kwargs)
+        return sorted(n for n in G if n not in ("start", "end"))
+
+    expected = layers()
+    assert len(expected) > 3
+    assert layers(genetic_code=GENETIC_CODE) == expected
+    assert layers(aa_to_codons=build_aa_to_codons(GENETIC_CODE, include_stop=True)) == expected
@@ -0,0 +1,69 @@
+import itertools
+
+from dna_graph.codec.codon_graph import add_codon_subgraph_bio
+from dna_graph.codec.constrained import constrained_variant, repair_sequence
+from dna_graph.codec.encode_decode import convert_message_to_bases
+from dna_graph.contraintes.gene_contraintes import validate_gene_expression_constraints
+from dna_graph.core.init_graph import init_graph
+
+
+def test_constrained_variant_matches_exhaustive_search():
+    """
+    Vérifie sur un petit exemple que la variante trouvée est de coût minimal parmi toutes les
+    combinaisons valides (site interdit à cheval entre deux codons, ratio GC, répétitions).
+    """
+    layers = [["GAA", "GAG"], ["TTC", "TTT"], ["GCA", "GCC", "GCG", "GCT"], ["AAA", "AAG"]]
+    preferred = ["GAA", "TTC", "GCA", "AAA"]
+    kwargs = dict(prefix="AT", suffix="TA", restriction_sites=["GAATTC"], gc_bounds=(0.35, 0.40), max_homopolymer=3)
+    result = constrained_variant(layers, preferred, **kwargs)
+
+    def valid(sequence):
+        gc = sum(base in "GC" for base in sequence) / len(sequence)
+        runs = max(len(list(group)) for _, group in itertools.groupby(sequence))
+        return "GAATTC" not in sequence and 0.35 <= gc <= 0.40 and runs <= 3
+
+    costs = [sum(c != p for c, p in zip(choice, preferred))
+             for choice in itertools.product(*layers) if valid("AT" + "".join(choice) + "TA")]
+    assert result["feasible"] and valid(result["sequence"])
+    assert result["substitutions"] == min(costs)
+    assert not constrained_variant([["AAA"]], ["AAA"], gc_bounds=(0.4, 0.6))["feasible"]
+
+
+def test_repair_sequence_fixes_gc_ratio():
+    """Le message par défaut 'world' échoue sur le ratio GC ; la variante corrigée est valide."""
+    G = init_graph()
+    bases = convert_message_to_bases("world")
+    add_codon_subgraph_bio(G, bases)
+    repair = repair_sequence(G, bases)
+    assert repair["feasible"] and repair["substitutions"] >= 1
+    assert validate_gene_expression_constraints(repair["sequence"], G)["is_valid"]
+
+
+def test_repair_sequence_keeps_locked_bases():
+    """
+    Avec les bases du message verrouillées, seuls des codons de remplissage sont ajoutés après elles :
+    les bases lues au décodage sont inchangées et la séquence complète respecte les contraintes.
+    """
+    G = init_graph()
+    bases = convert_message_to_bases("world")
+    add_codon_subgraph_bio(G, bases)
+    padded = bases + ["A"] * (-len(bases) % 3)
+    repair = repair_sequence(G, padded, locked_bases=len(bases))
+    assert repair["feasible"] and repair["substitutions"] == 0 and repair["spacers"] >= 1
+    assert repair["bases"][:len(padded)] == padded
+    assert len(repair["bases"]) == len(padded) + 3 * repair["spacers"]
+    assert validate_gene_expression_constraints(repair["sequence"], G)["is_valid"]
+    assert not repair_sequence(G, padded, locked_bases=len(bases), max_spacers=0)["feasible"]
+
+
+def test_constrained_variant_avoids_reverse_complement_sites():
+    """
+    Un site non palindromique (BsaI, GGTCTC) est aussi interdit sous sa forme complément inverse
+    (GAGACC), comme dans find_restriction_enzymes ; les enzymes de la bibliothèque sont prises en compte.
+    """
+    from dna_graph.contraintes.gene_contraintes import find_restriction_enzymes
+    layers, preferred = [["GAG"], ["ACC", "ACA"]], ["GAG", "ACC"]
+    for kwargs in (dict(restriction_sites=["GGTCTC"]), dict(restriction_sites=[], enzymes=["BsaI"])):
+        result = constrained_variant(layers, preferred, gc_bounds=(0.0, 1.0), **kwargs)
+        assert result["feasible"] and result["codons"] == ["GAG", "ACA"]
+        assert not find_restriction_enzymes(result["sequence"], ["BsaI"])
@@ -9,3 +9,10 @@ def test_encode_decode():
     bases = convert_message_to_bases(message)
     decoded = decode_message_from_path([], bases, len(message))
     assert decoded == message
+
+
+def test_decode_from_path():
+    """Sans bases d'origine, les bases sont lues sur les segments codons du chemin."""
+    bases = convert_message_to_bases("Hi")
+    path = ["start"] + [f"Seg({''.join(bases[i:i + 3])})_pos{i // 3}" for i in range(0, 6, 3)] + ["end"]
+    assert decode_message_from_path(path, original_length=1) == "H"
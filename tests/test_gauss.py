@@ -0,0 +1,124 @@
+import numpy as np
+import dna_graph.bio.codon_index as codon_index
+from dna_graph.codec.encode_decode import convert_message_to_bases
+from dna_graph.core.gauss import (
+    gaussian_kernel_test, gaussian_kernel_test_sentence, cluster_results, get_word_test_results,
+    adaptive_gaussian_kernel_test
+)
+
+
+def test_gaussian_kernel_test_variants():
+    """
+    Vérifie que le moteur vectorisé conserve le format des résultats, que chaque variante
+    ne contient que des substitutions synonymes et que la seed rend le tirage reproductible.
+    """
+    word = "Genimg!"
+    original = "".join(convert_message_to_bases(word))
+    results = gaussian_kernel_test(word, 0.5, 0.5, 0.5, 0.01, num_tests=20, random_seed=7, use_cache=False)
+    assert len(results) == 20
+    for res in results:
+        assert set(res) == {"alpha", "beta", "gamma", "mutation_rate", "sequence", "score"}
+        assert 0 <= res["mutation_rate"] <= 1 and 0 <= res["score"] <= 1
+        sequence = res["sequence"]
+        assert len(sequence) == len(original) and sequence[-1] == original[-1]
+        for i in range(0, len(original) - 2, 3):
+            assert codon_index.amino_acid(sequence[i:i + 3]) == codon_index.amino_acid(original[i:i + 3])
+    assert results == gaussian_kernel_test(word, 0.5, 0.5, 0.5, 0.01, num_tests=20, random_seed=7, use_cache=False)
+
+
+def test_gaussian_kernel_test_cache_hit():
+    """Le second appel avec la même seed est servi par le cache et égal au tirage recalculé."""
+    from dna_graph.core.cache import configure_cache
+
+    cache = configure_cache(max_entries=8, cache_dir=None)
+    try:
+        first = gaussian_kernel_test("cache", 0.5, 0.5, 0.5, 0.01, num_tests=12, random_seed=4)
+        assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 0
+        assert gaussian_kernel_test("cache", 0.5, 0.5, 0.5, 0.01, num_tests=12, random_seed=4) == first
+        assert cache.stats()["hits"] == 1
+        assert first == gaussian_kernel_test("cache", 0.5, 0.5, 0.5, 0.01, num_tests=12, random_seed=4,
+                                             use_cache=False)
+    finally:
+        configure_cache()
+
+
+def test_gaussian_kernel_test_sentence_workers():
+    """
+    Vérifie que le mode parallèle par mot (graines dérivées par SeedSequence.spawn)
+    donne les mêmes résultats quel que soit le nombre de workers.
+    """
+    sentence = "le graphe code chaque mot"
+    sequential = gaussian_kernel_test_sentence(sentence, 0.5, 0.5, 0.5, 0.01, num_tests=8, random_seed=3, workers=1,
+                                              use_cache=False)
+    parallel = gaussian_kernel_test_sentence(sentence, 0.5, 0.5, 0.5, 0.01, num_tests=8, random_seed=3, workers=2,
+                                            use_cache=False)
+    assert list(sequential) == sentence.split()
+    assert sequential == parallel
+
+
+def test_cluster_results_minibatch():
+    """
+    Vérifie que le mode minibatch retourne, pour chaque cluster, le test de meilleur score.
+    """
+    results = gaussian_kernel_test("cluster", 0.5, 0.5, 0.5, 0.01, num_tests=300, random_seed=5, use_cache=False)
+    best = cluster_results(results, n_clusters=4, method="minibatch", batch_size=64)
+    assert len(best) == 4
+    for rep in best:
+        assert rep["score"] == max(res["score"] for res in results if res["cluster"] == rep["cluster"])
+
+
+def test_get_word_test_results_streaming_top_k():
+    """
+    Vérifie que la sélection en flux (tas borné) donne le même résultat que le tri complet
+    des tests de la phrase, et que des lots plus petits conservent n_best résultats triés.
+    """
+    sentence = "top k mot"
+    full = gaussian_kernel_test_sentence(sentence, 0.1, 0.1, 0.5, 0.01, num_tests=40, random_seed=9, use_cache=False)
+    streamed = get_word_test_results(sentence, 40, 5, 0.1, 0.1, 0.5, 0.01, 9, batch_size=64, use_cache=False)
+    for word, results in full.items():
+        assert streamed[word] == sorted(results, key=lambda r: r["score"], reverse=True)[:5]
+    small_batches = get_word_test_results(sentence, 40, 5, 0.1, 0.1, 0.5, 0.01, 9, batch_size=8, use_cache=False)
+    for results in small_batches.values():
+        scores = [r["score"] for r in results]
+        assert len(scores) == 5 and scores == sorted(scores, reverse=True)
+
+
+def test_adaptive_gaussian_kernel_test():
+    """
+    Vérifie que le mode adaptatif s'arrête dès que les intervalles de confiance sont assez étroits,
+    et qu'il respecte le budget sinon, en indiquant le nombre de variantes utilisées.
+    """
+    results, summary = adaptive_gaussian_kernel_test("mot", 0.1, 0.1, 0.5, 0.01, tolerance=0.02,
+                                                     max_tests=5000, batch_size=32, random_seed=2)
+    assert summary["converged"] and summary["samples_used"] == len(results) < 5000
+    low, high = summary["mean_ci"]
+    assert (high - low) / 2 <= 0.02 and low <= summary["mean"] <= high
+    assert summary["best_ci"][1] <= summary["best"]
+    _, capped = adaptive_gaussian_kernel_test("mot", 0.1, 0.1, 0.5, 0.01, tolerance=1e-6,
+                                              max_tests=100, batch_size=32, random_seed=2)
+    assert capped["samples_used"] == 100 and not capped["converged"]
+
+
+def test_adaptive_intervals_match_full_scores():
+    """
+    Vérifie que l'état courant du mode adaptatif (moyenne fusionnée par lot, plus grands scores seuls)
+    donne les mêmes intervalles qu'un calcul sur tous les scores tirés.
+    """
+    from dna_graph.core.gauss import Z_95, _best_score_interval
+    results, summary = adaptive_gaussian_kernel_test("mot", 0.1, 0.1, 0.5, 0.01, tolerance=1e-6,
+                                                     max_tests=300, batch_size=32, random_seed=2)
+    scores = results.scores
+    half_width = Z_95 * scores.std(ddof=1) / len(scores) ** 0.5
+    assert np.allclose(summary["mean_ci"], (scores.mean() - half_width, scores.mean() + half_width))
+    assert summary["best"] == scores.max()
+    assert summary["best_ci"] == _best_score_interval(scores)
+
+
+def test_get_word_test_results_adaptive():
+    """Vérifie le mode 'adaptive' de get_word_test_results : n_best meilleurs résultats par mot, triés."""
+    results = get_word_test_results("un mot", 200, 3, 0.1, 0.1, 0.5, 0.01, seed=1, batch_size=32,
+                                    sampler="adaptive", tolerance=0.05)
+    assert set(results) == {"un", "mot"}
+    for word_results in results.values():
+        scores = [r["score"] for r in word_results]
+        assert len(scores) == 3 and scores == sorted(scores, reverse=True)
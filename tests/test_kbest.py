@@ -0,0 +1,28 @@
+import itertools
+
+import dna_graph.bio.codon_index as codon_index
+from dna_graph.core.kbest import k_best_variants
+from dna_graph.core.gauss import get_word_test_results
+
+
+def test_k_best_variants_exact():
+    """
+    Vérifie, contre une énumération exhaustive, que les k meilleures variantes sont distinctes,
+    synonymes et ont les k meilleurs scores d'identité par position.
+    """
+    sequence = "CGGACGCCTGTACGTA"  # 5 codons + 1 base de fin
+    codons = [sequence[i:i + 3] for i in range(0, 15, 3)]
+    all_scores = sorted(
+        (sum(sum(a == b for a, b in zip(c, o)) for c, o in zip(codons, combo))
+         for combo in itertools.product(*(codon_index.synonymous_codons(c) for c in codons))),
+        reverse=True)
+    variants = k_best_variants(sequence, 20)
+    assert [score for score, _ in variants] == all_scores[:20]
+    assert variants[0] == (15, sequence)
+    assert len({seq for _, seq in variants}) == 20
+    for _, seq in variants:
+        assert seq[-1] == "A"
+        for i in range(0, 15, 3):
+            assert codon_index.amino_acid(seq[i:i + 3]) == codon_index.amino_acid(sequence[i:i + 3])
+    results = get_word_test_results("k best", 0, 4, 0.1, 0.1, 0.5, 0.01, None, sampler="kbest")
+    assert [len(r) for r in results.values()] == [4, 4] and results["k"][0]["score"] == 1.0
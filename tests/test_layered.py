@@ -0,0 +1,44 @@
+import networkx as nx
+import numpy as np
+
+from dna_graph.core.layered import build_layered_candidates
+from dna_graph.core.optimisation import compute_on_layered_graph
+from dna_graph.core.results import GaussianResults
+
+
+def _results(sequences, alphas, scores):
+    params = [[alpha, 1.0, 1.0, 0.01] for alpha in alphas]
+    codes = np.frombuffer("".join(sequences).encode("ascii"), dtype=np.uint8).reshape(len(sequences), -1)
+    return GaussianResults(params, codes, scores)
+
+
+def test_layered_candidates_match_graph():
+    """
+    Les couches compactes donnent le même meilleur chemin que Dijkstra sur le graphe complet,
+    sans stocker d'arêtes ; un mot sans résultat reçoit un candidat vide.
+    """
+    word_results = {
+        "le": _results(["AAA", "CCC", "GGG"], [0.9, 0.2, 0.5], [0.9, 0.5, 0.7]),
+        "chat": _results(["TTT", "ACG"], [0.3, 0.8], [0.8, 0.6]),
+    }
+    layered = build_layered_candidates("le chat dort", word_results, n_best=2)
+    assert layered.words == ["le", "chat", "dort"] and layered.offsets.tolist() == [0, 2, 4, 5]
+    assert layered.sequences == ["AAA", "GGG", "TTT", "ACG", "—"]
+
+    path = compute_on_layered_graph(layered, 1.0, 1.0, 1.0, "dijkstra", add_noise=False)
+    assert path == ["start_fictif", "0_1", "1_0", "2_0", "end_fictif"]
+    assert layered.aggregate(path) == "GGGTTT"
+
+    G = layered.to_graph()
+    assert G.number_of_edges() == 2 * 2 + 2 * 1 + 2 + 1
+    # Graphe équivalent (sans le mot vide, dont les paramètres sont None)
+    two_words = build_layered_candidates("le chat", word_results, n_best=3)
+    expected = compute_on_layered_graph(two_words.to_graph(), 1.0, 1.0, 1.0, "dijkstra", add_noise=False)
+    assert expected[1] == "0_2"
+    assert compute_on_layered_graph(two_words, 1.0, 1.0, 1.0, "dijkstra", add_noise=False) == expected
+
+    np.random.seed(0)
+    noisy = compute_on_layered_graph(layered, 1.0, 1.0, 1.0, "astar", noise_scale=0.5)
+    assert len(noisy) == 5 and noisy[-2] == "2_0"
+    assert compute_on_layered_graph(layered, 1.0, 1.0, 1.0, "bfs")[1:-1] == ["0_0", "1_0", "2_0"]
+    assert compute_on_layered_graph(layered, 1.0, 1.0, 1.0, "inconnu") is None
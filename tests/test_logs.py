@@ -0,0 +1,33 @@
+import logging
+
+from dna_graph.core.logs import Truncated, setup_logging, stop_logging
+
+
+def test_truncated_payload():
+    """
+    Vérifie que les listes volumineuses sont tronquées dans les logs
+    et que les petites listes sont affichées telles quelles.
+    """
+    assert str(Truncated(["A", "C"], limit=4)) == "['A', 'C']"
+    text = str(Truncated(["A"] * 10, limit=4))
+    assert text.startswith("['A', 'A', 'A', 'A']")
+    assert "+6" in text
+
+
+def test_formatting_happens_in_listener(tmp_path):
+    """
+    L'enregistrement est mis en file sans être formaté (arguments intacts) ;
+    le message est formaté par le listener dans le fichier.
+    """
+    log_file = tmp_path / "genimg.log"
+    setup_logging("INFO", str(log_file))
+    try:
+        handler = logging.getLogger().handlers[0]
+        payload = Truncated(["A"] * 10, limit=2)
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "Bases : %s", (payload,), None)
+        assert handler.prepare(record).args == (payload,) and record.msg == "Bases : %s"
+        logging.info("Bases : %s", payload)
+    finally:
+        stop_logging()
+        logging.getLogger().handlers.clear()
+    assert "Bases : ['A', 'A']... (+8 elements)" in log_file.read_text(encoding="utf-8")
@@ -0,0 +1,45 @@
+from dna_graph.pipeline import GenimgPipeline
+
+
+def test_pipeline_encode_decode():
+    """
+    Vérifie que le pipeline réutilise son graphe pour plusieurs messages
+    et que chaque résultat contient le chemin, le poids, la séquence et les temps d'exécution.
+    """
+    pipeline = GenimgPipeline()
+    results = pipeline.encode_many(["hello world", "Genimg"])
+    for message, result in zip(["hello world", "Genimg"], results):
+        assert result["path"][0] == "start" and result["path"][-1] == "end"
+        assert result["weight"] > 0
+        assert result["sequence"].startswith("TATAATG")
+        assert result["decoded"] == message
+        assert "total" in result["timings"]
+        assert pipeline.decode(result["sequence"], len(message))["message"] == message
+    assert "start" not in pipeline.graph
+
+
+def test_repaired_sequence_still_decodes():
+    """
+    'world' échoue sur le ratio GC : la variante corrigée (codons de remplissage après les bases)
+    doit respecter les contraintes et se décoder en le même message ; 'bases' reste cohérent avec 'sequence'.
+    """
+    pipeline = GenimgPipeline(algorithms=("dijkstra",))
+    message = "world"
+    result = pipeline.encode(message)
+    repair = result["repair"]
+    assert repair is not None and repair["feasible"] and repair["spacers"] >= 1
+    assert result["is_valid"] and not result["errors"]
+    assert result["protein"] is not None
+    assert result["decoded"] == message
+    assert pipeline.decode(result["sequence"], len(message))["message"] == message
+    assert pipeline.decode(result)["message"] == message
+    assert result["bases"] in result["sequence"]
+
+
+def test_pipeline_screens_enzymes():
+    """Les enzymes du pipeline sont vérifiées à la validation (site présent dans les bases du message)."""
+    from dna_graph.codec.encode_decode import convert_message_to_bases
+    site = "".join(convert_message_to_bases("Genimg"))[:8]
+    result = GenimgPipeline(algorithms=("dijkstra",), enzymes={"Test": site}).encode("Genimg")
+    assert not result["is_valid"] and "restriction_enzymes" in result["errors"]
+    assert GenimgPipeline(algorithms=("dijkstra",)).encode("Genimg")["is_valid"]
@@ -0,0 +1,36 @@
+import random
+
+import numpy as np
+
+from dna_graph.contraintes.profile import gc_profile, homopolymer_runs, max_homopolymers, sequence_profile
+from dna_graph.contraintes.gene_contraintes import validate_gc_windows, validate_homopolymers, validate_gc_ratio
+
+
+def test_gc_profile_and_homopolymers():
+    """
+    Vérifie le ratio GC par fenêtre (comparé à un calcul direct), le codage par plages
+    et les maxima de répétitions par base.
+    """
+    rng = random.Random(1)
+    sequence = "".join(rng.choice("ACGT") for _ in range(500))
+    profile = gc_profile(sequence, 20)
+    expected = [(sequence[i:i + 20].count("G") + sequence[i:i + 20].count("C")) / 20 for i in range(481)]
+    assert np.allclose(profile, expected)
+
+    starts, lengths, _ = homopolymer_runs("AAACGGGGT")
+    assert starts.tolist() == [0, 3, 4, 8] and lengths.tolist() == [3, 1, 4, 1]
+    assert max_homopolymers("AAACGGGGT") == {"A": 3, "C": 1, "G": 4, "T": 1}
+
+    report = sequence_profile("AAAAAAAA" + "GCAT" * 4, window=8, max_run=6)
+    assert report["gc_violations"][0] and not report["gc_violations"][-1]
+    assert report["homopolymer_violations"].tolist() == [True] * 8 + [False] * 9
+
+
+def test_windowed_validators():
+    """Une séquence équilibrée globalement mais pas localement est rejetée par le validateur par fenêtre."""
+    sequence = "AT" * 50 + "GC" * 50
+    assert validate_gc_ratio(sequence)
+    assert not validate_gc_windows(sequence, window=50)
+    assert validate_gc_windows("ACGT" * 50, window=50)
+    assert validate_homopolymers("AAAAAAC", max_run=6)
+    assert not validate_homopolymers("AAAAAAAC", max_run=6)
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from dna_graph.bio.tran_tran import modify_dna_sequence
+from dna_graph.codec.reed_solomon import rs_encode, rs_decode, syndromes, ReedSolomonError
+from dna_graph.pipeline import GenimgPipeline
+
+
+def test_rs_corrects_up_to_half_parity_per_block():
+    """
+    Vérifie la correction de nsym // 2 octets erronés dans chaque bloc (dernier bloc raccourci compris)
+    et l'échec explicite au-delà.
+    """
+    rng = random.Random(0)
+    data = bytes(rng.randrange(256) for _ in range(600))
+    nsym = 10
+    encoded = rs_encode(data, nsym)
+    assert encoded[:len(data)] == data and len(encoded) == len(data) + 3 * nsym
+    assert not syndromes(list(encoded[:245]) + list(encoded[600:610]), nsym).any()
+
+    noisy = bytearray(encoded)
+    blocks = [range(0, 245), range(245, 490), range(490, 600)]
+    for block in blocks:
+        for position in rng.sample(block, nsym // 2):
+            noisy[position] ^= rng.randrange(1, 256)
+    decoded, corrected = rs_decode(noisy, len(data), nsym)
+    assert decoded == data and corrected == 3 * (nsym // 2)
+
+    for position in range(nsym):
+        noisy[position] ^= 0xFF
+    with pytest.raises(ReedSolomonError):
+        rs_decode(noisy, len(data), nsym)
+
+
+def test_pipeline_recovers_message_after_substitutions():
+    """Le message est retrouvé après des substitutions de bases (modify_dna_sequence sans indel)."""
+    message = "Genimg encode des messages dans l'ADN."
+    pipeline = GenimgPipeline(algorithms=("dijkstra",), ecc_symbols=16)
+    result = pipeline.encode(message)
+    random.seed(3)
+    noisy = modify_dna_sequence(result["sequence"], mutation_rate=0.02, insertion_rate=0, deletion_rate=0)
+    assert noisy != result["sequence"]
+    decoded = pipeline.decode(noisy, len(message))
+    assert decoded["message"] == message and decoded["corrected"] > 0
@@ -0,0 +1,34 @@
+import random
+import re
+
+from dna_graph.contraintes.restriction import IUPAC, get_restriction_scanner, load_enzymes, reverse_complement
+from dna_graph.contraintes.gene_contraintes import validate_restriction_enzymes, find_restriction_enzymes
+
+
+def test_library_scan_matches_regex_on_both_strands():
+    """
+    Vérifie, pour toute la bibliothèque (codes IUPAC, sites non palindromiques), que les positions
+    trouvées sur chaque brin sont celles d'une recherche par expression régulière.
+    """
+    rng = random.Random(0)
+    sequence = "".join(rng.choice("ACGT") for _ in range(3000)) + "GAANNTTC"
+    hits = get_restriction_scanner().find_all(sequence)
+
+    def positions(site):
+        pattern = re.compile("(?=" + "".join(f"[{IUPAC[code]}]" for code in site) + ")")
+        return [m.start() for m in pattern.finditer(sequence)]
+
+    enzymes = load_enzymes()
+    assert len(enzymes) > 90
+    for name, site in enzymes.items():
+        assert hits[name]["+"].tolist() == positions(site), name
+        assert hits[name]["-"].tolist() == positions(reverse_complement(site)), name
+
+
+def test_validate_restriction_enzymes():
+    """Un site BsaI (non palindromique) est détecté sur le brin complémentaire."""
+    sequence = "ATATAT" + reverse_complement("GGTCTC") + "ATATAT"
+    found = find_restriction_enzymes(sequence, ["BsaI", "EcoRI"])
+    assert {name: positions.tolist() for name, positions in found.items()} == {"BsaI": [6]}
+    assert not validate_restriction_enzymes(sequence, ["BsaI"])
+    assert validate_restriction_enzymes(sequence, ["EcoRI"])
@@ -0,0 +1,22 @@
+import numpy as np
+from dna_graph.core.results import GaussianResults
+
+
+def test_gaussian_results_columns_and_rows():
+    """
+    Vérifie l'aller-retour avec l'ancien format (liste de dictionnaires), la vue ligne
+    et la sélection des meilleurs scores sur les colonnes.
+    """
+    records = [
+        {"alpha": 0.1, "beta": 0.2, "gamma": 0.3, "mutation_rate": 0.01, "sequence": "ACGT", "score": 0.5},
+        {"alpha": 0.4, "beta": 0.5, "gamma": 0.6, "mutation_rate": 0.02, "sequence": "ACGA", "score": 0.9},
+        {"alpha": 0.7, "beta": 0.8, "gamma": 0.9, "mutation_rate": 0.03, "sequence": "ACG", "score": 0.9},
+    ]
+    results = GaussianResults.from_records(records)
+    assert results.sequences.dtype == np.uint8 and results.params.shape == (3, 4)
+    assert results.to_records() == records
+    assert results[2]["sequence"] == "ACG" and results[1].get("cluster", -1) == -1
+    results[1]["cluster"] = 4
+    assert list(results["cluster"]) == [-1, 4, -1]
+    best = results.top_k(2)
+    assert best.sequence_strings() == ["ACGA", "ACG"] and list(best["alpha"]) == [0.4, 0.7]
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+import dna_graph.contraintes.scanner as scanner
+from dna_graph.contraintes.scanner import compile_patterns
+from dna_graph.contraintes.gene_contraintes import validate_gene_expression_constraints
+from dna_graph.core.init_graph import init_graph
+
+
+@pytest.mark.parametrize("chunk", [scanner.SCAN_CHUNK, 64])
+def test_scanner_matches_naive_search(monkeypatch, chunk):
+    """
+    Vérifie que le scan en une passe trouve toutes les occurrences (chevauchantes, motifs longs,
+    caractères hors ACGT, à cheval entre deux blocs) aux mêmes positions qu'une recherche naïve,
+    avec la composition en bases.
+    """
+    monkeypatch.setattr(scanner, "SCAN_CHUNK", chunk)
+    rng = random.Random(0)
+    sequence = "".join(rng.choice("ACGT") for _ in range(3000)) + "NAAAA" + "ACGT" * 10
+    patterns = ["AAA", "GAATTC", "ACG", "TTT", "ACGT" * 9, "CCCCCCCCCCCCCC"]
+    report = compile_patterns(patterns).scan(sequence)
+    for pattern in patterns:
+        expected = [i for i in range(len(sequence)) if sequence.startswith(pattern, i)]
+        assert report["hits"][pattern].tolist() == expected
+    assert report["composition"]["other"] == 1
+    assert sum(report["composition"].values()) == len(sequence)
+    assert compile_patterns(patterns) is compile_patterns(list(patterns))
+
+
+def test_constraints_report_positions():
+    """Vérifie le rapport de validation : positions du promoteur, du site EcoRI et ratio GC."""
+    sequence = "TATAATG" + "GCC" * 4 + "GAATTC" + "GCA" * 3 + "ATT"
+    status = validate_gene_expression_constraints(sequence, init_graph())
+    assert status["report"]["positions"]["TATAATG"] == [0]
+    assert status["report"]["positions"]["GAATTC"] == [19]
+    assert set(status["errors"]) == {"restriction_site"}
+    assert validate_gene_expression_constraints("GCGC", init_graph())["errors"].keys() >= {"promoteur", "longueur"}
+
+
+def test_validate_restriction_sites_keeps_bool_contract():
+    """
+    Vérifie que validate_restriction_sites renvoie toujours un booléen : codes IUPAC développés,
+    sites hors alphabet cherchés tels quels (plus de ValueError du scanner).
+    """
+    from dna_graph.contraintes.gene_contraintes import validate_restriction_sites
+    sequence = "TTGAGTCTT"
+    assert validate_restriction_sites(sequence, ["GANTC"]) is False
+    assert validate_restriction_sites(sequence, ["GAATTC", "GRNTC"]) is False
+    assert validate_restriction_sites(sequence, ["GACTCA", "xyz"]) is True
+    assert validate_restriction_sites("AAxyzAA", ["xyz"]) is False
+    status = validate_gene_expression_constraints("TATAATG" + "GAGTCA" * 2 + "ATT", init_graph(),
+                                                  restriction_sites=["GANTC", "x?"])
+    assert "restriction_site" in status["errors"]
@@ -0,0 +1,17 @@
+import numpy as np
+from dna_graph.core.scoring import score_variants, banded_edit_distances
+
+
+def test_score_variants_methods():
+    """
+    Vérifie les scores identité (Hamming), l'alignement en bande (longueurs différentes)
+    et la compatibilité avec difflib pour des séquences identiques.
+    """
+    original = "ACGTACGTAC"
+    variants = ["ACGTACGTAC", "ACGAACGTAC", "CGTACGTAC", "ACGTTACGTAC"]
+    scores = score_variants(original, variants)
+    assert np.allclose(scores[:2], [1.0, 0.9])
+    assert list(banded_edit_distances(original, variants)) == [0, 1, 1, 1]
+    assert np.allclose(scores[2:], [0.9, 1 - 1 / 11])
+    assert score_variants(original, [original], "difflib")[0] == 1.0
+    assert len(score_variants(original, [], "banded")) == 0
@@ -0,0 +1,91 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import dna_graph.batch as batch
+from dna_graph.service import MicroBatcher
+
+
+def test_micro_batcher_groups_requests():
+    """
+    Vérifie que des requêtes concurrentes sont regroupées en micro-batches
+    et que chaque requête reçoit sa propre réponse.
+    """
+    batch.init_worker()
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = MicroBatcher(executor, max_batch_size=4, max_wait=0.05)
+            collector = asyncio.create_task(batcher.run())
+            responses = await asyncio.gather(*(batcher.submit("encode", {"message": m})
+                                               for m in ["a", "b", "c", "d"]))
+            collector.cancel()
+            await batcher.close()
+            assert not batcher._dispatchers
+            return batcher, responses
+
+    batcher, responses = asyncio.run(scenario())
+    assert [r["message"] for r in responses] == ["a", "b", "c", "d"]
+    assert batcher.n_batches == 1
+    assert "p99" in batcher.stats()["latency_ms"]
+
+
+def test_micro_batcher_close_cancels_pending_batches():
+    """Les batches en cours sont référencés par le batcher, puis annulés et attendus à l'arrêt."""
+    import threading
+
+    release = threading.Event()
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = MicroBatcher(executor, max_batch_size=1, max_wait=0)
+            # Le worker reste bloqué tant que release n'est pas levé
+            executor.submit(release.wait)
+            collector = asyncio.create_task(batcher.run())
+            request = asyncio.create_task(batcher.submit("encode", {"message": "a"}))
+            while not batcher._dispatchers:
+                await asyncio.sleep(0.001)
+            collector.cancel()
+            await batcher.close()
+            release.set()
+            assert not batcher._dispatchers
+            return await asyncio.gather(request, return_exceptions=True)
+
+    (outcome,) = asyncio.run(scenario())
+    assert isinstance(outcome, asyncio.CancelledError)
+
+
+def test_process_requests_one_chunk_call_per_kind(monkeypatch):
+    """Un micro-batch mixte donne un seul appel à encode_chunk et un seul à decode_chunk, réponses dans l'ordre."""
+    from dna_graph.service import process_requests
+
+    calls = []
+
+    def fake_chunk(kind):
+        def chunk(records):
+            calls.append((kind, len(records)))
+            return [{kind: record["value"]} for record in records]
+        return chunk
+
+    monkeypatch.setattr(batch, "encode_chunk", fake_chunk("encode"))
+    monkeypatch.setattr(batch, "decode_chunk", fake_chunk("decode"))
+    requests = [("encode", {"value": 1}), ("decode", {"value": 2}), ("encode", {"value": 3})]
+    assert process_requests(requests) == [{"encode": 1}, {"decode": 2}, {"encode": 3}]
+    assert sorted(calls) == [("decode", 1), ("encode", 2)]
+
+
+def test_read_request_rejects_bad_content_length():
+    """Content-Length non entier : 400 ; au-delà de la taille maximale : 413, sans lire le corps."""
+    import pytest
+    from dna_graph.service import RequestRejected, _read_request
+
+    async def read(length, max_body_size=10):
+        reader = asyncio.StreamReader()
+        reader.feed_data(f"POST /encode HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode() + b"{}")
+        reader.feed_eof()
+        return await _read_request(reader, max_body_size)
+
+    assert asyncio.run(read(2))[3] == b"{}"
+    for length, status in (("abc", 400), ("-1", 400), ("11", 413)):
+        with pytest.raises(RequestRejected) as error:
+            asyncio.run(read(length))
+        assert error.value.status == status
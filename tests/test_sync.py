@@ -0,0 +1,52 @@
+import random
+
+from dna_graph.codec.sync import add_sync_markers, resync_bases, banded_align_batch
+from dna_graph.pipeline import GenimgPipeline
+
+
+def test_resync_limits_indel_damage():
+    """
+    Une insertion et une délétion ne décalent plus tout le reste du message : seules les
+    tranches touchées diffèrent, et les marqueurs sont reverrouillés.
+    """
+    rng = random.Random(2)
+    payload = "".join(rng.choice("ACGT") for _ in range(640))
+    read = "".join(add_sync_markers(payload))
+    read = read[:100] + "G" + read[100:400] + read[401:] + "AAATT"
+    bases, stats = resync_bases(read, len(payload))
+    errors = sum(a != b for a, b in zip(bases, payload))
+    assert len(bases) == len(payload) and errors <= 64
+    assert stats["realigned"] == 2 and stats["anchors"] >= 18
+
+    distance, alignment = banded_align_batch([("ACGNNT", "ACGTTAT", False)], band=4)[0]
+    assert distance == 1 and alignment[3] == (None, 3)
+
+
+def test_pipeline_recovers_message_after_indels():
+    """Marqueurs + Reed-Solomon : le message est retrouvé malgré des insertions et délétions."""
+    message = "Synchronisation des lectures bruitees."
+    pipeline = GenimgPipeline(algorithms=("dijkstra",), ecc_symbols=32, sync_markers=True)
+    result = pipeline.encode(message)
+    assert result["decoded"] == message
+    sequence = result["sequence"]
+    noisy = sequence[:60] + "T" + sequence[60:150] + sequence[152:250] + "C" + sequence[251:]
+    assert pipeline.decode(noisy, len(message))["message"] == message
+
+
+def test_resync_relocks_after_long_indel_burst():
+    """
+    Une insertion plus longue que SYNC_BAND et un préfixe non retiré ne bloquent plus les marqueurs
+    suivants : le décalage est réestimé, seules les tranches touchées diffèrent, et la portion
+    réalignée reste courte même sur une longue lecture.
+    """
+    from config.config import SYNC_BAND, SYNC_INTERVAL, SYNC_MARKER
+    rng = random.Random(5)
+    payload = "".join(rng.choice("ACGT") for _ in range(40000))
+    read = "".join(add_sync_markers(payload))
+    burst = "".join(rng.choice("ACGT") for _ in range(SYNC_BAND + 4))
+    read = "TATAATGATG" + read[:1000] + burst + read[1000:]
+    bases, stats = resync_bases(read, len(payload))
+    n_markers = len(payload) // SYNC_INTERVAL
+    errors = sum(a != b for a, b in zip(bases, payload))
+    assert stats["anchors"] >= n_markers - 3 and stats["realigned"] <= 4
+    assert errors <= 4 * (SYNC_INTERVAL + len(SYNC_MARKER))
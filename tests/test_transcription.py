@@ -8,3 +8,28 @@ def test_transcribe():
     dna_sequence = "TATAATGTTTAAATT"
     mRNA = transcribe(dna_sequence)
     assert "T" not in mRNA, "Les T doivent être remplacés par des U dans l'ARNm."
+
+
+def test_iter_transcription_units():
+    """
+    Chaque unité promoteur -> terminaison d'une séquence multi-gènes est repérée sans copie
+    et traduite comme transcribe + translate sur l'unité isolée.
+    """
+    import mmap
+
+    from dna_graph.bio.tran_tran import iter_transcription_units, translate
+
+    genes = ["TATAATGATGGCCTGGAAAATT", "TATAATGATGCCCTAGGGGATT", "TATAATGATGTTT"]
+    sequence = "GGG" + genes[0] + "CC" + genes[1] + genes[2]
+    units = list(iter_transcription_units(sequence))
+    assert [unit.promoter for unit in units] == [3, 27, 49]
+    assert [unit.terminated for unit in units] == [True, True, False]
+    for unit, gene in zip(units, genes):
+        assert isinstance(unit.view, memoryview)
+        assert unit.mrna() == transcribe(gene)
+        assert unit.protein() == translate(transcribe(gene))
+    assert [unit.protein() for unit in units] == ["MAWK", "MP", "MF"]
+
+    buffer = mmap.mmap(-1, len(sequence))
+    buffer.write(sequence.encode("ascii"))
+    assert [(u.start, u.end) for u in iter_transcription_units(buffer)] == [(u.start, u.end) for u in units]
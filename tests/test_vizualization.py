@@ -18,3 +18,32 @@ def test_set_positions():
     assert positions["A"][0] == 1
     assert positions["B"][0] == 2
     assert positions["C"] == (0, 0)
+
+
+def test_render_figures_to_directory(tmp_path):
+    """
+    Les figures sont écrites sans affichage (Agg), en PNG ou SVG selon l'extension,
+    dans le processus courant comme dans un pool de processus.
+    """
+    from dna_graph.core.visualization import draw_graph, plot_gaussian_distribution, render_figures
+
+    G = nx.DiGraph()
+    G.add_node("start", type="virtual", label="Start")
+    G.add_node("Seg(ATG)_pos0", type="segment_3mer", label="ATG")
+    G.add_node("Seg(CCC)_pos0", type="segment_3mer", label="CCC")
+    G.add_node("end", type="virtual", label="End")
+    G.add_edge("start", "Seg(ATG)_pos0", interaction="codon")
+    G.add_edge("start", "Seg(CCC)_pos0", interaction="codon")
+    G.add_edge("Seg(ATG)_pos0", "end")
+    pos = {n: (i, 0) for i, n in enumerate(G)}
+    path = ["start", "Seg(ATG)_pos0", "end"]
+
+    assert draw_graph(G, pos, path, output_dir=str(tmp_path)) == str(tmp_path / "graph.png")
+    jobs = [(draw_graph, (G, pos, path), {"filename": "graph.svg"}),
+            (plot_gaussian_distribution, (0.01, 0.005), {})]
+    for workers in (1, 2):
+        out = tmp_path / f"w{workers}"
+        paths = render_figures(jobs, str(out), workers=workers)
+        assert paths == [str(out / "graph.svg"), str(out / "gaussian.png")]
+        assert (out / "graph.svg").read_text().lstrip().startswith("<?xml")
+        assert (out / "gaussian.png").read_bytes()[:4] == b"\x89PNG"